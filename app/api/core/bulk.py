@@ -0,0 +1,192 @@
+"""
+Parsing helpers for bulk endpoints that accept NDJSON or CSV uploads.
+
+Rows are parsed independently so one malformed line is reported against its
+line number instead of rejecting the whole upload. Uploads are read from the
+request stream as they arrive, and parsing and validation are lazy, so a
+caller can apply an upload chunk by chunk without holding the whole body or
+every row in memory.
+"""
+
+import codecs
+import csv
+import json
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_MEDIA_TYPES = ("text/csv",)
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+
+class UnsupportedMediaType(ValueError):
+    """The upload is neither NDJSON nor CSV."""
+
+
+class TooManyRows(ValueError):
+    """The upload has more rows than a single request may apply."""
+
+
+@dataclass
+class ParsedRow:
+    """One record of an upload, or the reason it could not be read."""
+
+    line: int
+    data: dict[str, Any] | None = None
+    error: str | None = None
+
+
+def _media_type(content_type: str | None) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream and yield its lines, each with its line break."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        try:
+            text = decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise ValueError("Upload must be UTF-8 encoded")
+        *lines, pending = (pending + text).split("\n")
+        for line in lines:
+            yield line + "\n"
+    try:
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ValueError("Upload must be UTF-8 encoded")
+    if pending:
+        yield pending
+
+
+async def parse_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ParsedRow(line_number, error=f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield ParsedRow(line_number, error="Expected a JSON object")
+            continue
+        yield ParsedRow(line_number, data=data)
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    header: list[str] | None = None
+    line_number = 0
+    record: list[str] = []
+    quotes = 0
+    async for line in lines:
+        line_number += 1
+        record.append(line)
+        quotes += line.count('"')
+        # A line break inside a quoted value leaves an odd number of quotes
+        if quotes % 2:
+            continue
+        values = next(csv.reader(record), [])
+        record, quotes = [], 0
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header):
+            yield ParsedRow(line_number, error="More values than header columns")
+            continue
+        # Empty cells mean "not given", so schema defaults apply
+        data = {key: value.strip() for key, value in zip(header, values) if value.strip()}
+        if data:
+            yield ParsedRow(line_number, data=data)
+    if record:
+        yield ParsedRow(line_number, error="Unterminated quoted value")
+
+
+def iter_upload(
+    chunks: AsyncIterable[bytes], content_type: str | None
+) -> AsyncIterator[ParsedRow]:
+    """Lazily split a streamed NDJSON or CSV upload into rows, chosen by its Content-Type.
+
+    The media type is checked up front, before any of the body is read. An
+    upload that is not UTF-8 raises ValueError once the bad bytes are reached.
+    """
+    media_type = _media_type(content_type)
+    if media_type not in NDJSON_MEDIA_TYPES + CSV_MEDIA_TYPES:
+        raise UnsupportedMediaType(
+            f"Unsupported content type {media_type or '(none)'}; "
+            f"use one of {', '.join(NDJSON_MEDIA_TYPES + CSV_MEDIA_TYPES)}"
+        )
+    if media_type in NDJSON_MEDIA_TYPES:
+        return parse_ndjson(iter_lines(chunks))
+    return parse_csv(iter_lines(chunks))
+
+
+async def _single_chunk(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+async def parse_upload(body: bytes, content_type: str | None) -> list[ParsedRow]:
+    """Split a complete NDJSON or CSV upload into rows, chosen by its Content-Type."""
+    return [row async for row in iter_upload(_single_chunk(body), content_type)]
+
+
+async def validate_rows(
+    rows: AsyncIterable[ParsedRow],
+    schema: type[M],
+    errors: list[tuple[int, str]],
+    max_rows: int,
+) -> AsyncIterator[tuple[int, M]]:
+    """Validate parsed rows against `schema`, yielding ``(line, model)`` pairs.
+
+    Unreadable or invalid rows are appended to `errors` and skipped. Raises
+    TooManyRows once more than `max_rows` rows have been read.
+    """
+    count = 0
+    async for row in rows:
+        count += 1
+        if count > max_rows:
+            raise TooManyRows(f"Too many rows (max {max_rows})")
+        if row.error:
+            errors.append((row.line, row.error))
+            continue
+        try:
+            yield row.line, schema.model_validate(row.data)
+        except ValidationError as e:
+            errors.append((row.line, format_validation_error(e)))
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    """Collapse a pydantic error into one line per failing field."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def achunked(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """Yield successive lists of at most `size` items of an async iterable."""
+    chunk: list[T] = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,224 @@
+"""
+Coalescing of identical concurrent GET requests.
+
+At the start of a shift many clients open the same list within milliseconds.
+The first GET for a key runs; identical GETs that arrive while it runs, or up
+to ``REQUEST_COALESCING_TTL_MS`` after it finished, wait for it and are sent
+the same status, headers and body bytes instead of querying the database
+again. Requests are identical when they have the same path, the same query
+parameters (in any order) and the same credentials (``Authorization`` and
+``Cookie`` headers), so no response is shared across callers.
+
+Only complete ``200`` responses up to ``REQUEST_COALESCING_MAX_BYTES`` are
+shared; when the first request fails or its response is not shareable, the
+waiters run on their own. Any other method clears the finished responses when
+it starts and when it ends, and a GET that overlapped a write is not kept for
+later requests, so a client reads its own writes. A replayed request is given
+the first request's matched route, so ``/metrics`` labels it with the route
+template. Lookups are counted as the ``coalescing`` cache on ``/metrics``: a
+hit is a request that was served another one's response.
+"""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import get_settings
+from core.metrics import CacheCounter, get_metrics_registry
+from core.profiling import AUTHORIZATION_HEADER, is_bearer_token
+
+CREDENTIAL_HEADERS = (b"authorization", b"cookie")
+
+# Scope keys the router sets that outer middleware reads, e.g. metrics' route
+ROUTING_SCOPE_KEYS = ("route", "path_params")
+
+CoalescingKey = tuple[str, str, tuple[bytes, ...]]
+
+
+class SharedResponse:
+    """A response being produced by the first of a set of identical requests."""
+
+    __slots__ = ("done", "messages", "routing", "expires")
+
+    def __init__(self):
+        self.done = asyncio.Event()
+        # Set once the response is complete and shareable
+        self.messages: list[Message] | None = None
+        # The matched route and path parameters, for outer middleware
+        self.routing: dict[str, Any] = {}
+        self.expires = 0.0
+
+
+class ResponseCoalescer:
+    """In-flight and just-finished responses by request key."""
+
+    def __init__(self, ttl_s: float, counter: CacheCounter | None = None):
+        self.ttl_s = ttl_s
+        self.counter = counter or CacheCounter()
+        # Bumped when a write starts and when it ends
+        self.generation = 0
+        self._responses: dict[CoalescingKey, SharedResponse] = {}
+
+    def join(self, key: CoalescingKey) -> tuple[SharedResponse, bool]:
+        """Return the shared response for `key` and whether the caller produces it."""
+        shared = self._responses.get(key)
+        if shared is not None and (not shared.done.is_set() or shared.expires > time.monotonic()):
+            return shared, False
+        shared = self._responses[key] = SharedResponse()
+        return shared, True
+
+    def finish(
+        self,
+        key: CoalescingKey,
+        shared: SharedResponse,
+        messages: list[Message] | None,
+        generation: int,
+        routing: dict[str, Any] | None = None,
+    ):
+        """Hand the response to its waiters and keep it for `ttl_s`.
+
+        A response whose request started before a write did may predate the
+        write's commit, so it is only given to the waiters already joined.
+        """
+        shared.messages = messages
+        shared.routing = routing or {}
+        shared.expires = time.monotonic() + self.ttl_s
+        shared.done.set()
+        if messages is None or self.ttl_s <= 0 or generation != self.generation:
+            self._discard(key, shared)
+        else:
+            asyncio.get_running_loop().call_later(self.ttl_s, self._discard, key, shared)
+
+    def _discard(self, key: CoalescingKey, shared: SharedResponse) -> None:
+        if self._responses.get(key) is shared:
+            del self._responses[key]
+
+    def clear(self) -> None:
+        """Forget every response; requests in flight still answer their waiters."""
+        self._responses.clear()
+
+    def write(self) -> None:
+        """Mark the start or end of a write."""
+        self.generation += 1
+        self.clear()
+
+
+@lru_cache
+def get_response_coalescer() -> ResponseCoalescer:
+    return ResponseCoalescer(
+        get_settings().request_coalescing_ttl_ms / 1000,
+        counter=get_metrics_registry().register_cache("coalescing"),
+    )
+
+
+def _copy(message: Message) -> Message:
+    # Outer middleware edits the headers of the messages it passes on
+    if "headers" in message:
+        return {**message, "headers": list(message["headers"])}
+    return message
+
+
+def coalescing_key(scope: Scope) -> CoalescingKey:
+    """Path, query parameters sorted by name, and the request's credentials."""
+    params = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    # Stable sort: repeated parameters keep their order
+    query = urlencode(sorted(params, key=lambda param: param[0]))
+    headers = dict(scope["headers"])
+    return scope["path"], query, tuple(headers.get(name, b"") for name in CREDENTIAL_HEADERS)
+
+
+class CoalescingMiddleware:
+    """ASGI middleware that serves identical concurrent GETs from one response."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefix: str = "",
+        max_body_bytes: int = 1_000_000,
+        coalescer: ResponseCoalescer | None = None,
+        profiling_token: str | None = None,
+    ):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_body_bytes = max_body_bytes
+        self.coalescer = coalescer or get_response_coalescer()
+        self.profiling_token = profiling_token
+
+    def _coalescable(self, scope: Scope) -> bool:
+        if not scope["path"].startswith(self.path_prefix):
+            return False
+        # Profiled requests have to run to be profiled
+        return not any(
+            name == AUTHORIZATION_HEADER
+            and is_bearer_token(value.decode("latin-1"), self.profiling_token)
+            for name, value in scope["headers"]
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] != "GET":
+            if scope["method"] in ("HEAD", "OPTIONS"):
+                await self.app(scope, receive, send)
+                return
+            # The write commits in dependency teardown, possibly after its response
+            self.coalescer.write()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.coalescer.write()
+            return
+        if not self._coalescable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = coalescing_key(scope)
+        generation = self.coalescer.generation
+        shared, first = self.coalescer.join(key)
+        if not first:
+            await shared.done.wait()
+            if shared.messages is not None:
+                self.coalescer.counter.hit()
+                # A replayed request never reaches the router
+                scope.update(shared.routing)
+                for message in shared.messages:
+                    await send(_copy(message))
+                return
+            # The first response was not shareable
+            self.coalescer.counter.miss()
+            await self.app(scope, receive, send)
+            return
+
+        self.coalescer.counter.miss()
+        messages: list[Message] | None = []
+        size = 0
+
+        async def send_and_keep(message: Message) -> None:
+            nonlocal messages, size
+            if messages is not None:
+                if message["type"] == "http.response.start" and message["status"] != 200:
+                    messages = None
+                elif message["type"] == "http.response.body":
+                    size += len(message.get("body", b""))
+                    if size > self.max_body_bytes:
+                        messages = None
+                if messages is not None:
+                    messages.append(_copy(message))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_keep)
+        except BaseException:
+            messages = None
+            raise
+        finally:
+            complete = messages and not messages[-1].get("more_body", False)
+            routing = {name: scope[name] for name in ROUTING_SCOPE_KEYS if name in scope}
+            self.coalescer.finish(
+                key, shared, messages if complete else None, generation, routing
+            )
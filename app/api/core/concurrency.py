@@ -0,0 +1,40 @@
+"""
+Optimistic concurrency for rows with a ``version`` column.
+
+Every write bumps the version, and the version doubles as a strong ETag, so a
+read serves it without an extra query. A PUT carrying ``If-Match`` becomes a
+compare-and-swap: the UPDATE only matches while the row still has a version
+the client has seen, and a conflict is reported as 412 instead of silently
+overwriting someone else's edit.
+"""
+
+
+class VersionConflict(Exception):
+    """The row was changed by someone else since the client read it."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Version {current_version} is current; re-read and retry")
+        self.current_version = current_version
+
+
+def etag(version: int) -> str:
+    """The strong ETag for a row version."""
+    return f'"{version}"'
+
+
+def parse_if_match(header: str | None) -> list[int] | None:
+    """Versions an ``If-Match`` header accepts, or None when any version will do.
+
+    A missing header and ``*`` impose no condition. If-Match uses the strong
+    comparison, so weak validators never match, and neither do tags that are
+    not versions; a header with nothing usable yields an empty list, which no
+    row satisfies.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
@@ -0,0 +1,156 @@
+"""
+Totals for paginated lists.
+
+An exact ``count(*)`` costs as much as reading every matching row, which on a
+large city with a search term is as slow as the page query itself. `count_total`
+counts exactly up to a threshold; past it, the total is either the threshold
+as a lower bound ("1000+") or the planner's row estimate, as the caller asks.
+Capped and estimated totals past the threshold are cached for a few seconds
+per filter set, so paging through a large list does not count it again.
+Smaller totals and exact ones are always counted, so they stay exact after
+the caller's own writes.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Hashable
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from core.config import get_settings
+from core.metrics import CacheCounter, get_metrics_registry
+
+
+class CountMode(str, Enum):
+    """How to total a list once it is past the exact threshold."""
+
+    EXACT = "exact"
+    CAPPED = "capped"
+    ESTIMATE = "estimate"
+
+
+class TotalKind(str, Enum):
+    """What a returned total means."""
+
+    EXACT = "exact"
+    # The list holds more rows than the total says ("1000+")
+    AT_LEAST = "at_least"
+    ESTIMATE = "estimate"
+
+
+@dataclass(frozen=True)
+class Total:
+    value: int
+    kind: TotalKind = TotalKind.EXACT
+
+
+class TotalCache:
+    """Totals by filter set, each kept for `ttl` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int = 1024, counter: CacheCounter | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.counter = counter or CacheCounter()
+        self._entries: dict[Hashable, tuple[float, Total]] = {}
+
+    def get(self, key: Hashable) -> Total | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.counter.hit()
+            return entry[1]
+        self.counter.miss()
+        return None
+
+    def put(self, key: Hashable, total: Total) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+        self._entries[key] = (now + self.ttl, total)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@lru_cache
+def get_total_cache() -> TotalCache:
+    return TotalCache(
+        get_settings().count_cache_ttl_s,
+        counter=get_metrics_registry().register_cache("totals"),
+    )
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, with the statement's parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def _estimate_rows(db: AsyncSession, query: Select) -> int | None:
+    """The planner's row estimate for `query`, or None off PostgreSQL."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    document = (await db.execute(_Explain(query))).scalar_one()
+    if isinstance(document, str):
+        document = json.loads(document)
+    return int(document[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(
+    db: AsyncSession,
+    query: Select,
+    mode: CountMode = CountMode.CAPPED,
+    threshold: int | None = None,
+    cache_key: Hashable | None = None,
+) -> Total:
+    """Total the rows `query` selects.
+
+    `query` selects the filtered rows (one column is enough), without ordering
+    or pagination. Up to `threshold` rows (``COUNT_EXACT_THRESHOLD`` by
+    default) are always counted exactly. Past it, ``exact`` keeps counting,
+    ``capped`` returns the threshold as an ``at_least`` total and ``estimate``
+    returns the planner's estimate (capped where there is no planner to ask).
+    Capped and estimated totals past the threshold are cached under
+    `cache_key`, which must identify the filter set. Exact totals are never
+    cached, so they always include the caller's own writes.
+    """
+    if mode == CountMode.EXACT:
+        count = select(func.count()).select_from(query.subquery())
+        return Total((await db.execute(count)).scalar_one())
+
+    if threshold is None:
+        threshold = get_settings().count_exact_threshold
+    cache = get_total_cache()
+    key = (cache_key, mode, threshold) if cache_key is not None else None
+    if key is not None and (cached := cache.get(key)) is not None:
+        return cached
+
+    capped = select(func.count()).select_from(query.limit(threshold + 1).subquery())
+    counted = (await db.execute(capped)).scalar_one()
+    if counted <= threshold:
+        return Total(counted)
+    estimate = await _estimate_rows(db, query) if mode == CountMode.ESTIMATE else None
+    if estimate is None:
+        total = Total(threshold, TotalKind.AT_LEAST)
+    else:
+        # Past the threshold for certain, whatever the planner thinks
+        total = Total(max(estimate, threshold + 1), TotalKind.ESTIMATE)
+
+    if key is not None:
+        cache.put(key, total)
+    return total
@@ -1,8 +1,14 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
 from sqlalchemy.orm import DeclarativeBase
 from typing import AsyncGenerator
 
 from core.config import get_settings
+from core.slow_query_log import get_slow_query_log
 
 settings = get_settings()
 
@@ -10,8 +16,13 @@ engine = create_async_engine(
     settings.database_url,
     echo=False,
     pool_pre_ping=True,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
 )
 
+if settings.slow_query_log_enabled:
+    get_slow_query_log().attach(engine)
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -24,6 +35,22 @@ class Base(DeclarativeBase):
     pass
 
 
+def get_engine() -> AsyncEngine:
+    """Dependency that provides the application engine."""
+    return engine
+
+
+def get_pool_stats() -> dict[str, int]:
+    """Connection pool gauges for the application engine."""
+    pool = engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            stats[name] = method()
+    return stats
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session."""
     async with AsyncSessionLocal() as session:
@@ -0,0 +1,149 @@
+"""
+Readiness checks for load balancer probes.
+
+Each check is compared against a threshold from settings. Any check over its
+threshold marks the worker ``degraded`` so traffic is shed before latency
+explodes; a failed or timed-out database roundtrip marks it ``unavailable``.
+
+Event loop lag is measured by a background ticker rather than by the probe
+itself: a probe only runs once the loop is free again, so it would never see
+the time the loop was blocked before it.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from functools import lru_cache
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import Settings, get_settings
+from schemas.health import HealthCheck, ReadinessResponse
+
+
+def _threshold_check(name: str, value: float, threshold: float) -> HealthCheck:
+    return HealthCheck(
+        name=name,
+        status="ok" if value <= threshold else "degraded",
+        value=round(value, 3),
+        threshold=threshold,
+    )
+
+
+class EventLoopLagMonitor:
+    """Background ticker recording how late the event loop wakes it up.
+
+    Every `interval_s` the ticker sleeps until a scheduled time and records
+    how far past it it actually ran. Synchronous work that blocks the loop
+    shows up as drift on the next tick, and stays in the window for
+    `window_s`.
+    """
+
+    def __init__(self, interval_s: float = 0.1, window_s: float = 10.0):
+        self.interval_s = interval_s
+        self._drifts: deque[float] = deque(maxlen=max(1, math.ceil(window_s / interval_s)))
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start ticking on the running loop, unless already ticking there."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._drifts.clear()
+        self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self._drifts.append(max(loop.time() - scheduled, 0.0))
+
+    @property
+    def lag_ms(self) -> float:
+        """Largest wakeup drift in the window, in milliseconds."""
+        return max(self._drifts, default=0.0) * 1000
+
+
+@lru_cache
+def get_event_loop_lag_monitor() -> EventLoopLagMonitor:
+    settings = get_settings()
+    return EventLoopLagMonitor(
+        settings.readiness_event_loop_tick_ms / 1000, settings.readiness_event_loop_window_s
+    )
+
+
+def pool_utilization(engine: AsyncEngine, max_overflow: int) -> float | None:
+    """Fraction of the pool's capacity (size + configured max overflow) checked out."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return None
+    capacity = pool.size() + max(max_overflow, 0)
+    return pool.checkedout() / capacity if capacity else None
+
+
+async def _db_roundtrip(engine: AsyncEngine) -> tuple[float, float]:
+    """Return (checkout_ms, roundtrip_ms) for a SELECT 1."""
+    start = time.perf_counter()
+    async with engine.connect() as conn:
+        checked_out = time.perf_counter()
+        await conn.execute(text("SELECT 1"))
+        finished = time.perf_counter()
+    return (checked_out - start) * 1000, (finished - checked_out) * 1000
+
+
+async def check_readiness(
+    engine: AsyncEngine,
+    settings: Settings,
+    lag_monitor: EventLoopLagMonitor | None = None,
+) -> ReadinessResponse:
+    """Run all readiness checks."""
+    lag_monitor = lag_monitor or get_event_loop_lag_monitor()
+    # Normally started with the app; a no-op once it is ticking
+    lag_monitor.start()
+    checks = [
+        _threshold_check(
+            "event_loop_lag_ms", lag_monitor.lag_ms, settings.readiness_event_loop_lag_ms
+        )
+    ]
+
+    utilization = pool_utilization(engine, settings.database_max_overflow)
+    if utilization is not None:
+        checks.append(
+            _threshold_check(
+                "pool_utilization", utilization, settings.readiness_pool_utilization
+            )
+        )
+
+    try:
+        checkout_ms, roundtrip_ms = await asyncio.wait_for(
+            _db_roundtrip(engine), timeout=settings.readiness_db_timeout_s
+        )
+    except Exception as e:
+        checks.append(
+            HealthCheck(
+                name="db_roundtrip_ms",
+                status="failed",
+                value=None,
+                threshold=settings.readiness_db_latency_ms,
+                detail=type(e).__name__,
+            )
+        )
+        return ReadinessResponse(status="unavailable", checks=checks)
+
+    checks.append(
+        _threshold_check("pool_checkout_ms", checkout_ms, settings.readiness_pool_checkout_ms)
+    )
+    checks.append(
+        _threshold_check("db_roundtrip_ms", roundtrip_ms, settings.readiness_db_latency_ms)
+    )
+
+    degraded = any(check.status != "ok" for check in checks)
+    return ReadinessResponse(status="degraded" if degraded else "ready", checks=checks)
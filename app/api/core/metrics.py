@@ -0,0 +1,248 @@
+"""
+Prometheus-style request metrics.
+
+Per-route series are keyed by route template and request method. They are
+allocated when the app's routes are registered, or on the first request of a
+route the app does not list itself, so recording a request only increments
+existing counters. Latency is labelled with the route template
+(``/api/v1/work-orders/{work_order_id}``), never the raw path, to keep
+cardinality bounded.
+"""
+
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, Iterable
+
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(route: BaseRoute, path: str) -> str | None:
+    """The full path template of `route`, which matched the request `path`.
+
+    A route of an included router may leave the include prefix out of its own
+    path; the prefix is then the part of the request path before the part the
+    route matched. None for routes without a path.
+    """
+    template = getattr(route, "path", None)
+    path_regex = getattr(route, "path_regex", None)
+    if template is None or path_regex is None:
+        return template
+    for start, char in enumerate(path):
+        if char == "/" and path_regex.match(path[start:]):
+            return path[:start] + template
+    return template
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("bucket_counts", "sum", "count")
+
+    def __init__(self):
+        # One slot per bucket plus +Inf
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        counts = []
+        running = 0
+        for bucket_count in self.bucket_counts:
+            running += bucket_count
+            counts.append(running)
+        return counts
+
+
+class RouteMetrics:
+    """Latency and status counters for a single route template."""
+
+    __slots__ = ("method", "path", "latency", "status_counts")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.latency = Histogram()
+        self.status_counts: dict[int, int] = {}
+
+    def record(self, status: int, duration: float) -> None:
+        self.latency.observe(duration)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+
+class CacheCounter:
+    """Hit/miss counters for an in-process cache."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        self.hits += 1
+
+    def miss(self) -> None:
+        self.misses += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MetricsRegistry:
+    """Holds all metric series and renders them in Prometheus text format."""
+
+    def __init__(self):
+        self.in_flight = 0
+        # Keyed by (template, method): the route object in the request scope is
+        # not always the one registered from app.routes
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._unmatched: dict[str, RouteMetrics] = {}
+        self._caches: dict[str, CacheCounter] = {}
+        self._pool_stats: Callable[[], dict[str, int]] | None = None
+
+    def register_routes(self, routes: Iterable[BaseRoute]) -> None:
+        """Pre-allocate series for every route template."""
+        for route in routes:
+            path = getattr(route, "path", None)
+            if path is None:
+                continue
+            for method in getattr(route, "methods", None) or {"GET"}:
+                if (path, method) not in self._routes:
+                    self._routes[path, method] = RouteMetrics(method, path)
+
+    def register_cache(self, name: str) -> CacheCounter:
+        """Return the hit/miss counter for a named cache, creating it once."""
+        if name not in self._caches:
+            self._caches[name] = CacheCounter()
+        return self._caches[name]
+
+    def register_pool_stats(self, pool_stats: Callable[[], dict[str, int]]) -> None:
+        """Provide a callable returning connection pool gauges."""
+        self._pool_stats = pool_stats
+
+    def route_metrics(self, route: BaseRoute | None, method: str, path: str) -> RouteMetrics:
+        """Series of the route that matched a request for `method` and `path`."""
+        template = route_template(route, path) if route is not None else None
+        if template is None:
+            metrics = self._unmatched.get(method)
+            if metrics is None:
+                metrics = self._unmatched[method] = RouteMetrics(method, UNMATCHED_ROUTE)
+            return metrics
+        metrics = self._routes.get((template, method))
+        if metrics is None:
+            metrics = self._routes[template, method] = RouteMetrics(method, template)
+        return metrics
+
+    def render(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        all_routes = [*self._routes.values(), *self._unmatched.values()]
+        for metrics in all_routes:
+            if not metrics.latency.count:
+                continue
+            labels = f'method="{metrics.method}",route="{metrics.path}"'
+            cumulative = metrics.latency.cumulative_counts()
+            for bound, count in zip(LATENCY_BUCKETS, cumulative):
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative[-1]}'
+            )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.latency.sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.latency.count}")
+
+        lines += [
+            "# HELP http_requests_total Requests by route template and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for metrics in all_routes:
+            for status, count in sorted(metrics.status_counts.items()):
+                lines.append(
+                    f'http_requests_total{{method="{metrics.method}",'
+                    f'route="{metrics.path}",status="{status}"}} {count}'
+                )
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+
+        if self._pool_stats is not None:
+            for name, value in self._pool_stats().items():
+                lines += [
+                    f"# TYPE db_pool_{name} gauge",
+                    f"db_pool_{name} {value}",
+                ]
+
+        lines += [
+            "# HELP cache_hits_total Cache lookups that were served from the cache.",
+            "# TYPE cache_hits_total counter",
+        ]
+        lines += [f'cache_hits_total{{cache="{name}"}} {c.hits}' for name, c in self._caches.items()]
+        lines += [
+            "# HELP cache_misses_total Cache lookups that missed.",
+            "# TYPE cache_misses_total counter",
+        ]
+        lines += [f'cache_misses_total{{cache="{name}"}} {c.misses}' for name, c in self._caches.items()]
+        lines += [
+            "# HELP cache_hit_ratio Fraction of cache lookups served from the cache.",
+            "# TYPE cache_hit_ratio gauge",
+        ]
+        lines += [f'cache_hit_ratio{{cache="{name}"}} {c.hit_ratio}' for name, c in self._caches.items()]
+
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache
+def get_metrics_registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records latency, status and in-flight requests."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry | None = None):
+        self.app = app
+        self.registry = registry or get_metrics_registry()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            registry.route_metrics(scope.get("route"), scope["method"], scope["path"]).record(
+                status, time.perf_counter() - start
+            )
@@ -0,0 +1,140 @@
+"""
+Single-statement partial updates.
+
+A PUT only carries the fields the client sent (``model_dump(exclude_unset=True)``).
+`update_returning` writes them with one ``UPDATE ... RETURNING`` instead of
+load, ``setattr``, flush and refresh. Related data the response needs, such as
+the city and aircraft briefs or an item count, is returned by correlated scalar
+subqueries in the same statement. SQLite rejects data-modifying CTEs and
+RETURNING columns from ``UPDATE ... FROM`` tables, so subqueries are the form
+both databases accept.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Label, and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.concurrency import VersionConflict
+
+# Separates the related object from its field in the RETURNING labels
+_SEPARATOR = "__"
+
+
+class Updated:
+    """The updated entity with the related data returned alongside it.
+
+    Attribute access falls through to the entity, so response builders that
+    read ``wo.city.code`` or ``wo.status`` work on it unchanged without
+    triggering relationship loads.
+    """
+
+    def __init__(self, entity: Any, related: dict[str, Any]):
+        self._entity = entity
+        self.__dict__.update(related)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entity, name)
+
+    @classmethod
+    def from_row(cls, row: Any, returning: tuple[Label, ...] | list[Label]) -> "Updated":
+        """Wrap a ``RETURNING (entity, *returning)`` row."""
+        entity, *extra = row
+        return cls(entity, _group_related([column.name for column in returning], tuple(extra)))
+
+
+def related_columns(name: str, join_on: ColumnElement[bool], *columns: Any) -> list[Label]:
+    """Correlated subqueries selecting `columns` of the related row `join_on` matches.
+
+    The results come back on the `Updated` result as one object named `name`,
+    or None when the reference is NULL.
+    """
+    return [
+        select(column)
+        .where(join_on)
+        .correlate_except(column.table)
+        .scalar_subquery()
+        .label(f"{name}{_SEPARATOR}{column.key}")
+        for column in columns
+    ]
+
+
+def _group_related(labels: list[str], values: tuple) -> dict[str, Any]:
+    related: dict[str, Any] = {}
+    for label, value in zip(labels, values):
+        name, _, field = label.partition(_SEPARATOR)
+        if not field:
+            related[name] = value
+            continue
+        related.setdefault(name, {})[field] = value
+    for name, value in related.items():
+        if isinstance(value, dict):
+            # Every column NULL means an unset optional reference
+            related[name] = (
+                SimpleNamespace(**value) if any(v is not None for v in value.values()) else None
+            )
+    return related
+
+
+async def update_returning(
+    db: AsyncSession,
+    model: Any,
+    where: ColumnElement[bool],
+    values: dict[str, Any],
+    *returning: Label,
+    expected_versions: list[int] | None = None,
+) -> Updated | None:
+    """Apply `values` to the row matching `where` and return it in one statement.
+
+    `returning` adds labeled expressions evaluated against the updated row,
+    typically built with `related_columns`. A related object whose columns all
+    came back NULL (an unset optional reference) is returned as None.
+    ``updated_at`` is always bumped, as is ``version`` on versioned models.
+    Returns None when no row matched.
+
+    Raises:
+        VersionConflict: If `expected_versions` is given and the row exists
+            with a version outside it.
+    """
+    values = {**values, "updated_at": datetime.utcnow()}
+    versioned = "version" in model.__table__.c
+    if versioned:
+        values["version"] = model.version + 1
+
+    condition = where
+    if versioned and expected_versions is not None:
+        condition = and_(where, model.version.in_(expected_versions))
+
+    query = (
+        update(model)
+        .where(condition)
+        .values(**values)
+        .returning(model, *returning)
+        .execution_options(populate_existing=True)
+    )
+    row = (await db.execute(query)).first()
+    if row is None:
+        if condition is not where:
+            # Only a failed compare-and-swap pays for telling 412 from 404
+            current = (await db.execute(select(model.version).where(where))).scalar_one_or_none()
+            if current is not None:
+                raise VersionConflict(current)
+        return None
+
+    return Updated.from_row(row, returning)
+
+
+async def not_found_detail(
+    db: AsyncSession, parent: Any, parent_uuid: UUID, parent_name: str, name: str
+) -> str:
+    """The 404 detail for a nested row that `update_returning` did not find.
+
+    An update scoped to its parent matches nothing both when the parent is
+    missing and when only the row is. Only the miss path pays for working out
+    which 404 applies, with one lookup of the parent's key.
+    """
+    exists = (await db.execute(select(parent.id).where(parent.uuid == parent_uuid))).first()
+    return f"{name} not found" if exists else f"{parent_name} not found"
@@ -0,0 +1,204 @@
+"""
+On-demand request profiling.
+
+Only installed when ``PROFILING_TOKEN`` is set. A request carrying
+``Authorization: Bearer <token>`` is sampled while it runs; the profile is
+stored under the id returned in the ``X-Profile-Id`` response header and served
+by the admin router, which requires the same header. Admin requests themselves
+are never profiled, so reading the profiles does not push them out. The token is never read
+from the query string, where it would end up in URLs and access logs.
+
+pyinstrument is used when it is installed (speedscope JSON output). Otherwise a
+stdlib sampler walks the event loop thread's stack with
+``sys._current_frames()`` and produces folded stacks, the input format of
+flamegraph.pl, speedscope and most other flame graph viewers. Both samplers see
+the whole event loop, so concurrent requests show up in the profile too.
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import get_settings
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - depends on the environment
+    Profiler = None
+
+AUTHORIZATION_HEADER = b"authorization"
+
+# Prefix of the admin router under the API prefix
+ADMIN_PATH = "/admin"
+
+
+def is_bearer_token(authorization: str | None, token: str | None) -> bool:
+    """Check an ``Authorization`` value is ``Bearer <token>``; always false without a token."""
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return bool(
+        token
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(credentials.encode(), token.encode())
+    )
+
+
+@dataclass
+class StoredProfile:
+    """A captured request profile."""
+
+    id: str
+    method: str
+    path: str
+    recorded_at: datetime
+    duration_ms: float
+    media_type: str
+    content: str
+
+
+class StackSampler:
+    """Stdlib sampling profiler producing folded stacks for one thread."""
+
+    def __init__(self, interval: float = 0.001, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Render samples as folded stacks (``frame;frame;frame count``)."""
+        return "\n".join(
+            f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()
+        )
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in memory."""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, StoredProfile] = OrderedDict()
+
+    def add(self, profile: StoredProfile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> StoredProfile | None:
+        return self._profiles.get(profile_id)
+
+    @property
+    def profiles(self) -> list[StoredProfile]:
+        """Stored profiles, newest first."""
+        return list(reversed(self._profiles.values()))
+
+
+@lru_cache
+def get_profile_store() -> ProfileStore:
+    return ProfileStore()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests carrying the profiling token."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str,
+        interval_ms: float = 1.0,
+        store: ProfileStore | None = None,
+        admin_path_prefix: str | None = None,
+    ):
+        self.app = app
+        self.token = token
+        self.interval = interval_ms / 1000
+        self.store = store or get_profile_store()
+        self.admin_path_prefix = (
+            admin_path_prefix or f"{get_settings().api_v1_prefix}{ADMIN_PATH}"
+        )
+
+    def _requested(self, scope: Scope) -> bool:
+        # Admin routes require the token too, but are not what is being profiled
+        if scope["path"].startswith(self.admin_path_prefix):
+            return False
+        for name, value in scope["headers"]:
+            if name == AUTHORIZATION_HEADER:
+                return is_bearer_token(value.decode("latin-1"), self.token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        start = time.perf_counter()
+        if Profiler is not None:
+            profiler = Profiler(interval=self.interval, async_mode="enabled")
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.stop()
+                content = profiler.output(renderer=SpeedscopeRenderer())
+                media_type = "application/json"
+        else:
+            sampler = StackSampler(interval=self.interval)
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                sampler.stop()
+                content = sampler.folded()
+                media_type = "text/plain"
+
+        self.store.add(
+            StoredProfile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                recorded_at=datetime.now(timezone.utc),
+                duration_ms=round((time.perf_counter() - start) * 1000, 3),
+                media_type=media_type,
+                content=content,
+            )
+        )
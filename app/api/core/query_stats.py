@@ -0,0 +1,132 @@
+"""
+Per-request SQL statement accounting.
+
+Cursor execution events from every SQLAlchemy engine are counted into the
+collectors that are active in the current context. The middleware opens one
+collector per HTTP request and reports the totals in a ``Server-Timing``
+header; tests can open their own collector with ``track_queries()`` to put a
+budget on how many statements an endpoint may issue.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Statement count and cumulative database time for one unit of work."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: list[str] = field(default_factory=list)
+    keep_statements: bool = False
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+# Collectors active in the current context. A tuple so nested collectors
+# (a test budget around a request) can be pushed without copying state.
+_active_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "active_query_collectors", default=()
+)
+
+
+@contextmanager
+def track_queries(keep_statements: bool = False) -> Iterator[QueryStats]:
+    """Count statements executed in the current context until exit."""
+    stats = QueryStats(keep_statements=keep_statements)
+    token = _active_collectors.set(_active_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_collectors.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _active_collectors.get():
+        return
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _active_collectors.get()
+    if not collectors:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    for stats in collectors:
+        stats.count += 1
+        stats.duration += elapsed
+        if stats.keep_statements:
+            stats.statements.append(statement)
+
+
+def format_server_timing(stats: QueryStats) -> str:
+    """Render query stats as a Server-Timing header value."""
+    return f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries"'
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that counts SQL statements per HTTP request.
+
+    Adds a ``Server-Timing`` header with the statement count and total DB
+    time, and logs a warning for requests over either threshold.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        count_threshold: int = 25,
+        duration_threshold_ms: float = 250.0,
+    ):
+        self.app = app
+        self.count_threshold = count_threshold
+        self.duration_threshold_ms = duration_threshold_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (b"server-timing", format_server_timing(stats).encode("latin-1"))
+                    )
+                    message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if (
+                    stats.count > self.count_threshold
+                    or stats.duration_ms > self.duration_threshold_ms
+                ):
+                    logger.warning(
+                        "%s %s issued %d queries (%.1f ms DB time)",
+                        scope["method"],
+                        scope["path"],
+                        stats.count,
+                        stats.duration_ms,
+                    )
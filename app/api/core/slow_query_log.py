@@ -0,0 +1,188 @@
+"""
+Opt-in slow query log.
+
+When attached to an engine, every statement is timed. Statements slower than
+the threshold are normalized, their parameters redacted, and (for a sampled
+fraction on PostgreSQL) an ``EXPLAIN (FORMAT JSON)`` plan is captured. Entries
+are kept in an in-memory ring buffer served by the admin router and can also
+be appended as JSON lines to a rotating local file.
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE_PREFIXES = ("select", "insert", "update", "delete", "with")
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<!\$)\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(
+    r"\bIN\s*\((?:\s*(?:\?|\$\d+|%\(\w+\)s)(?:::\w+)?\s*,?)+\)", re.IGNORECASE
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals so equivalent statements group."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Replace bound values with their type names so no data is logged."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return None
+
+
+@dataclass
+class SlowQueryEntry:
+    """A single slow statement."""
+
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    plan: Any | None = None
+
+
+class SlowQueryLog:
+    """Ring buffer (and optional rotating file) of slow statements."""
+
+    def __init__(
+        self,
+        threshold_ms: float = 200.0,
+        explain_sample_rate: float = 0.1,
+        buffer_size: int = 200,
+        log_file: str | None = None,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: deque[SlowQueryEntry] = deque(maxlen=buffer_size)
+        self._file_logger: logging.Logger | None = None
+        if log_file:
+            self._file_logger = logging.getLogger(f"{__name__}.file")
+            self._file_logger.propagate = False
+            self._file_logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(log_file, maxBytes=10_000_000, backupCount=5)
+            self._file_logger.addHandler(handler)
+
+    @property
+    def entries(self) -> list[SlowQueryEntry]:
+        """Recorded entries, newest first."""
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def record(self, entry: SlowQueryEntry) -> None:
+        self._entries.append(entry)
+        if self._file_logger:
+            self._file_logger.info(json.dumps(asdict(entry), default=str))
+
+    def attach(self, engine: AsyncEngine | Engine) -> None:
+        """Start timing statements executed on the engine."""
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self, engine: AsyncEngine | Engine) -> None:
+        """Stop timing statements executed on the engine."""
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        event.remove(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        start_times = conn.info.get("slow_query_start_time")
+        if not start_times:
+            return
+        duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        plan = None
+        if random.random() < self.explain_sample_rate:
+            plan = self._explain(conn, statement, parameters, executemany)
+
+        self.record(
+            SlowQueryEntry(
+                recorded_at=datetime.now(timezone.utc),
+                duration_ms=round(duration_ms, 3),
+                statement=normalize_sql(statement),
+                parameters=redact_parameters(parameters, executemany),
+                plan=plan,
+            )
+        )
+
+    def _explain(self, conn, statement, parameters, executemany) -> Any | None:
+        """Capture a PostgreSQL plan without executing the statement again.
+
+        The EXPLAIN runs in the request's transaction, inside a savepoint that
+        is rolled back if it fails, so a failed EXPLAIN never aborts the
+        transaction of the request being measured.
+        """
+        if executemany or conn.dialect.name != "postgresql":
+            return None
+        if not statement.lstrip().lower().startswith(_EXPLAINABLE_PREFIXES):
+            return None
+        # Raw DBAPI cursor so the EXPLAIN itself does not fire cursor events
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                row = cursor.fetchone()
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        except Exception:
+            logger.warning("Could not capture plan for slow query", exc_info=True)
+            return None
+        finally:
+            cursor.close()
+        if not row:
+            return None
+        plan = row[0]
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+
+@lru_cache
+def get_slow_query_log() -> SlowQueryLog:
+    settings = get_settings()
+    return SlowQueryLog(
+        threshold_ms=settings.slow_query_threshold_ms,
+        explain_sample_rate=settings.slow_query_explain_sample_rate,
+        buffer_size=settings.slow_query_buffer_size,
+        log_file=settings.slow_query_log_file,
+    )
@@ -5,6 +5,10 @@ from crud.work_order import (
     create_work_order,
     update_work_order,
     delete_work_order,
+    clone_work_order,
+    convert_quote_to_work_order,
+    import_work_orders,
+    transition_work_order_status,
 )
 from crud.work_order_item import (
     get_work_order_items,
@@ -12,6 +16,7 @@ from crud.work_order_item import (
     create_work_order_item,
     update_work_order_item,
     delete_work_order_item,
+    apply_work_order_item_batch,
 )
 from crud.labor_kit import (
     get_labor_kits,
@@ -34,7 +39,9 @@ from crud.aircraft import (
     create_aircraft,
     update_aircraft,
     delete_aircraft,
+    upsert_aircraft,
 )
+from crud.work_order_archive import archive_work_orders
 
 __all__ = [
     "get_cities",
@@ -44,11 +51,16 @@ __all__ = [
     "create_work_order",
     "update_work_order",
     "delete_work_order",
+    "clone_work_order",
+    "convert_quote_to_work_order",
+    "import_work_orders",
+    "transition_work_order_status",
     "get_work_order_items",
     "get_work_order_item_by_uuid",
     "create_work_order_item",
     "update_work_order_item",
     "delete_work_order_item",
+    "apply_work_order_item_batch",
     "get_labor_kits",
     "get_labor_kit_by_uuid",
     "create_labor_kit",
@@ -65,4 +77,6 @@ __all__ = [
     "create_aircraft",
     "update_aircraft",
     "delete_aircraft",
+    "upsert_aircraft",
+    "archive_work_orders",
 ]
@@ -1,12 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, asc, desc
+from sqlalchemy import select, func, asc, desc, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import selectinload
-from uuid import UUID
+from typing import AsyncIterable
+from uuid import UUID, uuid4
 from datetime import datetime
 
 from models.aircraft import Aircraft
 from models.city import City
-from schemas.aircraft import AircraftCreate, AircraftUpdate
+from schemas.aircraft import AircraftCreate, AircraftUpdate, AircraftImportRow
+from core.bulk import achunked
+from core.counting import CountMode, Total, count_total
+from core.partial_update import Updated, related_columns, update_returning
 from core.sorting import SortOrder
 
 # Allowed columns for sorting aircraft
@@ -19,6 +25,20 @@ AIRCRAFT_SORT_COLUMNS = {
     "created_at": Aircraft.created_at,
 }
 
+# Columns an upsert leaves unchanged when the import row leaves them blank
+AIRCRAFT_UPSERT_OPTIONAL_COLUMNS = (
+    "serial_number",
+    "make",
+    "model",
+    "year_built",
+    "meter_profile",
+    "primary_city_id",
+    "customer_name",
+    "aircraft_class",
+    "fuel_code",
+    "notes",
+)
+
 
 async def get_aircraft_list(
     db: AsyncSession,
@@ -29,13 +49,19 @@ async def get_aircraft_list(
     active_only: bool = True,
     sort_by: str | None = None,
     sort_order: SortOrder = SortOrder.DESC,
-) -> tuple[list[Aircraft], int]:
-    """Get aircraft with pagination and filtering."""
+    count_mode: CountMode = CountMode.EXACT,
+) -> tuple[list[Aircraft], Total]:
+    """Get aircraft with pagination and filtering.
+
+    The total is exact for small lists and otherwise totalled as
+    `count_mode` asks (see core.counting).
+    """
     # Build query
     query = select(Aircraft).options(selectinload(Aircraft.primary_city))
 
     # Apply filters
     filters = []
+    primary_city_id = None
 
     if active_only:
         filters.append(Aircraft.is_active == True)
@@ -46,6 +72,7 @@ async def get_aircraft_list(
         city_result = await db.execute(city_query)
         city = city_result.scalar_one_or_none()
         if city:
+            primary_city_id = city.id
             filters.append(Aircraft.primary_city_id == city.id)
 
     if search:
@@ -61,12 +88,13 @@ async def get_aircraft_list(
     if filters:
         query = query.where(*filters)
 
-    # Get total count
-    count_query = select(func.count(Aircraft.id))
-    if filters:
-        count_query = count_query.where(*filters)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    # Get total count, cached per filter set
+    total = await count_total(
+        db,
+        select(Aircraft.id).where(*filters),
+        count_mode,
+        cache_key=("aircraft", active_only, primary_city_id, search),
+    )
 
     # Apply sorting
     sort_column = AIRCRAFT_SORT_COLUMNS.get(sort_by, Aircraft.created_at)
@@ -133,34 +161,35 @@ async def create_aircraft(db: AsyncSession, aircraft_in: AircraftCreate) -> Airc
 
 async def update_aircraft(
     db: AsyncSession, aircraft_uuid: UUID, aircraft_in: AircraftUpdate
-) -> Aircraft | None:
-    """Update an aircraft."""
-    aircraft = await get_aircraft_by_uuid(db, aircraft_uuid)
-    if not aircraft:
-        return None
+) -> Updated | None:
+    """Update an aircraft in one statement, returning its primary city brief.
 
-    # Handle city update if provided
+    Raises:
+        ValueError: If the new primary city does not exist.
+    """
     update_data = aircraft_in.model_dump(exclude_unset=True)
+
+    # Resolve the city first so an unknown one is a 400, not a missing row
     if "primary_city_id" in update_data:
         city_uuid = update_data.pop("primary_city_id")
         if city_uuid:
-            city_query = select(City).where(City.uuid == city_uuid)
-            city_result = await db.execute(city_query)
-            city = city_result.scalar_one_or_none()
-            if not city:
+            city_query = select(City.id).where(City.uuid == city_uuid)
+            city_id = (await db.execute(city_query)).scalar_one_or_none()
+            if city_id is None:
                 raise ValueError(f"City not found: {city_uuid}")
-            update_data["primary_city_id"] = city.id
+            update_data["primary_city_id"] = city_id
         else:
             update_data["primary_city_id"] = None
 
-    # Update fields
-    for field, value in update_data.items():
-        setattr(aircraft, field, value)
-
-    aircraft.updated_at = datetime.utcnow()
-    await db.flush()
-    await db.refresh(aircraft, ["primary_city"])
-    return aircraft
+    return await update_returning(
+        db,
+        Aircraft,
+        Aircraft.uuid == aircraft_uuid,
+        update_data,
+        *related_columns(
+            "primary_city", City.id == Aircraft.primary_city_id, City.uuid, City.code, City.name
+        ),
+    )
 
 
 async def delete_aircraft(db: AsyncSession, aircraft_uuid: UUID) -> bool:
@@ -190,3 +219,143 @@ async def delete_aircraft(db: AsyncSession, aircraft_uuid: UUID) -> bool:
 
     await db.delete(aircraft)
     return True
+
+
+def _upsert_statement(dialect_name: str, updated_by: str, set_is_active: bool):
+    """INSERT ... ON CONFLICT (registration_number) DO UPDATE for the session's dialect.
+
+    An existing aircraft's `is_active` is only overwritten with `set_is_active`;
+    rows that leave it out must not reactivate a retired aircraft.
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = insert(Aircraft)
+    table = Aircraft.__table__
+    set_ = {
+        column: func.coalesce(statement.excluded[column], table.c[column])
+        for column in AIRCRAFT_UPSERT_OPTIONAL_COLUMNS
+    }
+    if set_is_active:
+        set_["is_active"] = statement.excluded.is_active
+    if dialect_name == "postgresql":
+        # xmax is only set on a row version written by the ON CONFLICT update
+        inserted = literal_column("xmax") == 0
+    else:
+        # An update keeps the row's created_at but writes a new updated_at
+        inserted = table.c.created_at == table.c.updated_at
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.registration_number],
+        set_={**set_, "updated_by": updated_by, "updated_at": statement.excluded.updated_at},
+    ).returning(inserted)
+
+
+async def _upsert_rows(
+    db: AsyncSession, statement, rows: list[tuple[int, dict]], errors: list[tuple[int, str]]
+) -> list[bool]:
+    """Upsert rows in one statement, falling back to one SAVEPOINT per row on error.
+
+    Returns whether each applied row was inserted (rather than updated).
+    """
+    try:
+        async with db.begin_nested():
+            result = await db.execute(statement, [values for _, values in rows])
+            return list(result.scalars())
+    except DBAPIError:
+        pass
+
+    applied = []
+    for line, values in rows:
+        try:
+            async with db.begin_nested():
+                applied.append((await db.execute(statement, [values])).scalar_one())
+        except DBAPIError as e:
+            errors.append((line, f"Could not save: {e.orig}"))
+    return applied
+
+
+async def upsert_aircraft(
+    db: AsyncSession,
+    rows: AsyncIterable[tuple[int, AircraftImportRow]],
+    imported_by: str,
+    chunk_size: int = 1000,
+) -> tuple[int, int, list[tuple[int, str]]]:
+    """
+    Insert or update aircraft keyed on registration number.
+
+    `rows` is consumed `chunk_size` at a time as the upload arrives. Each
+    chunk resolves its new primary city codes in one lookup and is written
+    with a single ``INSERT ... ON CONFLICT DO UPDATE`` (two when only some
+    rows give `is_active`), whose RETURNING tells inserted rows from updated
+    ones; blank optional fields, and a missing `is_active`, keep the existing
+    value. Rows with an unknown city, a registration repeated in the
+    upload, or a database error are rejected and the rest are applied.
+
+    Returns:
+        Tuple of (inserted, updated, [(line, error_message), ...])
+    """
+    dialect_name = db.get_bind().dialect.name
+    statements = {
+        set_is_active: _upsert_statement(dialect_name, imported_by, set_is_active)
+        for set_is_active in (False, True)
+    }
+    city_ids: dict[str, int] = {}
+    first_line: dict[str, int] = {}
+    errors: list[tuple[int, str]] = []
+    inserted = updated = 0
+
+    async for chunk in achunked(rows, chunk_size):
+        accepted = []
+        for line, row in chunk:
+            if row.registration_number in first_line:
+                errors.append(
+                    (
+                        line,
+                        f"Duplicate registration_number {row.registration_number} "
+                        f"(first on line {first_line[row.registration_number]})",
+                    )
+                )
+            else:
+                first_line[row.registration_number] = line
+                accepted.append((line, row))
+
+        new_codes = {row.primary_city_code for _, row in accepted if row.primary_city_code}
+        new_codes -= city_ids.keys()
+        if new_codes:
+            result = await db.execute(select(City.code, City.id).where(City.code.in_(new_codes)))
+            city_ids.update(result.tuples().all())
+
+        now = datetime.utcnow()
+        values = []
+        sets_is_active: dict[int, bool] = {}
+        for line, row in accepted:
+            if row.primary_city_code and row.primary_city_code not in city_ids:
+                errors.append((line, f"City not found: {row.primary_city_code}"))
+                continue
+            sets_is_active[line] = "is_active" in row.model_fields_set
+            values.append(
+                (
+                    line,
+                    {
+                        "uuid": uuid4(),
+                        **row.model_dump(exclude={"primary_city_code", "created_by"}),
+                        "primary_city_id": city_ids.get(row.primary_city_code),
+                        "created_by": row.created_by or imported_by,
+                        "created_at": now,
+                        "updated_at": now,
+                    },
+                )
+            )
+        if not values:
+            continue
+
+        for set_is_active, statement in statements.items():
+            group = [(line, v) for line, v in values if sets_is_active[line] == set_is_active]
+            if not group:
+                continue
+            for was_inserted in await _upsert_rows(db, statement, group, errors):
+                if was_inserted:
+                    inserted += 1
+                else:
+                    updated += 1
+
+    errors.sort()
+    return inserted, updated, errors
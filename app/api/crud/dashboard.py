@@ -1,9 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from models.work_order import WorkOrder, WorkOrderStatus
+from models.work_order import WorkOrder
 from models.city import City
 from schemas.dashboard import CityWorkOrderCount
+from crud.work_order import is_open
 
 
 async def get_open_work_order_counts_by_city(
@@ -18,7 +19,7 @@ async def get_open_work_order_counts_by_city(
             func.count(WorkOrder.id).label("open_count"),
         )
         .join(WorkOrder, WorkOrder.city_id == City.id)
-        .where(WorkOrder.status.not_in(WorkOrderStatus.terminal_statuses()))
+        .where(is_open(WorkOrder.status))
         .group_by(City.uuid, City.code, City.name)
         .order_by(func.count(WorkOrder.id).desc())
     )
@@ -1,13 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, asc, desc
+from sqlalchemy import select, delete, func, asc, desc
 from uuid import UUID
-from datetime import datetime
 
 from models.labor_kit import LaborKit
 from models.labor_kit_item import LaborKitItem
 from models.work_order import WorkOrder
 from models.work_order_item import WorkOrderItem, WorkOrderItemStatus
 from schemas.labor_kit import LaborKitCreate, LaborKitUpdate
+from core.partial_update import Updated, update_returning
 from core.sorting import SortOrder
 
 # Allowed columns for sorting labor kits
@@ -76,31 +76,18 @@ async def create_labor_kit(db: AsyncSession, kit_in: LaborKitCreate) -> LaborKit
 
 async def update_labor_kit(
     db: AsyncSession, kit_uuid: UUID, kit_in: LaborKitUpdate
-) -> LaborKit | None:
-    """Update a labor kit."""
-    kit = await get_labor_kit_by_uuid(db, kit_uuid)
-    if not kit:
-        return None
-
-    # Update fields
-    update_data = kit_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(kit, field, value)
-
-    kit.updated_at = datetime.utcnow()
-    await db.flush()
-    await db.refresh(kit)
-    return kit
+) -> Updated | None:
+    """Update a labor kit in one statement."""
+    return await update_returning(
+        db, LaborKit, LaborKit.uuid == kit_uuid, kit_in.model_dump(exclude_unset=True)
+    )
 
 
 async def delete_labor_kit(db: AsyncSession, kit_uuid: UUID) -> bool:
-    """Delete a labor kit."""
-    kit = await get_labor_kit_by_uuid(db, kit_uuid)
-    if not kit:
-        return False
-
-    await db.delete(kit)
-    return True
+    """Delete a labor kit in one statement; ON DELETE CASCADE removes its items."""
+    query = delete(LaborKit).where(LaborKit.uuid == kit_uuid).returning(LaborKit.id)
+    result = await db.execute(query)
+    return result.scalar_one_or_none() is not None
 
 
 async def apply_labor_kit_to_work_order(
@@ -142,7 +129,8 @@ async def apply_labor_kit_to_work_order(
 
     # Get the current max item number for the work order
     max_item_query = select(func.coalesce(func.max(WorkOrderItem.item_number), 0)).where(
-        WorkOrderItem.work_order_id == work_order.id
+        WorkOrderItem.work_order_id == work_order.id,
+        WorkOrderItem.city_id == work_order.city_id,
     )
     max_result = await db.execute(max_item_query)
     next_item_number = max_result.scalar() + 1
@@ -152,6 +140,7 @@ async def apply_labor_kit_to_work_order(
     for kit_item in kit_items:
         wo_item = WorkOrderItem(
             work_order_id=work_order.id,
+            city_id=work_order.city_id,
             item_number=next_item_number,
             status=WorkOrderItemStatus.OPEN,
             discrepancy=kit_item.discrepancy,
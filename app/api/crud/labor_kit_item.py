@@ -1,11 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, asc, desc
+from sqlalchemy import select, func, and_, asc, desc
 from uuid import UUID
-from datetime import datetime
 
 from models.labor_kit import LaborKit
 from models.labor_kit_item import LaborKitItem
 from schemas.labor_kit_item import LaborKitItemCreate, LaborKitItemUpdate
+from core.partial_update import Updated, update_returning
 from core.sorting import SortOrder
 
 # Allowed columns for sorting labor kit items
@@ -111,22 +111,22 @@ async def create_labor_kit_item(
 
 
 async def update_labor_kit_item(
-    db: AsyncSession, item_uuid: UUID, item_in: LaborKitItemUpdate
-) -> LaborKitItem | None:
-    """Update a labor kit item."""
-    item = await get_labor_kit_item_by_uuid(db, item_uuid)
-    if not item:
-        return None
-
-    # Update fields
-    update_data = item_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(item, field, value)
-
-    item.updated_at = datetime.utcnow()
-    await db.flush()
-    await db.refresh(item)
-    return item
+    db: AsyncSession,
+    item_uuid: UUID,
+    item_in: LaborKitItemUpdate,
+    kit_uuid: UUID | None = None,
+) -> Updated | None:
+    """Update a labor kit item in one statement.
+
+    With `kit_uuid`, only an item belonging to that kit is updated.
+    """
+    where = LaborKitItem.uuid == item_uuid
+    if kit_uuid is not None:
+        kit_id = select(LaborKit.id).where(LaborKit.uuid == kit_uuid).scalar_subquery()
+        where = and_(where, LaborKitItem.labor_kit_id == kit_id)
+    return await update_returning(
+        db, LaborKitItem, where, item_in.model_dump(exclude_unset=True)
+    )
 
 
 async def delete_labor_kit_item(db: AsyncSession, item_uuid: UUID) -> bool:
@@ -1,14 +1,38 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, asc, desc
+from sqlalchemy import select, insert, update, delete, func, literal, bindparam, and_, asc, desc, case
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import selectinload
-from uuid import UUID
-from datetime import datetime
+from sqlalchemy.orm.attributes import set_committed_value
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
 
-from models.work_order import WorkOrder
+from models.work_order import WorkOrder, WorkOrderStatus, WorkOrderType
 from models.city import City
 from models.aircraft import Aircraft
-from schemas.work_order import WorkOrderCreate, WorkOrderUpdate
+from models.work_order_item import WorkOrderItem, WorkOrderItemStatus
+from schemas.work_order import (
+    WorkOrderCreate,
+    WorkOrderUpdate,
+    WorkOrderCopy,
+    WorkOrderImportRow,
+    WorkOrderStatusTransition,
+    WorkOrderView,
+)
+from core.bulk import chunked
+from core.counting import CountMode, Total, count_total
+from core.partial_update import Updated, related_columns, update_returning
 from core.sorting import SortOrder
+from crud.work_order_archive import archived, with_archive
+
+
+class StatusTransitionError(Exception):
+    """A work order cannot move from its current status to the requested one."""
+
+    def __init__(self, current: WorkOrderStatus, target: WorkOrderStatus):
+        super().__init__(f"Cannot move from {current.value} to {target.value}")
+        self.current = current
+        self.target = target
+
 
 # Allowed columns for sorting work orders
 WORK_ORDER_SORT_COLUMNS = {
@@ -20,80 +44,178 @@ WORK_ORDER_SORT_COLUMNS = {
 }
 
 
+def _related_columns(wo, item) -> list:
+    """Briefs of work order `wo` whose items are in `item` (live or archived)."""
+    return [
+        *related_columns("city", City.id == wo.city_id, City.uuid, City.code, City.name),
+        *related_columns(
+            "aircraft",
+            Aircraft.id == wo.aircraft_id,
+            Aircraft.uuid,
+            Aircraft.registration_number,
+            Aircraft.serial_number,
+            Aircraft.make,
+            Aircraft.model,
+            Aircraft.year_built,
+        ),
+        select(func.count(item.id))
+        .where(
+            item.work_order_id == wo.id,
+            # Prunes the items to the work order's city partition
+            item.city_id == wo.city_id,
+        )
+        .correlate_except(item)
+        .scalar_subquery()
+        .label("item_count"),
+    ]
+
+
+# Briefs returned alongside an updated work order
+WORK_ORDER_RELATED_COLUMNS = _related_columns(WorkOrder, WorkOrderItem)
+
+
 async def get_next_sequence_number(db: AsyncSession, city_id: int) -> int:
-    """Get the next sequence number for a city."""
-    query = select(func.coalesce(func.max(WorkOrder.sequence_number), 0) + 1).where(
-        WorkOrder.city_id == city_id
+    """Get the next sequence number for a city, past its archived work orders too."""
+    existing = with_archive(WorkOrder)
+    query = select(func.coalesce(func.max(existing.sequence_number), 0) + 1).where(
+        existing.city_id == city_id
     )
     result = await db.execute(query)
     return result.scalar()
 
 
-def generate_work_order_number(city_code: str, sequence: int) -> str:
+def generate_work_order_number(
+    city_code: str, sequence: int, created: datetime | None = None
+) -> str:
     """Generate a work order number in format: KTYS00001-01-2026."""
-    now = datetime.utcnow()
-    month = now.month
-    year = now.year
+    created = created or datetime.utcnow()
+    month = created.month
+    year = created.year
     return f"{city_code}{sequence:05d}-{month:02d}-{year}"
 
 
+def is_open(status_column):
+    """Match work orders that are not closed.
+
+    The closed statuses are inlined rather than bound, so PostgreSQL can prove
+    the condition matches the partial open work order indexes (V011).
+    """
+    closed = bindparam(
+        "closed_statuses",
+        WorkOrderStatus.terminal_statuses(),
+        expanding=True,
+        literal_execute=True,
+        unique=True,
+    )
+    return status_column.not_in(closed)
+
+
+# Saved list views and the filters each one applies
+WORK_ORDER_VIEWS = {
+    WorkOrderView.MY_OPEN_ITEMS: {"open_only": True, "mine_only": True},
+    WorkOrderView.OPEN: {"open_only": True},
+    WorkOrderView.ALL: {},
+    WorkOrderView.OPEN_QUOTES: {"open_only": True, "work_order_type": WorkOrderType.QUOTE},
+    WorkOrderView.ALL_QUOTES: {"work_order_type": WorkOrderType.QUOTE},
+}
+
+
 async def get_work_orders(
     db: AsyncSession,
     city_uuid: UUID,
     page: int = 1,
     page_size: int = 20,
     search: str | None = None,
-    status: str | None = None,
+    statuses: list[str] | None = None,
     sort_by: str | None = None,
     sort_order: SortOrder = SortOrder.DESC,
-) -> tuple[list[WorkOrder], int]:
-    """Get work orders for a city with pagination and filtering."""
+    view: WorkOrderView | None = None,
+    open_only: bool = False,
+    lead_technician: str | None = None,
+    work_order_type: str | None = None,
+    count_mode: CountMode = CountMode.EXACT,
+) -> tuple[list[Updated], Total]:
+    """Get work orders for a city with pagination and filtering.
+
+    `view` applies the filters of a saved list view on top of the others;
+    ``my_open_items`` lists the open work orders of `lead_technician`.
+    Unless every requested status is open, archived work orders are listed
+    with the live ones. Each work order comes with its ``item_count``,
+    counted in one grouped query confined to the city's items instead of
+    loading every item. The total is exact for small lists and otherwise
+    totalled as `count_mode` asks (see core.counting).
+
+    Raises:
+        ValueError: If the view is ``my_open_items`` and no lead technician is given.
+    """
+    if view is not None:
+        preset = WORK_ORDER_VIEWS[view]
+        if preset.get("mine_only") and not lead_technician:
+            raise ValueError(f"The {view.value} view needs a lead_technician")
+        open_only = open_only or preset.get("open_only", False)
+        work_order_type = work_order_type or preset.get("work_order_type")
+
     # Get city first
     city_query = select(City).where(City.uuid == city_uuid)
     city_result = await db.execute(city_query)
     city = city_result.scalar_one_or_none()
     if not city:
-        return [], 0
+        return [], Total(0)
 
-    # Build query
-    query = (
-        select(WorkOrder)
-        .options(
-            selectinload(WorkOrder.city),
-            selectinload(WorkOrder.aircraft),
-            selectinload(WorkOrder.items),
-        )
-        .where(WorkOrder.city_id == city.id)
-    )
+    # The archive only holds closed work orders, so open views skip it
+    terminal = WorkOrderStatus.terminal_statuses()
+    if not open_only and (not statuses or any(status in terminal for status in statuses)):
+        wo, item = with_archive(WorkOrder), with_archive(WorkOrderItem)
+    else:
+        wo, item = WorkOrder, WorkOrderItem
 
-    # Apply filters
+    # Filters shared by the page and the count
+    filters = [wo.city_id == city.id]
     if search:
         search_filter = f"%{search}%"
-        query = query.join(Aircraft).where(
-            WorkOrder.work_order_number.ilike(search_filter)
-            | WorkOrder.customer_name.ilike(search_filter)
+        filters.append(
+            wo.work_order_number.ilike(search_filter)
+            | wo.customer_name.ilike(search_filter)
             | Aircraft.registration_number.ilike(search_filter)
         )
+    if statuses:
+        filters.append(wo.status.in_(statuses))
+    if open_only:
+        filters.append(is_open(wo.status))
+    if lead_technician:
+        filters.append(wo.lead_technician == lead_technician)
+    if work_order_type:
+        filters.append(wo.work_order_type == work_order_type)
 
-    if status:
-        query = query.where(WorkOrder.status == status)
-
-    # Get total count
-    count_query = select(func.count(WorkOrder.id)).where(WorkOrder.city_id == city.id)
+    # Build query
+    query = select(wo).options(
+        selectinload(wo.city),
+        selectinload(wo.aircraft),
+    )
+    count_query = select(wo.id)
     if search:
-        search_filter = f"%{search}%"
-        count_query = count_query.join(Aircraft).where(
-            WorkOrder.work_order_number.ilike(search_filter)
-            | WorkOrder.customer_name.ilike(search_filter)
-            | Aircraft.registration_number.ilike(search_filter)
-        )
-    if status:
-        count_query = count_query.where(WorkOrder.status == status)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+        query = query.join(Aircraft, Aircraft.id == wo.aircraft_id)
+        count_query = count_query.join(Aircraft, Aircraft.id == wo.aircraft_id)
+    query = query.where(*filters)
+
+    # Get total count, cached per filter set
+    total = await count_total(
+        db,
+        count_query.where(*filters),
+        count_mode,
+        cache_key=(
+            "work_orders",
+            city.id,
+            search,
+            tuple(sorted(statuses or ())),
+            open_only,
+            lead_technician,
+            work_order_type,
+        ),
+    )
 
     # Apply sorting
-    sort_column = WORK_ORDER_SORT_COLUMNS.get(sort_by, WorkOrder.created_at)
+    sort_column = getattr(wo, WORK_ORDER_SORT_COLUMNS.get(sort_by, WorkOrder.created_at).key)
     if sort_order == SortOrder.ASC:
         query = query.order_by(asc(sort_column))
     else:
@@ -105,12 +227,33 @@ async def get_work_orders(
 
     result = await db.execute(query)
     work_orders = result.scalars().all()
+    if not work_orders:
+        return [], total
+
+    counts_query = (
+        select(item.work_order_id, func.count(item.id))
+        .where(
+            item.city_id == city.id,
+            item.work_order_id.in_([work_order.id for work_order in work_orders]),
+        )
+        .group_by(item.work_order_id)
+    )
+    item_counts = dict((await db.execute(counts_query)).tuples().all())
 
-    return list(work_orders), total
+    return [
+        Updated(work_order, {"item_count": item_counts.get(work_order.id, 0)})
+        for work_order in work_orders
+    ], total
 
 
-async def get_work_order_by_uuid(db: AsyncSession, wo_uuid: UUID) -> WorkOrder | None:
-    """Get a work order by its UUID."""
+async def get_work_order_by_uuid(
+    db: AsyncSession, wo_uuid: UUID, include_archive: bool = False
+) -> WorkOrder | None:
+    """Get a work order by its UUID.
+
+    With `include_archive`, a work order that is no longer live is looked up
+    in the archive, together with its archived items.
+    """
     query = (
         select(WorkOrder)
         .options(
@@ -121,7 +264,27 @@ async def get_work_order_by_uuid(db: AsyncSession, wo_uuid: UUID) -> WorkOrder |
         .where(WorkOrder.uuid == wo_uuid)
     )
     result = await db.execute(query)
-    return result.scalar_one_or_none()
+    work_order = result.scalar_one_or_none()
+    if work_order or not include_archive:
+        return work_order
+
+    wo, item = archived(WorkOrder), archived(WorkOrderItem)
+    query = (
+        select(wo)
+        .options(selectinload(wo.city), selectinload(wo.aircraft))
+        .where(wo.uuid == wo_uuid)
+    )
+    work_order = (await db.execute(query)).scalar_one_or_none()
+    if work_order:
+        items_query = (
+            select(item)
+            .where(item.work_order_id == work_order.id)
+            .order_by(item.item_number)
+        )
+        items = (await db.execute(items_query)).scalars().all()
+        # The relationship reads the live items, so the archived ones are set directly
+        set_committed_value(work_order, "items", list(items))
+    return work_order
 
 
 async def create_work_order(
@@ -173,41 +336,433 @@ async def create_work_order(
 
 
 async def update_work_order(
-    db: AsyncSession, wo_uuid: UUID, work_order_in: WorkOrderUpdate
-) -> WorkOrder | None:
-    """Update a work order."""
-    work_order = await get_work_order_by_uuid(db, wo_uuid)
-    if not work_order:
-        return None
-
-    # Update fields
+    db: AsyncSession,
+    wo_uuid: UUID,
+    work_order_in: WorkOrderUpdate,
+    expected_versions: list[int] | None = None,
+) -> Updated | None:
+    """Update a work order in one statement, returning the briefs the response needs.
+
+    With `expected_versions`, the update only applies while the work order's
+    version is one of them. A status change follows the same rules as
+    `transition_work_order_status`, checked by the UPDATE itself; keeping the
+    current status is always allowed. Unless the client sends one,
+    `completed_date` is set when the status changes to a terminal one and
+    cleared when a work order is reopened.
+
+    Raises:
+        ValueError: If the new aircraft does not exist.
+        VersionConflict: If the work order has moved past `expected_versions`.
+        StatusTransitionError: If the work order may not move to the new status.
+    """
     update_data = work_order_in.model_dump(exclude_unset=True)
-
-    # Handle aircraft_id UUID resolution
+    where = WorkOrder.uuid == wo_uuid
+    target = update_data.get("status")
+    if target is not None:
+        target = WorkOrderStatus(target.value)
+        sources = [target, *WorkOrderStatus.transition_sources(target)]
+        where = and_(where, WorkOrder.status.in_(sources))
+        if "completed_date" not in update_data:
+            # SET reads the row as it was, so an already closed order keeps its date
+            update_data["completed_date"] = (
+                case(
+                    (WorkOrder.status == target, WorkOrder.completed_date),
+                    else_=datetime.utcnow(),
+                )
+                if target.is_terminal()
+                else None
+            )
+
+    # Resolve the aircraft first so an unknown one is a 400, not a missing row
     if "aircraft_id" in update_data:
         aircraft_uuid = update_data.pop("aircraft_id")
         if aircraft_uuid:
-            aircraft_query = select(Aircraft).where(Aircraft.uuid == aircraft_uuid)
-            aircraft_result = await db.execute(aircraft_query)
-            aircraft = aircraft_result.scalar_one_or_none()
-            if not aircraft:
+            aircraft_query = select(Aircraft.id).where(Aircraft.uuid == aircraft_uuid)
+            aircraft_id = (await db.execute(aircraft_query)).scalar_one_or_none()
+            if aircraft_id is None:
                 raise ValueError(f"Aircraft not found: {aircraft_uuid}")
-            update_data["aircraft_id"] = aircraft.id
+            update_data["aircraft_id"] = aircraft_id
+
+    updated = await update_returning(
+        db,
+        WorkOrder,
+        where,
+        update_data,
+        *WORK_ORDER_RELATED_COLUMNS,
+        expected_versions=expected_versions,
+    )
+    if updated is None and target is not None:
+        # Only a refused update pays for telling an illegal move from a missing row
+        current_query = select(WorkOrder.status).where(WorkOrder.uuid == wo_uuid)
+        current = (await db.execute(current_query)).scalar_one_or_none()
+        if current is not None:
+            raise StatusTransitionError(current, target)
+    return updated
+
+
+# Header columns a clone or converted quote takes over from its source
+WORK_ORDER_COPY_COLUMNS = (
+    "city_id",
+    "aircraft_id",
+    "customer_name",
+    "lead_technician",
+    "sales_person",
+    "priority",
+)
+
+# Item columns a clone or converted quote takes over from its source
+WORK_ORDER_ITEM_COPY_COLUMNS = (
+    "item_number",
+    "discrepancy",
+    "corrective_action",
+    "notes",
+    "category",
+    "sub_category",
+    "ata_code",
+    "hours_estimate",
+    "billing_method",
+    "flat_rate",
+    "department",
+    "do_not_bill",
+    "enable_rii",
+)
+
+
+def _random_uuid(dialect_name: str):
+    """A database-generated UUID per row, for INSERT ... SELECT."""
+    if dialect_name == "postgresql":
+        return func.gen_random_uuid()
+    # SQLite stores UUIDs as 32 hex digits
+    return func.lower(func.hex(func.randomblob(16)))
+
+
+def _insert_from(model, values: dict, where):
+    """INSERT INTO model (keys) SELECT values FROM model WHERE where."""
+    return insert(model).from_select(list(values), select(*values.values()).where(where))
+
+
+async def _copy_work_order(
+    db: AsyncSession,
+    source_uuid: UUID,
+    copy_in: WorkOrderCopy,
+    work_order_type: WorkOrderType | None = None,
+    source_type: WorkOrderType | None = None,
+) -> Updated | None:
+    """Copy a work order and all of its items with one INSERT ... SELECT each.
+
+    The copy gets the next sequence number of its city and keeps the source's
+    type unless `work_order_type` is given. An archived source is copied from
+    the archive. Returns None if the source does not exist.
+
+    Raises:
+        ValueError: If `source_type` is given and the source is another type.
+    """
+    # Numbers held by archived work orders are not reused
+    existing = with_archive(WorkOrder)
+    # Read the source from the archive if it is no longer live
+    for wo, item in [
+        (WorkOrder, WorkOrderItem),
+        (archived(WorkOrder), archived(WorkOrderItem)),
+    ]:
+        next_sequence = (
+            select(func.coalesce(func.max(existing.sequence_number), 0) + 1)
+            .where(existing.city_id == wo.city_id)
+            .scalar_subquery()
+        )
+        # The copy shares the source's city and aircraft, so its briefs are read here
+        source_query = (
+            select(
+                wo.id,
+                wo.work_order_number,
+                wo.work_order_type,
+                City.code,
+                next_sequence,
+                *_related_columns(wo, item),
+            )
+            .join(City, City.id == wo.city_id)
+            .where(wo.uuid == source_uuid)
+        )
+        source = (await db.execute(source_query)).first()
+        if source is not None:
+            break
+    else:
+        return None
+    source_id, source_number, current_type, city_code, sequence, *related = source
+    if source_type is not None and current_type != source_type:
+        raise ValueError(f"Work order {source_number} is not a {source_type.value}")
+
+    now = datetime.utcnow()
+    values = {
+        "uuid": literal(uuid4(), WorkOrder.uuid.type),
+        "work_order_number": literal(generate_work_order_number(city_code, sequence, now)),
+        "sequence_number": literal(sequence),
+        "work_order_type": literal(work_order_type or current_type, WorkOrder.work_order_type.type),
+        "status": literal(WorkOrderStatus.CREATED, WorkOrder.status.type),
+        "customer_po_number": literal(
+            copy_in.customer_po_number, WorkOrder.customer_po_number.type
+        ),
+        "due_date": literal(copy_in.due_date, WorkOrder.due_date.type),
+        "created_by": literal(copy_in.created_by),
+        "created_date": literal(now),
+        "created_at": literal(now),
+        "updated_at": literal(now),
+        **{name: getattr(wo, name) for name in WORK_ORDER_COPY_COLUMNS},
+    }
+    query = _insert_from(WorkOrder, values, wo.id == source_id).returning(WorkOrder)
+    copied = Updated.from_row(
+        ((await db.execute(query)).scalar_one(), *related), WORK_ORDER_RELATED_COLUMNS
+    )
 
-    for field, value in update_data.items():
-        setattr(work_order, field, value)
+    item_values = {
+        "uuid": _random_uuid(db.get_bind().dialect.name),
+        "work_order_id": literal(copied.id),
+        "city_id": literal(copied.city_id),
+        "status": literal(WorkOrderItemStatus.OPEN, WorkOrderItem.status.type),
+        "created_by": literal(copy_in.created_by),
+        "created_at": literal(now),
+        "updated_at": literal(now),
+        **{name: getattr(item, name) for name in WORK_ORDER_ITEM_COPY_COLUMNS},
+    }
+    items = await db.execute(
+        _insert_from(
+            WorkOrderItem,
+            item_values,
+            and_(item.work_order_id == source_id, item.city_id == copied.city_id),
+        )
+    )
+    copied.item_count = items.rowcount
+    return copied
 
-    work_order.updated_at = datetime.utcnow()
-    await db.flush()
-    await db.refresh(work_order, ["city", "aircraft", "items"])
-    return work_order
+
+async def clone_work_order(
+    db: AsyncSession, wo_uuid: UUID, copy_in: WorkOrderCopy
+) -> Updated | None:
+    """Clone a work order and its items under a fresh number."""
+    return await _copy_work_order(db, wo_uuid, copy_in)
+
+
+async def convert_quote_to_work_order(
+    db: AsyncSession, quote_uuid: UUID, copy_in: WorkOrderCopy
+) -> Updated | None:
+    """Turn a quote into a new work order carrying all of its items.
+
+    The quote itself is left as it is.
+
+    Raises:
+        ValueError: If the source is not a quote.
+    """
+    return await _copy_work_order(
+        db, quote_uuid, copy_in, WorkOrderType.WORK_ORDER, source_type=WorkOrderType.QUOTE
+    )
 
 
 async def delete_work_order(db: AsyncSession, wo_uuid: UUID) -> bool:
-    """Delete a work order."""
-    work_order = await get_work_order_by_uuid(db, wo_uuid)
-    if not work_order:
-        return False
+    """Delete a work order in one statement; ON DELETE CASCADE removes its items."""
+    query = delete(WorkOrder).where(WorkOrder.uuid == wo_uuid).returning(WorkOrder.id)
+    result = await db.execute(query)
+    return result.scalar_one_or_none() is not None
+
+
+async def transition_work_order_status(
+    db: AsyncSession, transition: WorkOrderStatusTransition
+) -> tuple[list, list[tuple[UUID, str]]]:
+    """
+    Move many work orders to one status with a single UPDATE ... RETURNING.
+
+    Only work orders whose current status may move to the target are
+    matched, so the transition rules are checked by the UPDATE itself.
+    Terminal targets also set `completed_date`; open ones clear it, which
+    matters for reopened work orders. The others are looked up once to
+    explain why they were rejected.
+
+    Returns:
+        Tuple of (updated rows of uuid/work_order_number/status/completed_date,
+        [(uuid, error_message), ...])
+    """
+    target = WorkOrderStatus(transition.status.value)
+    ids = list(dict.fromkeys(transition.ids))
+    now = datetime.utcnow()
+
+    values = {
+        "status": target,
+        "updated_by": transition.updated_by,
+        "updated_at": now,
+        "version": WorkOrder.version + 1,
+    }
+    if transition.status_notes is not None:
+        values["status_notes"] = transition.status_notes
+    values["completed_date"] = now if target.is_terminal() else None
+
+    query = (
+        update(WorkOrder)
+        .where(
+            WorkOrder.uuid.in_(ids),
+            WorkOrder.status.in_(WorkOrderStatus.transition_sources(target)),
+        )
+        .values(**values)
+        .returning(
+            WorkOrder.uuid,
+            WorkOrder.work_order_number,
+            WorkOrder.status,
+            WorkOrder.completed_date,
+        )
+    )
+    updated = list((await db.execute(query)).all())
+
+    updated_ids = {row.uuid for row in updated}
+    not_updated = [wo_uuid for wo_uuid in ids if wo_uuid not in updated_ids]
+    rejected = []
+    if not_updated:
+        status_query = select(WorkOrder.uuid, WorkOrder.status).where(
+            WorkOrder.uuid.in_(not_updated)
+        )
+        current = dict((await db.execute(status_query)).tuples().all())
+        for wo_uuid in not_updated:
+            status = current.get(wo_uuid)
+            if status is None:
+                rejected.append((wo_uuid, "Work order not found"))
+            elif status == target:
+                rejected.append((wo_uuid, f"Work order is already {target.value}"))
+            else:
+                rejected.append((wo_uuid, str(StatusTransitionError(status, target))))
+
+    return updated, rejected
+
+
+def _as_utc_naive(value: datetime | None) -> datetime | None:
+    """Match the naive UTC datetimes the models store."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def _ids_by(db: AsyncSession, column, values: set[str], chunk_size: int) -> dict[str, int]:
+    """Map each value of a unique column to its row id, one query per chunk."""
+    model = column.class_
+    ids = {}
+    for chunk in chunked(sorted(values), chunk_size):
+        result = await db.execute(select(column, model.id).where(column.in_(chunk)))
+        ids.update(result.tuples().all())
+    return ids
+
+
+async def _next_sequence_numbers(db: AsyncSession, city_ids: set[int]) -> dict[int, int]:
+    """Next free sequence number of every city, in one grouped query."""
+    existing = with_archive(WorkOrder)
+    query = (
+        select(existing.city_id, func.max(existing.sequence_number))
+        .where(existing.city_id.in_(city_ids))
+        .group_by(existing.city_id)
+    )
+    result = await db.execute(query)
+    next_numbers = dict.fromkeys(city_ids, 1)
+    for city_id, max_sequence in result.tuples():
+        next_numbers[city_id] = max_sequence + 1
+    return next_numbers
+
+
+async def _insert_rows(
+    db: AsyncSession, rows: list[tuple[int, dict]], errors: list[tuple[int, str]]
+) -> int:
+    """Insert rows in one statement, falling back to one SAVEPOINT per row on error."""
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(WorkOrder), [values for _, values in rows])
+        return len(rows)
+    except DBAPIError:
+        pass
+
+    inserted = 0
+    for line, values in rows:
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(WorkOrder), [values])
+            inserted += 1
+        except DBAPIError as e:
+            errors.append((line, f"Could not insert: {e.orig}"))
+    return inserted
+
+
+async def import_work_orders(
+    db: AsyncSession,
+    rows: list[tuple[int, WorkOrderImportRow]],
+    created_by: str,
+    chunk_size: int = 1000,
+) -> tuple[int, list[tuple[int, str]]]:
+    """
+    Bulk create work orders from import rows keyed by line number.
+
+    Cities and aircraft are resolved by code and registration in batched
+    lookups, sequence numbers are allocated per city in one block (in row
+    order), and rows are inserted `chunk_size` at a time. Rows that cannot be
+    resolved or inserted are skipped and reported; the rest are imported.
+
+    Returns:
+        Tuple of (imported_count, [(line, error_message), ...])
+    """
+    errors: list[tuple[int, str]] = []
+    city_ids = await _ids_by(db, City.code, {row.city_code for _, row in rows}, chunk_size)
+    aircraft_ids = await _ids_by(
+        db,
+        Aircraft.registration_number,
+        {row.aircraft_registration for _, row in rows},
+        chunk_size,
+    )
+
+    resolved = []
+    for line, row in rows:
+        if row.city_code not in city_ids:
+            errors.append((line, f"City not found: {row.city_code}"))
+        elif row.aircraft_registration not in aircraft_ids:
+            errors.append((line, f"Aircraft not found: {row.aircraft_registration}"))
+        else:
+            resolved.append((line, row))
+    if not resolved:
+        return 0, errors
+
+    next_sequence = await _next_sequence_numbers(
+        db, {city_ids[row.city_code] for _, row in resolved}
+    )
+
+    now = datetime.utcnow()
+    values = []
+    for line, row in resolved:
+        city_id = city_ids[row.city_code]
+        sequence = next_sequence[city_id]
+        next_sequence[city_id] += 1
+        created_date = _as_utc_naive(row.created_date) or now
+        values.append(
+            (
+                line,
+                {
+                    "uuid": uuid4(),
+                    "work_order_number": generate_work_order_number(
+                        row.city_code, sequence, created_date
+                    ),
+                    "sequence_number": sequence,
+                    "city_id": city_id,
+                    "aircraft_id": aircraft_ids[row.aircraft_registration],
+                    "work_order_type": row.work_order_type,
+                    "status": row.status,
+                    "status_notes": row.status_notes,
+                    "customer_name": row.customer_name,
+                    "customer_po_number": row.customer_po_number,
+                    "due_date": row.due_date,
+                    "created_date": created_date,
+                    "completed_date": _as_utc_naive(row.completed_date),
+                    "lead_technician": row.lead_technician,
+                    "sales_person": row.sales_person,
+                    "priority": row.priority,
+                    "created_by": row.created_by or created_by,
+                    "created_at": now,
+                    "updated_at": now,
+                },
+            )
+        )
+
+    imported = 0
+    for chunk in chunked(values, chunk_size):
+        imported += await _insert_rows(db, chunk, errors)
 
-    await db.delete(work_order)
-    return True
+    errors.sort()
+    return imported, errors
@@ -1,12 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, asc, desc
-from uuid import UUID
+from sqlalchemy import select, insert, update, delete, func, and_, asc, desc, bindparam
+from collections import Counter, defaultdict
+from uuid import UUID, uuid4
 from datetime import datetime
 
 from models.work_order import WorkOrder
 from models.work_order_item import WorkOrderItem
-from schemas.work_order_item import WorkOrderItemCreate, WorkOrderItemUpdate
+from schemas.work_order_item import (
+    WorkOrderItemCreate,
+    WorkOrderItemUpdate,
+    WorkOrderItemBatch,
+)
+from core.partial_update import Updated, update_returning
 from core.sorting import SortOrder
+from crud.work_order_archive import archived, with_archive
 
 # Allowed columns for sorting work order items
 WORK_ORDER_ITEM_SORT_COLUMNS = {
@@ -17,11 +24,11 @@ WORK_ORDER_ITEM_SORT_COLUMNS = {
 }
 
 
-async def get_next_item_number(db: AsyncSession, work_order_id: int) -> int:
-    """Get the next item number for a work order."""
+async def get_next_item_number(db: AsyncSession, work_order_id: int, city_id: int) -> int:
+    """Get the next item number for a work order in `city_id`."""
     query = select(
         func.coalesce(func.max(WorkOrderItem.item_number), 0) + 1
-    ).where(WorkOrderItem.work_order_id == work_order_id)
+    ).where(WorkOrderItem.work_order_id == work_order_id, WorkOrderItem.city_id == city_id)
     result = await db.execute(query)
     return result.scalar()
 
@@ -31,20 +38,37 @@ async def get_work_order_items(
     wo_uuid: UUID,
     sort_by: str | None = None,
     sort_order: SortOrder = SortOrder.ASC,
+    include_archive: bool = False,
 ) -> tuple[list[WorkOrderItem], int]:
-    """Get all items for a work order."""
-    # Get work order first
-    wo_query = select(WorkOrder).where(WorkOrder.uuid == wo_uuid)
-    wo_result = await db.execute(wo_query)
-    work_order = wo_result.scalar_one_or_none()
-    if not work_order:
+    """Get all items for a work order.
+
+    With `include_archive`, the items of an archived work order are returned
+    from the archive.
+    """
+    # Get work order first, from the archive if it is no longer live
+    sources = [(WorkOrder, WorkOrderItem)]
+    if include_archive:
+        sources.append((archived(WorkOrder), archived(WorkOrderItem)))
+    for wo, item in sources:
+        wo_query = select(wo).where(wo.uuid == wo_uuid)
+        wo_result = await db.execute(wo_query)
+        work_order = wo_result.scalar_one_or_none()
+        if work_order:
+            break
+    else:
         return [], 0
 
-    # Get items
-    query = select(WorkOrderItem).where(WorkOrderItem.work_order_id == work_order.id)
+    # Get items; the city confines the scan to the work order's partition
+    in_work_order = and_(
+        item.work_order_id == work_order.id,
+        item.city_id == work_order.city_id,
+    )
+    query = select(item).where(in_work_order)
 
     # Apply sorting
-    sort_column = WORK_ORDER_ITEM_SORT_COLUMNS.get(sort_by, WorkOrderItem.item_number)
+    sort_column = getattr(
+        item, WORK_ORDER_ITEM_SORT_COLUMNS.get(sort_by, WorkOrderItem.item_number).key
+    )
     if sort_order == SortOrder.ASC:
         query = query.order_by(asc(sort_column))
     else:
@@ -54,9 +78,7 @@ async def get_work_order_items(
     items = result.scalars().all()
 
     # Get count
-    count_query = select(func.count(WorkOrderItem.id)).where(
-        WorkOrderItem.work_order_id == work_order.id
-    )
+    count_query = select(func.count(item.id)).where(in_work_order)
     count_result = await db.execute(count_query)
     total = count_result.scalar()
 
@@ -64,10 +86,14 @@ async def get_work_order_items(
 
 
 async def get_work_order_item_by_uuid(
-    db: AsyncSession, item_uuid: UUID
+    db: AsyncSession, item_uuid: UUID, include_archive: bool = False
 ) -> WorkOrderItem | None:
-    """Get a work order item by its UUID."""
-    query = select(WorkOrderItem).where(WorkOrderItem.uuid == item_uuid)
+    """Get a work order item by its UUID.
+
+    With `include_archive`, the items of archived work orders are found too.
+    """
+    item = with_archive(WorkOrderItem) if include_archive else WorkOrderItem
+    query = select(item).where(item.uuid == item_uuid)
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
@@ -84,11 +110,12 @@ async def create_work_order_item(
         return None
 
     # Get next item number
-    item_number = await get_next_item_number(db, work_order.id)
+    item_number = await get_next_item_number(db, work_order.id, work_order.city_id)
 
     # Create item
     item = WorkOrderItem(
         work_order_id=work_order.id,
+        city_id=work_order.city_id,
         item_number=item_number,
         status=item_in.status,
         discrepancy=item_in.discrepancy,
@@ -113,22 +140,37 @@ async def create_work_order_item(
 
 
 async def update_work_order_item(
-    db: AsyncSession, item_uuid: UUID, item_in: WorkOrderItemUpdate
-) -> WorkOrderItem | None:
-    """Update a work order item."""
-    item = await get_work_order_item_by_uuid(db, item_uuid)
-    if not item:
-        return None
+    db: AsyncSession,
+    item_uuid: UUID,
+    item_in: WorkOrderItemUpdate,
+    wo_uuid: UUID | None = None,
+    expected_versions: list[int] | None = None,
+) -> Updated | None:
+    """Update a work order item in one statement.
 
-    # Update fields
-    update_data = item_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(item, field, value)
+    With `wo_uuid`, only an item belonging to that work order is updated. With
+    `expected_versions`, the update only applies while the item's version is
+    one of them.
 
-    item.updated_at = datetime.utcnow()
-    await db.flush()
-    await db.refresh(item)
-    return item
+    Raises:
+        VersionConflict: If the item has moved past `expected_versions`.
+    """
+    where = WorkOrderItem.uuid == item_uuid
+    if wo_uuid is not None:
+        wo = select(WorkOrder.id, WorkOrder.city_id).where(WorkOrder.uuid == wo_uuid)
+        where = and_(
+            where,
+            WorkOrderItem.work_order_id == wo.with_only_columns(WorkOrder.id).scalar_subquery(),
+            # Prunes the update to the work order's city partition
+            WorkOrderItem.city_id == wo.with_only_columns(WorkOrder.city_id).scalar_subquery(),
+        )
+    return await update_returning(
+        db,
+        WorkOrderItem,
+        where,
+        item_in.model_dump(exclude_unset=True),
+        expected_versions=expected_versions,
+    )
 
 
 async def delete_work_order_item(db: AsyncSession, item_uuid: UUID) -> bool:
@@ -139,3 +181,126 @@ async def delete_work_order_item(db: AsyncSession, item_uuid: UUID) -> bool:
 
     await db.delete(item)
     return True
+
+
+async def apply_work_order_item_batch(
+    db: AsyncSession, wo_uuid: UUID, batch: WorkOrderItemBatch
+) -> tuple[list[WorkOrderItem], list[WorkOrderItem], list[UUID]] | None:
+    """
+    Apply a batch of item creates, updates and deletes to one work order.
+
+    Every referenced item is checked up front, so the batch is applied
+    completely or not at all. Each kind of change is one set-based statement
+    (updates are grouped by the fields they set), and item numbers for all
+    creates are reserved with a single max() on the locked work order.
+
+    Returns:
+        Tuple of (created_items, updated_items, deleted_uuids), or None if the
+        work order does not exist
+
+    Raises:
+        ValueError: If an item is referenced twice or is not on the work order.
+    """
+    # Lock the work order so concurrent batches reserve distinct item numbers
+    wo_query = (
+        select(WorkOrder.id, WorkOrder.city_id).where(WorkOrder.uuid == wo_uuid).with_for_update()
+    )
+    work_order = (await db.execute(wo_query)).one_or_none()
+    if work_order is None:
+        return None
+    work_order_id, city_id = work_order
+
+    referenced = [patch.id for patch in batch.update] + batch.delete
+    repeated = [item_uuid for item_uuid, count in Counter(referenced).items() if count > 1]
+    if repeated:
+        raise ValueError(f"Items referenced more than once: {', '.join(map(str, repeated))}")
+
+    item_ids = {}
+    versions = {}
+    if referenced:
+        # Lock the items too, so single-item PUTs cannot bump a version under us
+        ids_query = (
+            select(WorkOrderItem.uuid, WorkOrderItem.id, WorkOrderItem.version)
+            .where(
+                WorkOrderItem.uuid.in_(referenced),
+                WorkOrderItem.work_order_id == work_order_id,
+                WorkOrderItem.city_id == city_id,
+            )
+            .with_for_update()
+        )
+        for item_uuid, item_id, version in (await db.execute(ids_query)).tuples():
+            item_ids[item_uuid] = item_id
+            versions[item_uuid] = version
+        missing = [str(item_uuid) for item_uuid in referenced if item_uuid not in item_ids]
+        if missing:
+            raise ValueError(f"Work order items not found: {', '.join(missing)}")
+
+    # Reserve numbers before deleting, so a batch never reuses a number it frees
+    if batch.create:
+        next_item_number = await get_next_item_number(db, work_order_id, city_id)
+
+    now = datetime.utcnow()
+
+    if batch.delete:
+        await db.execute(
+            delete(WorkOrderItem).where(
+                WorkOrderItem.id.in_([item_ids[item_uuid] for item_uuid in batch.delete]),
+                WorkOrderItem.city_id == city_id,
+            )
+        )
+
+    updated = []
+    if batch.update:
+        # One executemany per distinct set of fields; matching on the city as
+        # well as the id lets each row go straight to its partition
+        by_fields: dict[tuple[str, ...], list[dict]] = defaultdict(list)
+        for patch in batch.update:
+            changes = patch.model_dump(exclude_unset=True, exclude={"id"})
+            by_fields[tuple(changes)].append(
+                {
+                    "item_id": item_ids[patch.id],
+                    "item_city_id": city_id,
+                    **changes,
+                    "updated_at": now,
+                    "version": versions[patch.id] + 1,
+                }
+            )
+        table = WorkOrderItem.__table__
+        statement = update(table).where(
+            table.c.id == bindparam("item_id"), table.c.city_id == bindparam("item_city_id")
+        )
+        for rows in by_fields.values():
+            await db.execute(statement, rows)
+        updated_query = (
+            select(WorkOrderItem)
+            .where(
+                WorkOrderItem.id.in_([item_ids[patch.id] for patch in batch.update]),
+                WorkOrderItem.city_id == city_id,
+            )
+            .order_by(WorkOrderItem.item_number)
+            .execution_options(populate_existing=True)
+        )
+        updated = list((await db.execute(updated_query)).scalars())
+
+    created = []
+    if batch.create:
+        created = sorted(
+            await db.scalars(
+                insert(WorkOrderItem).returning(WorkOrderItem),
+                [
+                    {
+                        **item_in.model_dump(),
+                        "uuid": uuid4(),
+                        "work_order_id": work_order_id,
+                        "city_id": city_id,
+                        "item_number": next_item_number + offset,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for offset, item_in in enumerate(batch.create)
+                ],
+            ),
+            key=lambda item: item.item_number,
+        )
+
+    return created, updated, batch.delete
@@ -0,0 +1 @@
+# Scheduled maintenance jobs, run as python -m jobs.<name>
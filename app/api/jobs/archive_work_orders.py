@@ -0,0 +1,84 @@
+"""
+Move closed work orders into the archive tables.
+
+Completed and void work orders older than ``ARCHIVE_AFTER_DAYS`` (a year by
+default) are moved with their items, one batch per transaction, so the job can
+run alongside normal traffic and be stopped at any point. Schedule it daily.
+
+Usage:
+    python -m jobs.archive_work_orders
+    python -m jobs.archive_work_orders --older-than-days 730 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import get_settings
+from crud.work_order_archive import archive_work_orders
+
+logger = logging.getLogger(__name__)
+
+
+async def run(
+    session_factory: async_sessionmaker[AsyncSession],
+    older_than: timedelta,
+    batch_size: int,
+    max_batches: int | None = None,
+) -> tuple[int, int]:
+    """Archive batches until none are left (or `max_batches` ran).
+
+    Returns:
+        Tuple of (work orders archived, items archived)
+    """
+    work_orders = items = batches = 0
+    while max_batches is None or batches < max_batches:
+        async with session_factory() as db:
+            archived, archived_items = await archive_work_orders(db, older_than, batch_size)
+            await db.commit()
+        work_orders += archived
+        items += archived_items
+        batches += 1
+        logger.info("archived %d work orders, %d items", work_orders, items)
+        if archived < batch_size:
+            break
+    return work_orders, items
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Archive closed work orders")
+    parser.add_argument("--older-than-days", type=int, default=settings.archive_after_days)
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    parser.add_argument("--max-batches", type=int, help="Default: until none are left")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    # Imported here so --help works without a database configuration
+    from core.database import AsyncSessionLocal, engine
+
+    async def archive() -> tuple[int, int]:
+        try:
+            return await run(
+                AsyncSessionLocal,
+                timedelta(days=args.older_than_days),
+                args.batch_size,
+                args.max_batches,
+            )
+        finally:
+            await engine.dispose()
+
+    started = time.perf_counter()
+    work_orders, items = asyncio.run(archive())
+    print(
+        f"archived {work_orders:,} work orders and {items:,} items "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
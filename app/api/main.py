@@ -1,7 +1,16 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from core.coalescing import CoalescingMiddleware
 from core.config import get_settings
+from core.database import get_pool_stats
+from core.health import get_event_loop_lag_monitor
+from core.metrics import MetricsMiddleware, get_metrics_registry
+from core.profiling import ProfilingMiddleware
+from core.query_stats import QueryStatsMiddleware
 from routers import (
     cities_router,
     work_orders_router,
@@ -10,16 +19,40 @@ from routers import (
     labor_kit_items_router,
     aircraft_router,
     dashboard_router,
+    admin_router,
+    health_router,
 )
 
 settings = get_settings()
+metrics_registry = get_metrics_registry()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Readiness reports event loop lag sampled in the background
+    lag_monitor = get_event_loop_lag_monitor()
+    lag_monitor.start()
+    yield
+    lag_monitor.stop()
+
 
 app = FastAPI(
     title="Cirrus MRO API",
     description="Work Order Management System API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Identical concurrent GETs share one response; innermost, so every request
+# still gets its own metrics, Server-Timing and CORS headers
+if settings.request_coalescing_enabled:
+    app.add_middleware(
+        CoalescingMiddleware,
+        path_prefix=settings.api_v1_prefix,
+        max_body_bytes=settings.request_coalescing_max_bytes,
+        profiling_token=settings.profiling_token,
+    )
+
 # CORS middleware for development
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +62,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL statement count and DB time (Server-Timing header)
+app.add_middleware(
+    QueryStatsMiddleware,
+    count_threshold=settings.query_log_threshold_count,
+    duration_threshold_ms=settings.query_log_threshold_ms,
+)
+
+# Route latency, status and in-flight metrics (served at /metrics)
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+
+# Sampling profiler for requests carrying the profiling token
+if settings.profiling_token:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiling_token,
+        interval_ms=settings.profiling_interval_ms,
+    )
+
 # Register routers
 app.include_router(cities_router, prefix=settings.api_v1_prefix)
 app.include_router(work_orders_router, prefix=settings.api_v1_prefix)
@@ -37,6 +88,8 @@ app.include_router(labor_kits_router, prefix=settings.api_v1_prefix)
 app.include_router(labor_kit_items_router, prefix=settings.api_v1_prefix)
 app.include_router(aircraft_router, prefix=settings.api_v1_prefix)
 app.include_router(dashboard_router, prefix=settings.api_v1_prefix)
+app.include_router(admin_router, prefix=settings.api_v1_prefix)
+app.include_router(health_router)
 
 
 @app.get("/")
@@ -44,6 +97,11 @@ def root():
     return {"message": "Cirrus MRO API", "version": "0.1.0"}
 
 
-@app.get("/health")
-def health():
-    return {"status": "healthy"}
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return metrics_registry.render()
+
+
+# Pre-allocate metric series for every route template
+metrics_registry.register_pool_stats(get_pool_stats)
+metrics_registry.register_routes(app.routes)
@@ -4,5 +4,15 @@ from models.work_order_item import WorkOrderItem
 from models.labor_kit import LaborKit
 from models.labor_kit_item import LaborKitItem
 from models.aircraft import Aircraft
+from models.work_order_archive import work_order_archive, work_order_item_archive
 
-__all__ = ["City", "WorkOrder", "WorkOrderItem", "LaborKit", "LaborKitItem", "Aircraft"]
+__all__ = [
+    "City",
+    "WorkOrder",
+    "WorkOrderItem",
+    "LaborKit",
+    "LaborKitItem",
+    "Aircraft",
+    "work_order_archive",
+    "work_order_item_archive",
+]
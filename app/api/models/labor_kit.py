@@ -29,5 +29,8 @@ class LaborKit(Base):
 
     # Relationships
     items: Mapped[list["LaborKitItem"]] = relationship(
-        "LaborKitItem", back_populates="labor_kit", cascade="all, delete-orphan"
+        "LaborKitItem",
+        back_populates="labor_kit",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, ForeignKey, Date, Enum
+from sqlalchemy import String, Integer, ForeignKey, Date, Enum, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from datetime import datetime, date
@@ -33,6 +33,19 @@ class WorkOrderStatus(str, enum.Enum):
         """Check if this status represents an active/open work order."""
         return not self.is_terminal()
 
+    def can_transition_to(self, target: "WorkOrderStatus") -> bool:
+        """Check if a work order may move from this status to `target`.
+
+        Open work orders may move to any other status. Closed ones may be
+        reopened, but not moved straight to the other terminal status.
+        """
+        return self != target and (self.is_open() or target.is_open())
+
+    @classmethod
+    def transition_sources(cls, target: "WorkOrderStatus") -> list["WorkOrderStatus"]:
+        """Statuses from which a work order may move to `target`."""
+        return [status for status in cls if status.can_transition_to(target)]
+
 
 class PriorityLevel(str, enum.Enum):
     LOW = "low"
@@ -48,6 +61,11 @@ class WorkOrderType(str, enum.Enum):
 
 class WorkOrder(Base):
     __tablename__ = "work_order"
+    # PostgreSQL list-partitions work_order by city_id (V009), where the primary
+    # key is (id, city_id). The model keeps id as the key so the identity map and
+    # SQLite autoincrement work unchanged; the constraint below lets SQLite
+    # enforce the composite foreign key from work_order_item.
+    __table_args__ = (UniqueConstraint("id", "city_id", name="uq_work_order_id_city"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     uuid: Mapped[UUID] = mapped_column(
@@ -107,9 +125,15 @@ class WorkOrder(Base):
         default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Optimistic concurrency: bumped on every write and served as the ETag
+    version: Mapped[int] = mapped_column(Integer, default=1)
+
     # Relationships
     city: Mapped["City"] = relationship("City", back_populates="work_orders")
     aircraft: Mapped["Aircraft"] = relationship("Aircraft", back_populates="work_orders")
     items: Mapped[list["WorkOrderItem"]] = relationship(
-        "WorkOrderItem", back_populates="work_order", cascade="all, delete-orphan"
+        "WorkOrderItem",
+        back_populates="work_order",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
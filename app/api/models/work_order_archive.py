@@ -0,0 +1,41 @@
+"""
+Archive tables for closed work orders (V010).
+
+The archive holds completed and void work orders, with their items, once they
+are older than the archive age. The tables copy the live columns, so an
+archived row reads back as a `WorkOrder` or `WorkOrderItem` (see
+``crud.work_order_archive``). The columns are derived from the live models,
+so a new column only needs adding to the migration. Keys follow the live
+models, including the (id, city_id) pair the city partitions are keyed on.
+"""
+
+from sqlalchemy import ForeignKeyConstraint, Index, Table, UniqueConstraint
+
+from core.database import Base
+from models.work_order import WorkOrder
+from models.work_order_item import WorkOrderItem
+
+work_order_archive = Table(
+    "work_order_archive",
+    Base.metadata,
+    # Copies leave out foreign keys, which are declared again below
+    *(column._copy() for column in WorkOrder.__table__.columns),
+    ForeignKeyConstraint(["city_id"], ["city.id"]),
+    ForeignKeyConstraint(["aircraft_id"], ["aircraft.id"], ondelete="RESTRICT"),
+    UniqueConstraint("id", "city_id", name="uq_work_order_archive_id_city"),
+    Index("idx_work_order_archive_city_created_at", "city_id", "created_at"),
+    Index("idx_work_order_archive_aircraft_id", "aircraft_id"),
+    Index("idx_work_order_archive_city_sequence_number", "city_id", "sequence_number"),
+)
+
+work_order_item_archive = Table(
+    "work_order_item_archive",
+    Base.metadata,
+    *(column._copy() for column in WorkOrderItem.__table__.columns),
+    ForeignKeyConstraint(
+        ["work_order_id", "city_id"],
+        ["work_order_archive.id", "work_order_archive.city_id"],
+        ondelete="CASCADE",
+    ),
+    Index("idx_work_order_item_archive_work_order_id", "work_order_id"),
+)
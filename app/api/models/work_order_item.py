@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, ForeignKey, Boolean, Numeric, Enum
+from sqlalchemy import String, Integer, Boolean, Numeric, Enum, ForeignKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from datetime import datetime
@@ -20,12 +20,23 @@ class WorkOrderItemStatus(str, enum.Enum):
 
 class WorkOrderItem(Base):
     __tablename__ = "work_order_item"
+    # Items are partitioned with their work order (V009), so they reference it
+    # by (work_order_id, city_id) and always land in the same city partition
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["work_order_id", "city_id"],
+            ["work_order.id", "work_order.city_id"],
+            ondelete="CASCADE",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     uuid: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True), unique=True, default=uuid4
     )
-    work_order_id: Mapped[int] = mapped_column(ForeignKey("work_order.id", ondelete="CASCADE"))
+    work_order_id: Mapped[int] = mapped_column(Integer)
+    # Partition key, always the city of the work order
+    city_id: Mapped[int] = mapped_column(Integer)
     item_number: Mapped[int] = mapped_column(Integer)
     status: Mapped[WorkOrderItemStatus] = mapped_column(
         Enum(
@@ -57,5 +68,8 @@ class WorkOrderItem(Base):
         default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Optimistic concurrency: bumped on every write and served as the ETag
+    version: Mapped[int] = mapped_column(Integer, default=1)
+
     # Relationships
     work_order: Mapped["WorkOrder"] = relationship("WorkOrder", back_populates="items")
@@ -0,0 +1 @@
+# Performance tooling: load generator, benchmarks and data seeding
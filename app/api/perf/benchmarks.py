@@ -0,0 +1,423 @@
+"""
+Microbenchmarks for the crud layer.
+
+Every function in ``crud/`` is timed against a seeded database (in-memory
+SQLite by default, or any PostgreSQL database with ``--database-url``). The
+whole run happens inside one outer transaction and every iteration inside its
+own SAVEPOINT that is rolled back, so write benchmarks see identical data each
+time and the target database is left untouched.
+
+Usage:
+    python -m perf.benchmarks
+    python -m perf.benchmarks --iterations 50 --filter get_work_orders
+    python -m perf.benchmarks --database-url postgresql+asyncpg://localhost/cirrus_perf
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+import crud
+from core.query_stats import track_queries
+from crud.dashboard import get_open_work_order_counts_by_city
+from models.aircraft import Aircraft
+from models.city import City
+from models.labor_kit import LaborKit
+from models.labor_kit_item import LaborKitItem
+from models.work_order import WorkOrder, WorkOrderStatus
+from models.work_order_item import WorkOrderItem
+from perf.db import DEFAULT_PERF_DATABASE_URL, create_perf_engine, create_schema
+from perf.seed import seed_minimal
+from schemas.aircraft import AircraftCreate, AircraftImportRow, AircraftUpdate
+from schemas.labor_kit import LaborKitCreate, LaborKitUpdate
+from schemas.labor_kit_item import LaborKitItemCreate, LaborKitItemUpdate
+from schemas.work_order import (
+    WorkOrderCopy,
+    WorkOrderCreate,
+    WorkOrderImportRow,
+    WorkOrderStatusTransition,
+    WorkOrderType,
+    WorkOrderUpdate,
+    WorkOrderView,
+)
+from schemas.work_order_item import (
+    WorkOrderItemBatch,
+    WorkOrderItemCreate,
+    WorkOrderItemPatch,
+    WorkOrderItemUpdate,
+)
+
+KIT_SIZES = (10, 100, 1000)
+IMPORT_ROWS = 100
+TRANSITION_SIZE = 20
+ARCHIVE_BATCH_SIZE = 100
+
+T = TypeVar("T")
+
+
+@dataclass
+class BenchmarkData:
+    """Ids of seeded rows the benchmarks operate on."""
+
+    city_uuid: UUID
+    city_code: str
+    aircraft_uuid: UUID
+    aircraft_registration: str
+    unused_aircraft_uuid: UUID
+    work_order_uuid: UUID
+    open_work_order_uuids: list[UUID]
+    work_order_item_uuid: UUID
+    quote_uuid: UUID
+    labor_kit_uuid: UUID
+    labor_kit_item_uuid: UUID
+    kit_uuids_by_size: dict[int, UUID]
+    search_term: str
+
+
+BenchmarkFn = Callable[[AsyncSession, BenchmarkData], Awaitable[Any]]
+
+
+def _apply_kit(size: int) -> BenchmarkFn:
+    return lambda db, d: crud.apply_labor_kit_to_work_order(
+        db, d.kit_uuids_by_size[size], d.work_order_uuid, "bench"
+    )
+
+
+def _import_work_orders(db: AsyncSession, d: BenchmarkData):
+    rows = [
+        (
+            line,
+            WorkOrderImportRow(
+                city_code=d.city_code,
+                aircraft_registration=d.aircraft_registration,
+                customer_name=f"Bench {line}",
+            ),
+        )
+        for line in range(1, IMPORT_ROWS + 1)
+    ]
+    return crud.import_work_orders(db, rows, "bench")
+
+
+async def _stream(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+def _upsert_aircraft(db: AsyncSession, d: BenchmarkData):
+    # Rows for the 20 seeded aircraft update them; the rest insert new aircraft
+    registrations = [f"NP{1000 + n}" for n in range(20)]
+    registrations += [f"NB{n:05d}" for n in range(IMPORT_ROWS - len(registrations))]
+    rows = [
+        (
+            line,
+            AircraftImportRow(
+                registration_number=registration,
+                primary_city_code=d.city_code,
+                notes="bench",
+            ),
+        )
+        for line, registration in enumerate(registrations, start=1)
+    ]
+    return crud.upsert_aircraft(db, _stream(rows), "bench")
+
+
+BENCHMARKS: dict[str, BenchmarkFn] = {
+    # city
+    "get_cities": lambda db, d: crud.get_cities(db),
+    "get_city_by_uuid": lambda db, d: crud.get_city_by_uuid(db, d.city_uuid),
+    # work_order
+    "get_work_orders": lambda db, d: crud.get_work_orders(db, d.city_uuid),
+    "get_work_orders_search": lambda db, d: crud.get_work_orders(
+        db, d.city_uuid, search=d.search_term
+    ),
+    "get_work_orders_open": lambda db, d: crud.get_work_orders(
+        db, d.city_uuid, view=WorkOrderView.OPEN
+    ),
+    "get_work_order_by_uuid": lambda db, d: crud.get_work_order_by_uuid(db, d.work_order_uuid),
+    "create_work_order": lambda db, d: crud.create_work_order(
+        db,
+        WorkOrderCreate(city_id=d.city_uuid, aircraft_id=d.aircraft_uuid, created_by="bench"),
+    ),
+    "update_work_order": lambda db, d: crud.update_work_order(
+        db, d.work_order_uuid, WorkOrderUpdate(status_notes="bench", updated_by="bench")
+    ),
+    "delete_work_order": lambda db, d: crud.delete_work_order(db, d.work_order_uuid),
+    "clone_work_order": lambda db, d: crud.clone_work_order(
+        db, d.work_order_uuid, WorkOrderCopy(created_by="bench")
+    ),
+    "convert_quote_to_work_order": lambda db, d: crud.convert_quote_to_work_order(
+        db, d.quote_uuid, WorkOrderCopy(created_by="bench")
+    ),
+    f"import_work_orders[{IMPORT_ROWS}]": _import_work_orders,
+    f"transition_work_order_status[{TRANSITION_SIZE}]": lambda db, d: (
+        crud.transition_work_order_status(
+            db,
+            WorkOrderStatusTransition(
+                ids=d.open_work_order_uuids, status=WorkOrderStatus.COMPLETED, updated_by="bench"
+            ),
+        )
+    ),
+    # work_order_item
+    "get_work_order_items": lambda db, d: crud.get_work_order_items(db, d.work_order_uuid),
+    "get_work_order_item_by_uuid": lambda db, d: crud.get_work_order_item_by_uuid(
+        db, d.work_order_item_uuid
+    ),
+    "create_work_order_item": lambda db, d: crud.create_work_order_item(
+        db, d.work_order_uuid, WorkOrderItemCreate(discrepancy="bench", created_by="bench")
+    ),
+    "update_work_order_item": lambda db, d: crud.update_work_order_item(
+        db, d.work_order_item_uuid, WorkOrderItemUpdate(notes="bench", updated_by="bench")
+    ),
+    "delete_work_order_item": lambda db, d: crud.delete_work_order_item(
+        db, d.work_order_item_uuid
+    ),
+    "apply_work_order_item_batch": lambda db, d: crud.apply_work_order_item_batch(
+        db,
+        d.work_order_uuid,
+        WorkOrderItemBatch(
+            create=[
+                WorkOrderItemCreate(discrepancy=f"bench {n}", created_by="bench")
+                for n in range(20)
+            ],
+            update=[WorkOrderItemPatch(id=d.work_order_item_uuid, notes="bench")],
+        ),
+    ),
+    # labor_kit
+    "get_labor_kits": lambda db, d: crud.get_labor_kits(db),
+    "get_labor_kit_by_uuid": lambda db, d: crud.get_labor_kit_by_uuid(db, d.labor_kit_uuid),
+    "create_labor_kit": lambda db, d: crud.create_labor_kit(
+        db, LaborKitCreate(name="Bench Kit", created_by="bench")
+    ),
+    "update_labor_kit": lambda db, d: crud.update_labor_kit(
+        db, d.labor_kit_uuid, LaborKitUpdate(description="bench", updated_by="bench")
+    ),
+    "delete_labor_kit": lambda db, d: crud.delete_labor_kit(db, d.labor_kit_uuid),
+    **{f"apply_labor_kit_to_work_order[{size}]": _apply_kit(size) for size in KIT_SIZES},
+    # labor_kit_item
+    "get_labor_kit_items": lambda db, d: crud.get_labor_kit_items(db, d.labor_kit_uuid),
+    "get_labor_kit_item_by_uuid": lambda db, d: crud.get_labor_kit_item_by_uuid(
+        db, d.labor_kit_item_uuid
+    ),
+    "create_labor_kit_item": lambda db, d: crud.create_labor_kit_item(
+        db, d.labor_kit_uuid, LaborKitItemCreate(discrepancy="bench", created_by="bench")
+    ),
+    "update_labor_kit_item": lambda db, d: crud.update_labor_kit_item(
+        db, d.labor_kit_item_uuid, LaborKitItemUpdate(notes="bench", updated_by="bench")
+    ),
+    "delete_labor_kit_item": lambda db, d: crud.delete_labor_kit_item(
+        db, d.labor_kit_item_uuid
+    ),
+    # aircraft
+    "get_aircraft_list": lambda db, d: crud.get_aircraft_list(db),
+    "get_aircraft_list_search": lambda db, d: crud.get_aircraft_list(db, search=d.search_term),
+    "get_aircraft_by_uuid": lambda db, d: crud.get_aircraft_by_uuid(db, d.aircraft_uuid),
+    "create_aircraft": lambda db, d: crud.create_aircraft(
+        db,
+        AircraftCreate(
+            registration_number=f"NB{uuid4().hex[:8]}",
+            primary_city_id=d.city_uuid,
+            created_by="bench",
+        ),
+    ),
+    "update_aircraft": lambda db, d: crud.update_aircraft(
+        db, d.aircraft_uuid, AircraftUpdate(notes="bench", updated_by="bench")
+    ),
+    "delete_aircraft": lambda db, d: crud.delete_aircraft(db, d.unused_aircraft_uuid),
+    f"upsert_aircraft[{IMPORT_ROWS}]": _upsert_aircraft,
+    # work_order_archive
+    # With an age of zero every closed seeded work order qualifies (about 40)
+    f"archive_work_orders[{ARCHIVE_BATCH_SIZE}]": lambda db, d: crud.archive_work_orders(
+        db, timedelta(0), batch_size=ARCHIVE_BATCH_SIZE
+    ),
+    # dashboard
+    "get_open_work_order_counts_by_city": lambda db, d: get_open_work_order_counts_by_city(db),
+}
+
+
+async def prepare_data(db: AsyncSession) -> BenchmarkData:
+    """Seed the database and add the rows specific benchmarks need."""
+    await seed_minimal(db)
+
+    for size in KIT_SIZES:
+        kit = LaborKit(name=f"Bench Kit {size}", created_by="bench")
+        kit.items = [
+            LaborKitItem(item_number=n, discrepancy=f"Task {n}", created_by="bench")
+            for n in range(1, size + 1)
+        ]
+        db.add(kit)
+    db.add(Aircraft(registration_number="NPUNUSED", created_by="bench"))
+    await db.flush()
+
+    city = (await db.execute(select(City).order_by(City.id).limit(1))).scalar_one()
+    work_order = (
+        await db.execute(
+            select(WorkOrder).where(WorkOrder.city_id == city.id).order_by(WorkOrder.id).limit(1)
+        )
+    ).scalar_one()
+    open_work_order_uuids = (
+        await db.execute(
+            select(WorkOrder.uuid)
+            .where(
+                WorkOrder.city_id == city.id,
+                WorkOrder.status.notin_(WorkOrderStatus.terminal_statuses()),
+            )
+            .order_by(WorkOrder.id)
+            .limit(TRANSITION_SIZE)
+        )
+    ).scalars().all()
+    item = (
+        await db.execute(
+            select(WorkOrderItem).where(WorkOrderItem.work_order_id == work_order.id).limit(1)
+        )
+    ).scalar_one()
+    kits = (await db.execute(select(LaborKit).order_by(LaborKit.id))).scalars().all()
+    kit_item = (
+        await db.execute(
+            select(LaborKitItem).where(LaborKitItem.labor_kit_id == kits[0].id).limit(1)
+        )
+    ).scalar_one()
+    aircraft = (
+        await db.execute(select(Aircraft).where(Aircraft.id == work_order.aircraft_id))
+    ).scalar_one()
+    unused_aircraft = (
+        await db.execute(select(Aircraft).where(Aircraft.registration_number == "NPUNUSED"))
+    ).scalar_one()
+    quote = await crud.create_work_order(
+        db,
+        WorkOrderCreate(
+            city_id=city.uuid,
+            aircraft_id=aircraft.uuid,
+            work_order_type=WorkOrderType.QUOTE,
+            created_by="bench",
+        ),
+    )
+    await crud.apply_labor_kit_to_work_order(db, kits[0].uuid, quote.uuid, "bench")
+
+    return BenchmarkData(
+        city_uuid=city.uuid,
+        city_code=city.code,
+        aircraft_uuid=aircraft.uuid,
+        aircraft_registration=aircraft.registration_number,
+        unused_aircraft_uuid=unused_aircraft.uuid,
+        work_order_uuid=work_order.uuid,
+        open_work_order_uuids=list(open_work_order_uuids),
+        work_order_item_uuid=item.uuid,
+        quote_uuid=quote.uuid,
+        labor_kit_uuid=kits[0].uuid,
+        labor_kit_item_uuid=kit_item.uuid,
+        kit_uuids_by_size={
+            size: next(k.uuid for k in kits if k.name == f"Bench Kit {size}")
+            for size in KIT_SIZES
+        },
+        search_term=aircraft.registration_number[:4],
+    )
+
+
+def summarize(samples_ms: list[float], queries: int) -> dict:
+    """Per-call statistics for one benchmark."""
+    return {
+        "iterations": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 4),
+        "median_ms": round(statistics.median(samples_ms), 4),
+        "min_ms": round(min(samples_ms), 4),
+        "max_ms": round(max(samples_ms), 4),
+        "queries": queries,
+        "samples_ms": [round(s, 4) for s in samples_ms],
+    }
+
+
+async def run_benchmarks(
+    engine: AsyncEngine,
+    iterations: int = 20,
+    warmup: int = 2,
+    name_filter: str | None = None,
+) -> dict:
+    """Run the selected benchmarks and return per-call timings and query counts."""
+    names = [n for n in BENCHMARKS if not name_filter or name_filter in n]
+    results = {}
+
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session_factory = async_sessionmaker(
+            bind=conn,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        async with session_factory() as db:
+            data = await prepare_data(db)
+            await db.commit()
+
+        for name in names:
+            fn = BENCHMARKS[name]
+            samples_ms = []
+            queries = 0
+            for i in range(warmup + iterations):
+                async with session_factory() as db:
+                    # Open the SAVEPOINT before timing so it is not counted
+                    await db.connection()
+                    with track_queries() as stats:
+                        start = time.perf_counter()
+                        await fn(db, data)
+                        await db.flush()
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                    await db.rollback()
+                if i >= warmup:
+                    samples_ms.append(elapsed_ms)
+                    queries = stats.count
+            results[name] = summarize(samples_ms, queries)
+
+        await outer.rollback()
+
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "database": engine.dialect.name,
+        "iterations": iterations,
+        "benchmarks": results,
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    engine = create_perf_engine(args.database_url)
+    try:
+        await create_schema(engine)
+        return await run_benchmarks(
+            engine, iterations=args.iterations, warmup=args.warmup, name_filter=args.filter
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the crud layer")
+    parser.add_argument("--database-url", default=DEFAULT_PERF_DATABASE_URL)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(_main(args))
+    print(f"{'benchmark':<45} {'median ms':>10} {'mean ms':>10} {'queries':>8}")
+    for name, result in report["benchmarks"].items():
+        print(
+            f"{name:<45} {result['median_ms']:>10.3f} {result['mean_ms']:>10.3f} "
+            f"{result['queries']:>8}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Database setup shared by the performance tools.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+
+DEFAULT_PERF_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+def is_sqlite(database_url: str) -> bool:
+    return database_url.startswith("sqlite")
+
+
+def create_perf_engine(database_url: str = DEFAULT_PERF_DATABASE_URL) -> AsyncEngine:
+    """Create an engine; SQLite gets a single shared connection with SAVEPOINT support."""
+    if not is_sqlite(database_url):
+        return create_async_engine(database_url)
+
+    engine = create_async_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enforce_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+async def create_schema(engine: AsyncEngine) -> None:
+    """Create missing tables (a no-op on a migrated PostgreSQL database)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
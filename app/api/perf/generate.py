@@ -0,0 +1,530 @@
+"""
+Bulk synthetic data generator for production-scale testing.
+
+Generates cities, aircraft, labor kits, work orders and work order items with
+skewed, production-like distributions and bulk loads them: binary COPY through
+asyncpg on PostgreSQL, executemany on SQLite. Rows are built as plain tuples
+with explicit primary keys (so foreign keys never need a round trip) and loaded
+in batches, each committed on its own. Output is deterministic for a given seed
+and starting database.
+
+Distributions:
+    - work orders per city follow a Zipf curve (a few busy shops, a long tail)
+    - aircraft visits are skewed, so some tails show up far more than others
+    - volume grows over time; recent months hold more work orders than old ones
+    - older work orders are almost all completed or void, recent ones are open
+    - items per work order are log-normal (median ~3, long tail up to 60)
+
+Usage:
+    python -m perf.generate --database-url sqlite+aiosqlite:///perf.db --work-orders 10000
+    python -m perf.generate --database-url postgresql+asyncpg://localhost/cirrus_perf \\
+        --work-orders 1000000 --seed 42
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from models.aircraft import Aircraft
+from models.city import City
+from models.labor_kit import LaborKit
+from models.labor_kit_item import LaborKitItem
+from models.work_order import PriorityLevel, WorkOrder, WorkOrderStatus, WorkOrderType
+from models.work_order_item import WorkOrderItem, WorkOrderItemStatus
+from perf.db import create_perf_engine, create_schema
+
+CITIES = [
+    ("KTYS", "Knoxville"),
+    ("KDVT", "Phoenix Deer Valley"),
+    ("KSGR", "Houston Sugar Land"),
+    ("KAPA", "Denver Centennial"),
+    ("KFXE", "Fort Lauderdale Executive"),
+    ("KPDK", "Atlanta DeKalb-Peachtree"),
+    ("KBED", "Boston Hanscom"),
+    ("KVNY", "Van Nuys"),
+    ("KADS", "Dallas Addison"),
+    ("KSDL", "Scottsdale"),
+    ("KMYF", "San Diego Montgomery"),
+    ("KFRG", "Farmingdale Republic"),
+    ("KPWK", "Chicago Executive"),
+    ("KBJC", "Broomfield Rocky Mountain"),
+    ("KLUK", "Cincinnati Lunken"),
+    ("KCRQ", "Carlsbad McClellan-Palomar"),
+    ("KHWD", "Hayward Executive"),
+    ("KORL", "Orlando Executive"),
+    ("KDTO", "Denton Enterprise"),
+    ("KPAE", "Everett Paine Field"),
+    ("KSMO", "Santa Monica"),
+    ("KFFZ", "Mesa Falcon Field"),
+    ("KGYH", "Greenville Donaldson"),
+    ("KBNA", "Nashville International"),
+]
+
+MODELS = [("SR22T", 45), ("SR22", 30), ("SR20", 15), ("SF50", 10)]
+
+# (ATA code, category, discrepancy, corrective action)
+FINDINGS = [
+    ("05-20", "Inspection", "Perform annual inspection", "Inspected per checklist"),
+    ("05-20", "Inspection", "Perform 100 hour inspection", "Inspected per checklist"),
+    ("12-10", "Servicing", "Oil change due", "Drained oil, replaced filter, serviced"),
+    ("21-50", "Environmental", "A/C blows warm air", "Recharged system, leak checked"),
+    ("24-30", "Electrical", "Alternator 2 fail annunciation", "Replaced voltage regulator"),
+    ("24-30", "Electrical", "Main battery capacity test due", "Capacity tested, within limits"),
+    ("27-10", "Flight Controls", "Aileron cable tension low", "Adjusted cable tension"),
+    ("28-20", "Fuel", "Fuel quantity indication erratic", "Replaced fuel level sender"),
+    ("32-40", "Landing Gear", "Left main brake worn", "Replaced brake linings"),
+    ("32-40", "Landing Gear", "Nose tire worn to limits", "Replaced nose tire and tube"),
+    ("33-40", "Lights", "Left wingtip strobe inoperative", "Replaced strobe power supply"),
+    ("34-10", "Avionics", "Pitot heat inoperative", "Replaced pitot heater element"),
+    ("34-50", "Avionics", "Database update due", "Loaded current navigation database"),
+    ("52-10", "Doors", "Cabin door seal damaged", "Replaced door seal"),
+    ("56-10", "Windows", "Windshield crazing", "Polished windshield"),
+    ("61-10", "Propeller", "Propeller leading edge nicks", "Dressed nicks within limits"),
+    ("71-20", "Powerplant", "Engine mount inspection due", "Inspected engine mounts"),
+    ("72-00", "Powerplant", "Low compression cylinder 3", "Borescoped, lapped exhaust valve"),
+    ("77-10", "Powerplant", "CHT probe cylinder 5 erratic", "Replaced CHT probe"),
+    ("79-20", "Powerplant", "Oil leak at rocker cover", "Replaced rocker cover gasket"),
+    ("95-00", "CAPS", "CAPS rocket motor due", "Replaced rocket motor"),
+]
+
+TECHNICIANS = ["A. Rivera", "B. Chen", "C. Okafor", "D. Lindqvist", "E. Haddad", "F. Novak"]
+SALES = ["G. Patel", "H. Brooks", "I. Moreau"]
+CUSTOMERS = [f"Customer {n:04d}" for n in range(2000)]
+
+OPEN_STATUSES = [
+    (WorkOrderStatus.CREATED, 10),
+    (WorkOrderStatus.SCHEDULED, 15),
+    (WorkOrderStatus.OPEN, 25),
+    (WorkOrderStatus.IN_PROGRESS, 30),
+    (WorkOrderStatus.TRACKING, 5),
+    (WorkOrderStatus.PENDING, 10),
+    (WorkOrderStatus.IN_REVIEW, 5),
+]
+PRIORITIES = [
+    (PriorityLevel.LOW, 15),
+    (PriorityLevel.NORMAL, 70),
+    (PriorityLevel.HIGH, 12),
+    (PriorityLevel.URGENT, 3),
+]
+OPEN_ITEM_STATUSES = [
+    (WorkOrderItemStatus.OPEN, 40),
+    (WorkOrderItemStatus.WAITING_FOR_PARTS, 10),
+    (WorkOrderItemStatus.IN_PROGRESS, 25),
+    (WorkOrderItemStatus.TECH_REVIEW, 10),
+    (WorkOrderItemStatus.ADMIN_REVIEW, 5),
+    (WorkOrderItemStatus.FINISHED, 10),
+]
+
+CITY_COLUMNS = ["id", "uuid", "code", "name", "is_active", "created_at", "updated_at"]
+AIRCRAFT_COLUMNS = [
+    "id", "uuid", "registration_number", "serial_number", "make", "model", "year_built",
+    "primary_city_id", "customer_name", "is_active", "created_by", "created_at", "updated_at",
+]
+LABOR_KIT_COLUMNS = [
+    "id", "uuid", "name", "description", "category", "is_active",
+    "created_by", "created_at", "updated_at",
+]
+LABOR_KIT_ITEM_COLUMNS = [
+    "id", "uuid", "labor_kit_id", "item_number", "discrepancy", "corrective_action",
+    "category", "ata_code", "hours_estimate", "billing_method", "do_not_bill", "enable_rii",
+    "created_by", "created_at", "updated_at",
+]
+WORK_ORDER_COLUMNS = [
+    "id", "uuid", "work_order_number", "sequence_number", "city_id", "aircraft_id",
+    "work_order_type", "status", "customer_name", "due_date", "created_date",
+    "completed_date", "lead_technician", "sales_person", "priority",
+    "created_by", "created_at", "updated_at",
+]
+WORK_ORDER_ITEM_COLUMNS = [
+    "id", "uuid", "work_order_id", "city_id", "item_number", "status", "discrepancy",
+    "corrective_action", "category", "ata_code", "hours_estimate", "billing_method",
+    "do_not_bill", "enable_rii", "created_by", "created_at", "updated_at",
+]
+
+CREATED_BY = "generator"
+
+
+@dataclass
+class GeneratorConfig:
+    """Size and shape of the generated data set."""
+
+    work_orders: int = 10_000
+    cities: int = 12
+    aircraft: int | None = None  # default: one per 40 work orders, at least 50
+    labor_kits: int = 40
+    years: float = 5.0
+    seed: int = 0
+    batch_size: int = 20_000
+
+    @property
+    def aircraft_count(self) -> int:
+        return self.aircraft or max(50, self.work_orders // 40)
+
+
+def _cumulative(weights) -> list[float]:
+    return list(itertools.accumulate(weights))
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return [1 / (rank + 1) ** s for rank in range(n)]
+
+
+class Picker:
+    """Weighted choice from a fixed population using a precomputed CDF."""
+
+    def __init__(self, population, weights):
+        self.population = list(population)
+        self.cum_weights = _cumulative(weights)
+        self.total = self.cum_weights[-1]
+
+    def pick(self, rng: random.Random):
+        index = bisect.bisect(self.cum_weights, rng.random() * self.total)
+        return self.population[min(index, len(self.population) - 1)]
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _registration(aircraft_id: int) -> str:
+    letters = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+    return f"N{aircraft_id}{letters[aircraft_id % 24]}{letters[(aircraft_id // 24) % 24]}"
+
+
+def item_count(rng: random.Random) -> int:
+    """Items on one work order: log-normal, median ~3, capped at 60."""
+    return min(60, max(1, int(rng.lognormvariate(1.1, 0.8))))
+
+
+class BulkLoader:
+    """Loads batches of row tuples: COPY on PostgreSQL, executemany elsewhere."""
+
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+        self.is_postgres = conn.dialect.name == "postgresql"
+
+    async def load(self, model, columns: list[str], rows: list[tuple]) -> None:
+        if not rows:
+            return
+        table = model.__table__
+        if self.is_postgres:
+            raw = await self.conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                table.name,
+                records=[tuple(_pg_value(v) for v in row) for row in rows],
+                columns=columns,
+            )
+        else:
+            await self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+    async def reset_sequences(self, models) -> None:
+        """Move serial sequences past the explicitly assigned ids (PostgreSQL only)."""
+        if not self.is_postgres:
+            return
+        for model in models:
+            name = model.__tablename__
+            await self.conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {name}))"
+                )
+            )
+
+
+def _pg_value(value):
+    # asyncpg's COPY encodes enums as text and needs plain strings for them
+    if isinstance(value, (WorkOrderStatus, WorkOrderType, PriorityLevel, WorkOrderItemStatus)):
+        return value.value
+    return value
+
+
+async def _max_id(conn: AsyncConnection, model) -> int:
+    return (await conn.execute(select(func.coalesce(func.max(model.id), 0)))).scalar_one()
+
+
+class DataGenerator:
+    """Generates and loads one data set; see the module docstring for the shape."""
+
+    def __init__(self, config: GeneratorConfig, now: datetime | None = None):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.now = now or datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.counts: dict[str, int] = {}
+
+    def _log(self, message: str) -> None:
+        print(message, file=sys.stderr, flush=True)
+
+    async def run(self, conn: AsyncConnection) -> dict[str, int]:
+        loader = BulkLoader(conn)
+        city_ids = await self._load_cities(conn, loader)
+        aircraft_by_city = await self._load_aircraft(conn, loader, city_ids)
+        await self._load_labor_kits(conn, loader)
+        await self._load_work_orders(conn, loader, city_ids, aircraft_by_city)
+        await loader.reset_sequences(
+            [City, Aircraft, LaborKit, LaborKitItem, WorkOrder, WorkOrderItem]
+        )
+        await conn.commit()
+        return self.counts
+
+    async def _load_cities(self, conn: AsyncConnection, loader: BulkLoader) -> list[int]:
+        """Insert missing cities; returns the ids of every city work orders go to."""
+        wanted = CITIES[: self.config.cities]
+        existing = dict(
+            (await conn.execute(
+                select(City.code, City.id).where(City.code.in_([c for c, _ in wanted]))
+            )).all()
+        )
+        next_id = await _max_id(conn, City) + 1
+        rows = []
+        for code, name in wanted:
+            if code not in existing:
+                existing[code] = next_id
+                rows.append((next_id, _uuid(self.rng), code, name, True, self.now, self.now))
+                next_id += 1
+        await loader.load(City, CITY_COLUMNS, rows)
+        await conn.commit()
+        self.counts["city"] = len(rows)
+        return [existing[code] for code, _ in wanted]
+
+    async def _load_aircraft(
+        self, conn: AsyncConnection, loader: BulkLoader, city_ids: list[int]
+    ) -> dict[int, Picker]:
+        """Insert the fleet; returns a skewed aircraft picker per city."""
+        rng = self.rng
+        city_picker = Picker(city_ids, _zipf_weights(len(city_ids)))
+        model_picker = Picker(*zip(*MODELS))
+        first_id = await _max_id(conn, Aircraft) + 1
+        fleet: dict[int, list[int]] = {city_id: [] for city_id in city_ids}
+        rows = []
+        for aircraft_id in range(first_id, first_id + self.config.aircraft_count):
+            city_id = city_picker.pick(rng)
+            fleet[city_id].append(aircraft_id)
+            rows.append((
+                aircraft_id,
+                _uuid(rng),
+                _registration(aircraft_id),
+                f"{rng.randint(1000, 9999)}",
+                "Cirrus",
+                model_picker.pick(rng),
+                rng.randint(2001, 2025),
+                city_id,
+                rng.choice(CUSTOMERS),
+                rng.random() > 0.03,
+                CREATED_BY,
+                self.now,
+                self.now,
+            ))
+        for start in range(0, len(rows), self.config.batch_size):
+            batch = rows[start : start + self.config.batch_size]
+            await loader.load(Aircraft, AIRCRAFT_COLUMNS, batch)
+        await conn.commit()
+        self.counts["aircraft"] = len(rows)
+
+        # Cities without a based aircraft borrow the whole fleet (visiting aircraft)
+        all_ids = [a for ids in fleet.values() for a in ids]
+        return {
+            city_id: Picker(ids or all_ids, _zipf_weights(len(ids or all_ids), s=0.8))
+            for city_id, ids in fleet.items()
+        }
+
+    async def _load_labor_kits(self, conn: AsyncConnection, loader: BulkLoader) -> None:
+        rng = self.rng
+        kit_id = await _max_id(conn, LaborKit) + 1
+        item_id = await _max_id(conn, LaborKitItem) + 1
+        kits, items = [], []
+        for n in range(self.config.labor_kits):
+            ata, category, _, _ = rng.choice(FINDINGS)
+            kits.append((
+                kit_id, _uuid(rng), f"{category} Kit {n + 1}", f"Standard {category.lower()} tasks",
+                category, rng.random() > 0.1, CREATED_BY, self.now, self.now,
+            ))
+            for item_number in range(1, rng.randint(3, 40) + 1):
+                ata, category, discrepancy, action = rng.choice(FINDINGS)
+                items.append((
+                    item_id, _uuid(rng), kit_id, item_number, discrepancy, action, category, ata,
+                    Decimal(rng.choice(["0.5", "1.0", "1.5", "2.0", "4.0"])), "hourly",
+                    False, rng.random() < 0.05, CREATED_BY, self.now, self.now,
+                ))
+                item_id += 1
+            kit_id += 1
+        await loader.load(LaborKit, LABOR_KIT_COLUMNS, kits)
+        await loader.load(LaborKitItem, LABOR_KIT_ITEM_COLUMNS, items)
+        await conn.commit()
+        self.counts["labor_kit"] = len(kits)
+        self.counts["labor_kit_item"] = len(items)
+
+    async def _load_work_orders(
+        self,
+        conn: AsyncConnection,
+        loader: BulkLoader,
+        city_ids: list[int],
+        aircraft_by_city: dict[int, Picker],
+    ) -> None:
+        """Stream work orders and their items in chronological batches."""
+        rng = self.rng
+        config = self.config
+        city_picker = Picker(city_ids, _zipf_weights(len(city_ids)))
+        codes = dict(
+            (await conn.execute(select(City.id, City.code).where(City.id.in_(city_ids)))).all()
+        )
+        sequences = dict.fromkeys(city_ids, 0)
+        sequences.update(
+            (await conn.execute(
+                select(WorkOrder.city_id, func.max(WorkOrder.sequence_number))
+                .where(WorkOrder.city_id.in_(city_ids))
+                .group_by(WorkOrder.city_id)
+            )).all()
+        )
+        status_picker = Picker(*zip(*OPEN_STATUSES))
+        priority_picker = Picker(*zip(*PRIORITIES))
+        item_status_picker = Picker(*zip(*OPEN_ITEM_STATUSES))
+        finding_picker = Picker(FINDINGS, _zipf_weights(len(FINDINGS), s=0.7))
+        hours = [Decimal(h) for h in ("0.5", "1.0", "1.5", "2.0", "3.0", "4.0", "8.0")]
+
+        span = timedelta(days=365 * config.years)
+        start = self.now - span
+        wo_id = await _max_id(conn, WorkOrder) + 1
+        item_id = await _max_id(conn, WorkOrderItem) + 1
+        total_items = 0
+        started = time.perf_counter()
+
+        for batch_start in range(0, config.work_orders, config.batch_size):
+            work_orders, items = [], []
+            for i in range(batch_start, min(batch_start + config.batch_size, config.work_orders)):
+                # sqrt maps uniform progress onto a linearly growing volume
+                created = start + span * math.sqrt((i + rng.random()) / config.work_orders)
+                age_days = (self.now - created).days
+                city_id = city_picker.pick(rng)
+                sequences[city_id] += 1
+                sequence = sequences[city_id]
+
+                is_quote = rng.random() < 0.08
+                open_probability = 0.9 if age_days < 14 else 0.5 if age_days < 60 else 0.02
+                if rng.random() < open_probability:
+                    status = status_picker.pick(rng)
+                    completed = None
+                else:
+                    void_probability = 0.3 if is_quote else 0.04
+                    if rng.random() < void_probability:
+                        status = WorkOrderStatus.VOID
+                    else:
+                        status = WorkOrderStatus.COMPLETED
+                    completed = created + timedelta(hours=rng.expovariate(1 / 96))
+
+                work_orders.append((
+                    wo_id,
+                    _uuid(rng),
+                    f"{codes[city_id]}{sequence:05d}-{created.month:02d}-{created.year}",
+                    sequence,
+                    city_id,
+                    aircraft_by_city[city_id].pick(rng),
+                    WorkOrderType.QUOTE if is_quote else WorkOrderType.WORK_ORDER,
+                    status,
+                    rng.choice(CUSTOMERS),
+                    (created + timedelta(days=rng.randint(1, 21))).date(),
+                    created,
+                    completed,
+                    rng.choice(TECHNICIANS),
+                    rng.choice(SALES),
+                    priority_picker.pick(rng),
+                    CREATED_BY,
+                    created,
+                    completed or created,
+                ))
+
+                for item_number in range(1, item_count(rng) + 1):
+                    ata, category, discrepancy, action = finding_picker.pick(rng)
+                    if status.is_terminal():
+                        item_status = WorkOrderItemStatus.FINISHED
+                    else:
+                        item_status = item_status_picker.pick(rng)
+                    items.append((
+                        item_id,
+                        _uuid(rng),
+                        wo_id,
+                        city_id,
+                        item_number,
+                        item_status,
+                        discrepancy,
+                        action if item_status == WorkOrderItemStatus.FINISHED else None,
+                        category,
+                        ata,
+                        rng.choice(hours),
+                        "hourly",
+                        rng.random() < 0.02,
+                        rng.random() < 0.05,
+                        CREATED_BY,
+                        created,
+                        created,
+                    ))
+                    item_id += 1
+                wo_id += 1
+
+            await loader.load(WorkOrder, WORK_ORDER_COLUMNS, work_orders)
+            await loader.load(WorkOrderItem, WORK_ORDER_ITEM_COLUMNS, items)
+            await conn.commit()
+            total_items += len(items)
+            done = batch_start + len(work_orders)
+            rate = done / (time.perf_counter() - started)
+            self._log(
+                f"work orders: {done}/{config.work_orders} ({rate:,.0f}/s), items: {total_items}"
+            )
+
+        self.counts["work_order"] = config.work_orders
+        self.counts["work_order_item"] = total_items
+
+
+async def generate(database_url: str, config: GeneratorConfig) -> dict[str, int]:
+    """Create missing tables and load a generated data set; returns row counts."""
+    engine = create_perf_engine(database_url)
+    try:
+        await create_schema(engine)
+        async with engine.connect() as conn:
+            return await DataGenerator(config).run(conn)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Bulk load synthetic MRO data")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--work-orders", type=int, default=defaults.work_orders)
+    parser.add_argument("--cities", type=int, default=defaults.cities, help=f"Max {len(CITIES)}")
+    parser.add_argument("--aircraft", type=int, help="Default: one per 40 work orders")
+    parser.add_argument("--labor-kits", type=int, default=defaults.labor_kits)
+    parser.add_argument("--years", type=float, default=defaults.years, help="History to spread over")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        work_orders=args.work_orders,
+        cities=min(args.cities, len(CITIES)),
+        aircraft=args.aircraft,
+        labor_kits=args.labor_kits,
+        years=args.years,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+    started = time.perf_counter()
+    counts = asyncio.run(generate(args.database_url, config))
+    for table, count in counts.items():
+        print(f"{table:<16} {count:>12,}")
+    print(f"loaded in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
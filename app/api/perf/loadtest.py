@@ -0,0 +1,307 @@
+"""
+Asyncio load generator for the API.
+
+Drives ``main.app`` in-process through httpx's ``ASGITransport`` (or a running
+server with ``--base-url``) with a weighted mix of the scenarios technicians
+actually hit, and reports throughput and latency percentiles per scenario as
+JSON so builds can be compared.
+
+Usage:
+    python -m perf.loadtest --duration 30 --concurrency 20
+    python -m perf.loadtest --database-url sqlite+aiosqlite:///:memory: --seed
+    python -m perf.loadtest --base-url http://localhost:8000 --output run.json
+    python -m perf.loadtest --mix list_work_orders=5,dashboard=1
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from httpx import AsyncClient, ASGITransport, Response
+
+from core.config import get_settings
+
+API = get_settings().api_v1_prefix
+
+DEFAULT_MIX = {
+    "list_work_orders": 40,
+    "work_order_detail": 30,
+    "add_item": 15,
+    "apply_labor_kit": 5,
+    "dashboard": 10,
+}
+
+
+@dataclass
+class LoadTestData:
+    """Ids discovered from the API before the run starts."""
+
+    city_ids: list[str]
+    work_order_ids: list[str]
+    labor_kit_ids: list[str]
+    search_terms: list[str]
+
+
+@dataclass
+class ScenarioStats:
+    """Latencies and error count for one scenario."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+Scenario = Callable[[AsyncClient, LoadTestData, random.Random], Awaitable[Response]]
+
+
+async def list_work_orders(client: AsyncClient, data: LoadTestData, rng: random.Random):
+    params = {"city_id": rng.choice(data.city_ids)}
+    if data.search_terms and rng.random() < 0.5:
+        params["search"] = rng.choice(data.search_terms)
+    return await client.get(f"{API}/work-orders", params=params)
+
+
+async def work_order_detail(client: AsyncClient, data: LoadTestData, rng: random.Random):
+    work_order_id = rng.choice(data.work_order_ids)
+    response = await client.get(f"{API}/work-orders/{work_order_id}")
+    if response.is_success:
+        response = await client.get(f"{API}/work-orders/{work_order_id}/items")
+    return response
+
+
+async def add_item(client: AsyncClient, data: LoadTestData, rng: random.Random):
+    work_order_id = rng.choice(data.work_order_ids)
+    return await client.post(
+        f"{API}/work-orders/{work_order_id}/items",
+        json={
+            "discrepancy": f"Load test discrepancy {uuid4().hex[:8]}",
+            "category": "Inspection",
+            "hours_estimate": "1.5",
+            "created_by": "loadtest",
+        },
+    )
+
+
+async def apply_labor_kit(client: AsyncClient, data: LoadTestData, rng: random.Random):
+    kit_id = rng.choice(data.labor_kit_ids)
+    work_order_id = rng.choice(data.work_order_ids)
+    return await client.post(
+        f"{API}/labor-kits/{kit_id}/apply/{work_order_id}",
+        params={"created_by": "loadtest"},
+    )
+
+
+async def dashboard(client: AsyncClient, data: LoadTestData, rng: random.Random):
+    return await client.get(f"{API}/dashboard/work-order-counts-by-city")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "list_work_orders": list_work_orders,
+    "work_order_detail": work_order_detail,
+    "add_item": add_item,
+    "apply_labor_kit": apply_labor_kit,
+    "dashboard": dashboard,
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse ``name=weight,name=weight`` into a scenario mix."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name}")
+        mix[name] = int(weight) if weight else 1
+    return mix
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values (q in 0-100)."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+async def discover_data(client: AsyncClient) -> LoadTestData:
+    """Collect ids to drive the scenarios from the API itself."""
+    cities = (await client.get(f"{API}/cities")).json()["items"]
+    city_ids = [c["id"] for c in cities]
+
+    work_order_ids = []
+    search_terms = []
+    for city_id in city_ids:
+        response = await client.get(
+            f"{API}/work-orders", params={"city_id": city_id, "page_size": 100}
+        )
+        for wo in response.json()["items"]:
+            work_order_ids.append(wo["id"])
+            search_terms.append(wo["aircraft"]["registration_number"])
+            if wo["customer_name"]:
+                search_terms.append(wo["customer_name"].split()[0])
+
+    kits = (await client.get(f"{API}/labor-kits", params={"active_only": True})).json()
+    labor_kit_ids = [k["id"] for k in kits["items"]]
+
+    if not city_ids or not work_order_ids:
+        raise RuntimeError("No cities or work orders to load test; seed the database first")
+
+    return LoadTestData(
+        city_ids=city_ids,
+        work_order_ids=work_order_ids,
+        labor_kit_ids=labor_kit_ids,
+        search_terms=sorted(set(search_terms)),
+    )
+
+
+async def run_load_test(
+    client: AsyncClient,
+    duration: float = 30.0,
+    concurrency: int = 10,
+    mix: dict[str, int] | None = None,
+    seed: int = 0,
+) -> dict:
+    """Run the scenario mix for `duration` seconds and return the report."""
+    mix = dict(mix or DEFAULT_MIX)
+    data = await discover_data(client)
+    if not data.labor_kit_ids:
+        mix.pop("apply_labor_kit", None)
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stats = {name: ScenarioStats() for name in names}
+
+    async def worker(worker_id: int, deadline: float) -> None:
+        rng = random.Random(seed + worker_id)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](client, data, rng)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            stats[name].latencies_ms.append((time.perf_counter() - start) * 1000)
+            if failed:
+                stats[name].errors += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(i, deadline) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name, scenario_stats in stats.items():
+        latencies = sorted(scenario_stats.latencies_ms)
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": scenario_stats.errors,
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "config": {"duration_s": duration, "concurrency": concurrency, "mix": mix, "seed": seed},
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": total,
+        "total_errors": sum(e["errors"] for e in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+async def _in_process_client(database_url: str | None, seed_data: bool):
+    """Build an AsyncClient around main.app, optionally on its own database."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from core.database import get_db
+    from main import app
+    from perf.db import create_perf_engine, create_schema, is_sqlite
+
+    engine = None
+    if database_url:
+        engine = create_perf_engine(database_url)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        # SQLite runs share one connection, so requests hold it one at a time
+        connection_lock = asyncio.Lock() if is_sqlite(database_url) else contextlib.nullcontext()
+
+        if seed_data:
+            from perf.seed import seed_minimal
+
+            await create_schema(engine)
+            async with session_factory() as session:
+                await seed_minimal(session)
+                await session.commit()
+
+        async def override_get_db():
+            async with connection_lock, session_factory() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+
+        app.dependency_overrides[get_db] = override_get_db
+
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://loadtest")
+    return client, engine
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    if args.base_url:
+        client, engine = AsyncClient(base_url=args.base_url, timeout=30), None
+    else:
+        client, engine = await _in_process_client(args.database_url, args.seed)
+
+    try:
+        async with client:
+            return await run_load_test(
+                client,
+                duration=args.duration,
+                concurrency=args.concurrency,
+                mix=parse_mix(args.mix) if args.mix else None,
+                seed=args.random_seed,
+            )
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Cirrus MRO API")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    parser.add_argument("--mix", help="Scenario weights, e.g. list_work_orders=4,dashboard=1")
+    parser.add_argument("--base-url", help="Target a running server instead of in-process")
+    parser.add_argument("--database-url", help="In-process only: database to run against")
+    parser.add_argument("--seed", action="store_true", help="Create schema and seed data first")
+    parser.add_argument("--random-seed", type=int, default=0, help="Seed for the scenario mix")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(_main(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
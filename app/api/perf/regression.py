@@ -0,0 +1,290 @@
+"""
+Performance regression gate for the crud benchmarks.
+
+Runs ``perf.benchmarks`` several times, pools the samples per benchmark and
+compares the median against the committed baseline (``perf/baseline.json``).
+Timing noise is handled with the median absolute deviation (MAD): a benchmark
+only fails when it is slower than the baseline by more than ``--mad-factor``
+MADs *and* by more than ``--tolerance`` relative to the baseline median.
+Query counts are deterministic, so any increase fails outright. A benchmark
+that is in the suite but not in the baseline, or the other way round, also
+fails, so the baseline always covers the whole suite.
+
+Exits non-zero when anything regressed. Baselines are machine specific;
+regenerate one on the machine that runs the gate with ``--update-baseline``
+and commit it alongside the change that explains it. With ``--filter`` only
+the matching benchmarks are replaced in the existing baseline. A baseline is
+only compared against or merged with runs on the same database backend.
+
+Usage:
+    python -m perf.regression
+    python -m perf.regression --repeats 5 --tolerance 0.15
+    python -m perf.regression --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from perf.benchmarks import run_benchmarks
+from perf.db import DEFAULT_PERF_DATABASE_URL, create_perf_engine, create_schema
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# Scale factor making the MAD a consistent estimator of the standard deviation
+MAD_SCALE = 1.4826
+
+
+def mad(samples: list[float]) -> float:
+    """Scaled median absolute deviation of the samples."""
+    median = statistics.median(samples)
+    return MAD_SCALE * statistics.median(abs(s - median) for s in samples)
+
+
+class DatabaseMismatch(ValueError):
+    """The baseline was recorded on a different database backend."""
+
+
+def check_database(baseline: dict, current: dict) -> None:
+    """Refuse to mix timings from different database backends."""
+    if baseline.get("database") != current["database"]:
+        raise DatabaseMismatch(
+            f"Baseline was recorded on {baseline.get('database')}, this run used "
+            f"{current['database']}; use a baseline for the same backend"
+        )
+
+
+def merge_baseline(baseline: dict, current: dict, name_filter: str) -> dict:
+    """Replace the benchmarks matching `name_filter` in the baseline with the current run."""
+    check_database(baseline, current)
+    benchmarks = {}
+    for name, result in baseline["benchmarks"].items():
+        if name_filter not in name:
+            benchmarks[name] = result
+        elif name in current["benchmarks"]:
+            benchmarks[name] = current["benchmarks"][name]
+    for name, result in current["benchmarks"].items():
+        benchmarks.setdefault(name, result)
+    return {**current, "benchmarks": benchmarks}
+
+
+@dataclass
+class Comparison:
+    """Result of comparing one benchmark against the baseline."""
+
+    name: str
+    verdict: str  # ok, faster, slower, more-queries, new, missing
+    baseline_ms: float | None = None
+    current_ms: float | None = None
+    baseline_queries: int | None = None
+    current_queries: int | None = None
+
+    @property
+    def regressed(self) -> bool:
+        return self.verdict in ("slower", "more-queries", "new", "missing")
+
+    @property
+    def change(self) -> float | None:
+        if not self.baseline_ms or self.current_ms is None:
+            return None
+        return (self.current_ms - self.baseline_ms) / self.baseline_ms
+
+
+def summarize_runs(reports: list[dict]) -> dict:
+    """Pool the samples of repeated benchmark runs into a baseline document."""
+    samples: dict[str, list[float]] = {}
+    queries: dict[str, int] = {}
+    for report in reports:
+        for name, result in report["benchmarks"].items():
+            samples.setdefault(name, []).extend(result["samples_ms"])
+            queries[name] = result["queries"]
+
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "database": reports[0]["database"],
+        "runs": len(reports),
+        "benchmarks": {
+            name: {
+                "median_ms": round(statistics.median(values), 4),
+                "mad_ms": round(mad(values), 4),
+                "samples": len(values),
+                "queries": queries[name],
+            }
+            for name, values in samples.items()
+        },
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    tolerance: float = 0.25,
+    mad_factor: float = 3.0,
+) -> list[Comparison]:
+    """Compare a current summary against the baseline, benchmark by benchmark."""
+    comparisons = []
+    base_benchmarks = baseline["benchmarks"]
+    current_benchmarks = current["benchmarks"]
+
+    for name in sorted(base_benchmarks.keys() | current_benchmarks.keys()):
+        base = base_benchmarks.get(name)
+        cur = current_benchmarks.get(name)
+        if base is None:
+            comparisons.append(
+                Comparison(name, "new", current_ms=cur["median_ms"], current_queries=cur["queries"])
+            )
+            continue
+        if cur is None:
+            comparisons.append(
+                Comparison(
+                    name, "missing", baseline_ms=base["median_ms"], baseline_queries=base["queries"]
+                )
+            )
+            continue
+
+        delta = cur["median_ms"] - base["median_ms"]
+        # Use the larger spread so a noisy run is not judged against a tight baseline
+        noise = mad_factor * max(base["mad_ms"], cur["mad_ms"])
+        relative = tolerance * base["median_ms"]
+
+        if cur["queries"] > base["queries"]:
+            verdict = "more-queries"
+        elif delta > noise and delta > relative:
+            verdict = "slower"
+        elif -delta > noise and -delta > relative:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+
+        comparisons.append(
+            Comparison(
+                name,
+                verdict,
+                baseline_ms=base["median_ms"],
+                current_ms=cur["median_ms"],
+                baseline_queries=base["queries"],
+                current_queries=cur["queries"],
+            )
+        )
+    return comparisons
+
+
+def format_report(comparisons: list[Comparison]) -> str:
+    """Render the per-benchmark comparison as a text table."""
+
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value:.3f}"
+
+    def queries(c: Comparison) -> str:
+        if c.baseline_queries is None or c.current_queries is None:
+            return str(c.current_queries if c.baseline_queries is None else c.baseline_queries)
+        if c.baseline_queries == c.current_queries:
+            return str(c.current_queries)
+        return f"{c.baseline_queries}->{c.current_queries}"
+
+    lines = [
+        f"{'benchmark':<45} {'base ms':>10} {'now ms':>10} {'change':>8} {'queries':>10}  verdict"
+    ]
+    for c in comparisons:
+        change = "-" if c.change is None else f"{c.change:+.1%}"
+        verdict = c.verdict.upper() if c.regressed else c.verdict
+        lines.append(
+            f"{c.name:<45} {ms(c.baseline_ms):>10} {ms(c.current_ms):>10} {change:>8} "
+            f"{queries(c):>10}  {verdict}"
+        )
+    regressions = sum(c.regressed for c in comparisons)
+    lines.append("")
+    lines.append(f"{regressions} regression(s) in {len(comparisons)} benchmark(s)")
+    return "\n".join(lines)
+
+
+async def collect(
+    database_url: str,
+    repeats: int,
+    iterations: int,
+    warmup: int,
+    name_filter: str | None = None,
+) -> dict:
+    """Run the benchmarks `repeats` times and summarize the pooled samples."""
+    engine = create_perf_engine(database_url)
+    try:
+        await create_schema(engine)
+        reports = [
+            await run_benchmarks(
+                engine, iterations=iterations, warmup=warmup, name_filter=name_filter
+            )
+            for _ in range(repeats)
+        ]
+    finally:
+        await engine.dispose()
+    return summarize_runs(reports)
+
+
+def write_baseline(path: Path, baseline: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+    print(f"Wrote baseline for {len(baseline['benchmarks'])} benchmark(s) to {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fail on crud benchmark regressions")
+    parser.add_argument("--database-url", default=DEFAULT_PERF_DATABASE_URL)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--repeats", type=int, default=3, help="Independent benchmark runs")
+    parser.add_argument("--iterations", type=int, default=10, help="Samples per run")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Minimum relative slowdown that fails"
+    )
+    parser.add_argument(
+        "--mad-factor", type=float, default=3.0, help="Minimum slowdown in MADs that fails"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Write the results as the new baseline; with --filter, merge them into it"
+    )
+    args = parser.parse_args()
+
+    current = asyncio.run(
+        collect(args.database_url, args.repeats, args.iterations, args.warmup, args.filter)
+    )
+
+    if args.update_baseline and not (args.filter and args.baseline.exists()):
+        write_baseline(args.baseline, current)
+        return
+
+    if not args.baseline.exists():
+        sys.exit(f"No baseline at {args.baseline}; create one with --update-baseline")
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if args.update_baseline:
+        try:
+            write_baseline(args.baseline, merge_baseline(baseline, current, args.filter))
+        except DatabaseMismatch as e:
+            sys.exit(str(e))
+        return
+
+    try:
+        check_database(baseline, current)
+    except DatabaseMismatch as e:
+        sys.exit(str(e))
+    if args.filter:
+        baseline["benchmarks"] = {
+            name: result for name, result in baseline["benchmarks"].items() if args.filter in name
+        }
+
+    comparisons = compare(baseline, current, tolerance=args.tolerance, mad_factor=args.mad_factor)
+    print(format_report(comparisons))
+    if any(c.regressed for c in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
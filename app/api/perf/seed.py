@@ -0,0 +1,88 @@
+"""
+Seed data for performance runs.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.aircraft import Aircraft
+from models.city import City
+from models.labor_kit import LaborKit
+from models.labor_kit_item import LaborKitItem
+from models.work_order import WorkOrder, WorkOrderStatus, PriorityLevel
+from models.work_order_item import WorkOrderItem
+
+# Codes that do not collide with the cities seeded by the migrations
+CITY_CODES = [("PFA", "Perf City A"), ("PFB", "Perf City B")]
+
+
+async def seed_minimal(
+    db: AsyncSession,
+    work_orders_per_city: int = 100,
+    items_per_work_order: int = 5,
+    seed: int = 0,
+) -> None:
+    """Create a small, realistic data set through the ORM."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    cities = [City(code=code, name=name) for code, name in CITY_CODES]
+    db.add_all(cities)
+    aircraft = [
+        Aircraft(
+            registration_number=f"NP{1000 + i}",
+            serial_number=f"SN{i:05d}",
+            make="Cirrus",
+            model=rng.choice(["SR20", "SR22", "SR22T"]),
+            year_built=rng.randint(2005, 2025),
+            primary_city=cities[i % len(cities)],
+            customer_name=f"Customer {i}",
+            created_by="seed",
+        )
+        for i in range(20)
+    ]
+    db.add_all(aircraft)
+
+    for kit_number in range(3):
+        kit = LaborKit(name=f"Inspection Kit {kit_number}", category="Inspection", created_by="seed")
+        kit.items = [
+            LaborKitItem(
+                item_number=n,
+                discrepancy=f"Kit {kit_number} task {n}",
+                corrective_action="Inspect per checklist",
+                hours_estimate=1,
+                created_by="seed",
+            )
+            for n in range(1, 11)
+        ]
+        db.add(kit)
+
+    statuses = list(WorkOrderStatus)
+    for city in cities:
+        for sequence in range(1, work_orders_per_city + 1):
+            created = now - timedelta(days=rng.randint(0, 365))
+            work_order = WorkOrder(
+                work_order_number=f"{city.code}{sequence:05d}-{created.month:02d}-{created.year}",
+                sequence_number=sequence,
+                city=city,
+                aircraft=rng.choice(aircraft),
+                status=rng.choice(statuses),
+                priority=rng.choice(list(PriorityLevel)),
+                customer_name=f"Customer {rng.randint(0, 19)}",
+                created_by="seed",
+                created_at=created,
+            )
+            work_order.items = [
+                WorkOrderItem(
+                    item_number=n,
+                    discrepancy=f"Discrepancy {n}",
+                    hours_estimate=rng.choice([0.5, 1, 2, 4]),
+                    created_by="seed",
+                )
+                for n in range(1, items_per_work_order + 1)
+            ]
+            db.add(work_order)
+
+    await db.flush()
@@ -5,6 +5,8 @@ from routers.labor_kits import router as labor_kits_router
 from routers.labor_kit_items import router as labor_kit_items_router
 from routers.aircraft import router as aircraft_router
 from routers.dashboard import router as dashboard_router
+from routers.admin import router as admin_router
+from routers.health import router as health_router
 
 __all__ = [
     "cities_router",
@@ -14,4 +16,6 @@ __all__ = [
     "labor_kit_items_router",
     "aircraft_router",
     "dashboard_router",
+    "admin_router",
+    "health_router",
 ]
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from core.config import Settings, get_settings
+from core.profiling import ADMIN_PATH, ProfileStore, get_profile_store, is_bearer_token
+from core.slow_query_log import SlowQueryLog, get_slow_query_log
+from schemas.admin import (
+    SlowQueryEntryResponse,
+    SlowQueryListResponse,
+    ProfileSummaryResponse,
+    ProfileListResponse,
+)
+
+
+def require_profiling_token(
+    authorization: str | None = Header(None),
+    settings: Settings = Depends(get_settings),
+):
+    """Require ``Authorization: Bearer <PROFILING_TOKEN>``; refuse all while it is unset."""
+    if not is_bearer_token(authorization, settings.profiling_token):
+        raise HTTPException(status_code=403, detail="Profiling token required")
+
+
+# Profiles and slow statements expose request paths, SQL and parameters
+router = APIRouter(
+    prefix=ADMIN_PATH, tags=["admin"], dependencies=[Depends(require_profiling_token)]
+)
+
+
+@router.get("/slow-queries", response_model=SlowQueryListResponse)
+async def list_slow_queries(
+    slow_query_log: SlowQueryLog = Depends(get_slow_query_log),
+):
+    """List recorded slow statements, newest first."""
+    entries = slow_query_log.entries
+    return SlowQueryListResponse(
+        items=[SlowQueryEntryResponse.model_validate(entry) for entry in entries],
+        total=len(entries),
+        threshold_ms=slow_query_log.threshold_ms,
+    )
+
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries(
+    slow_query_log: SlowQueryLog = Depends(get_slow_query_log),
+):
+    """Clear the slow query log."""
+    slow_query_log.clear()
+
+
+@router.get("/profiles", response_model=ProfileListResponse)
+async def list_profiles(
+    profile_store: ProfileStore = Depends(get_profile_store),
+):
+    """List captured request profiles, newest first."""
+    profiles = profile_store.profiles
+    return ProfileListResponse(
+        items=[ProfileSummaryResponse.model_validate(p) for p in profiles],
+        total=len(profiles),
+    )
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    profile_store: ProfileStore = Depends(get_profile_store),
+):
+    """Get a captured profile (folded stacks or speedscope JSON)."""
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(content=profile.content, media_type=profile.media_type)
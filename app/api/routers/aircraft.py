@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Literal
 
+from core.bulk import (
+    CSV_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPES,
+    TooManyRows,
+    UnsupportedMediaType,
+    iter_upload,
+    validate_rows,
+)
+from core.config import get_settings
+from core.counting import CountMode
 from core.database import get_db
 from core.sorting import SortOrder
+from schemas.bulk import BulkRowError
 from schemas.aircraft import (
     AircraftCreate,
     AircraftUpdate,
     AircraftResponse,
     AircraftListResponse,
+    AircraftImportRow,
+    AircraftImportResponse,
     CityBrief,
 )
 from crud.aircraft import (
@@ -18,6 +31,7 @@ from crud.aircraft import (
     create_aircraft,
     update_aircraft,
     delete_aircraft,
+    upsert_aircraft,
 )
 
 router = APIRouter(prefix="/aircraft", tags=["aircraft"])
@@ -61,6 +75,7 @@ async def list_aircraft(
         "registration_number", "make", "model", "year_built", "customer_name", "created_at"
     ] | None = Query(None, description="Column to sort by"),
     sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    count: CountMode = Query(CountMode.EXACT, description="How to total large lists"),
     db: AsyncSession = Depends(get_db),
 ):
     """List aircraft with pagination and filtering."""
@@ -73,10 +88,12 @@ async def list_aircraft(
         active_only=active_only,
         sort_by=sort_by,
         sort_order=sort_order,
+        count_mode=count,
     )
     return AircraftListResponse(
         items=[aircraft_to_response(a) for a in aircraft_list],
-        total=total,
+        total=total.value,
+        total_kind=total.kind,
         page=page,
         page_size=page_size,
     )
@@ -95,6 +112,57 @@ async def create_new_aircraft(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/import",
+    response_model=AircraftImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in NDJSON_MEDIA_TYPES + CSV_MEDIA_TYPES
+            },
+        }
+    },
+)
+async def import_aircraft_upload(
+    request: Request,
+    created_by: str = Query(..., description="User importing the fleet list"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bulk insert or update aircraft from NDJSON or CSV, keyed on registration number.
+
+    Rows name their primary city by `primary_city_code`. Rows that fail are
+    reported by line number and skipped; the remaining rows are applied.
+    """
+    settings = get_settings()
+    errors: list[tuple[int, str]] = []
+    try:
+        parsed = iter_upload(request.stream(), request.headers.get("content-type"))
+        inserted, updated, upsert_errors = await upsert_aircraft(
+            db,
+            validate_rows(parsed, AircraftImportRow, errors, settings.bulk_import_max_rows),
+            created_by,
+            chunk_size=settings.bulk_chunk_size,
+        )
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except TooManyRows as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    errors = sorted(errors + upsert_errors)
+    return AircraftImportResponse(
+        received=inserted + updated + len(errors),
+        inserted=inserted,
+        updated=updated,
+        rejected=len(errors),
+        errors=[BulkRowError(line=line, error=error) for line, error in errors],
+    )
+
+
 @router.get("/{aircraft_id}", response_model=AircraftResponse)
 async def get_aircraft(
     aircraft_id: UUID,
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import Settings, get_settings
+from core.database import get_engine
+from core.health import check_readiness
+from schemas.health import LivenessResponse, ReadinessResponse
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("")
+def health():
+    """Legacy health check; prefer /health/live and /health/ready."""
+    return {"status": "healthy"}
+
+
+@router.get("/live", response_model=LivenessResponse)
+def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return LivenessResponse(status="alive")
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse}},
+)
+async def readiness(
+    response: Response,
+    engine: AsyncEngine = Depends(get_engine),
+    settings: Settings = Depends(get_settings),
+):
+    """Readiness probe: returns 503 when degraded so traffic is shed."""
+    result = await check_readiness(engine, settings)
+    if result.status != "ready":
+        response.status_code = 503
+    return result
@@ -4,6 +4,7 @@ from uuid import UUID
 from typing import Literal
 
 from core.database import get_db
+from core.partial_update import not_found_detail
 from core.sorting import SortOrder
 from schemas.labor_kit_item import (
     LaborKitItemCreate,
@@ -19,6 +20,7 @@ from crud.labor_kit_item import (
     delete_labor_kit_item,
 )
 from crud.labor_kit import get_labor_kit_by_uuid
+from models.labor_kit import LaborKit
 
 router = APIRouter(prefix="/labor-kits/{kit_id}/items", tags=["labor-kit-items"])
 
@@ -110,17 +112,10 @@ async def update_existing_labor_kit_item(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a labor kit item."""
-    # Verify labor kit exists
-    labor_kit = await get_labor_kit_by_uuid(db, kit_id)
-    if not labor_kit:
-        raise HTTPException(status_code=404, detail="Labor kit not found")
-
-    # Verify item belongs to this labor kit
-    existing_item = await get_labor_kit_item_by_uuid(db, item_id)
-    if not existing_item or existing_item.labor_kit_id != labor_kit.id:
-        raise HTTPException(status_code=404, detail="Labor kit item not found")
-
-    item = await update_labor_kit_item(db, item_id, item_in)
+    item = await update_labor_kit_item(db, item_id, item_in, kit_id)
+    if not item:
+        detail = await not_found_detail(db, LaborKit, kit_id, "Labor kit", "Labor kit item")
+        raise HTTPException(status_code=404, detail=detail)
     return item_to_response(item, kit_id)
 
 
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Literal
 
+from core.concurrency import VersionConflict, etag, parse_if_match
 from core.database import get_db
+from core.partial_update import not_found_detail
 from core.sorting import SortOrder
 from schemas.work_order_item import (
     WorkOrderItemCreate,
     WorkOrderItemUpdate,
     WorkOrderItemResponse,
     WorkOrderItemListResponse,
+    WorkOrderItemBatch,
+    WorkOrderItemBatchResponse,
 )
 from crud.work_order_item import (
     get_work_order_items,
@@ -17,8 +21,10 @@ from crud.work_order_item import (
     create_work_order_item,
     update_work_order_item,
     delete_work_order_item,
+    apply_work_order_item_batch,
 )
 from crud.work_order import get_work_order_by_uuid
+from models.work_order import WorkOrder
 
 router = APIRouter(prefix="/work-orders/{work_order_id}/items", tags=["work-order-items"])
 
@@ -46,6 +52,7 @@ def item_to_response(item, work_order_uuid: UUID) -> WorkOrderItemResponse:
         updated_by=item.updated_by,
         created_at=item.created_at,
         updated_at=item.updated_at,
+        version=item.version,
     )
 
 
@@ -57,14 +64,14 @@ async def list_work_order_items(
     sort_order: SortOrder = Query(SortOrder.ASC, description="Sort direction"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List items for a work order."""
+    """List items for a work order, including archived work orders."""
     # Verify work order exists
-    work_order = await get_work_order_by_uuid(db, work_order_id)
+    work_order = await get_work_order_by_uuid(db, work_order_id, include_archive=True)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
     items, total = await get_work_order_items(
-        db, work_order_id, sort_by=sort_by, sort_order=sort_order
+        db, work_order_id, sort_by=sort_by, sort_order=sort_order, include_archive=True
     )
     return WorkOrderItemListResponse(
         items=[item_to_response(item, work_order_id) for item in items],
@@ -85,43 +92,76 @@ async def create_new_work_order_item(
     return item_to_response(item, work_order_id)
 
 
+@router.post(":batch", response_model=WorkOrderItemBatchResponse)
+async def batch_work_order_items(
+    work_order_id: UUID,
+    batch: WorkOrderItemBatch,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create, update and delete items of a work order in one transaction."""
+    try:
+        result = await apply_work_order_item_batch(db, work_order_id, batch)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Work order not found")
+
+    created, updated, deleted = result
+    return WorkOrderItemBatchResponse(
+        created=[item_to_response(item, work_order_id) for item in created],
+        updated=[item_to_response(item, work_order_id) for item in updated],
+        deleted=deleted,
+    )
+
+
 @router.get("/{item_id}", response_model=WorkOrderItemResponse)
 async def get_work_order_item(
     work_order_id: UUID,
     item_id: UUID,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a work order item by ID."""
+    """Get a work order item by ID, including items of archived work orders."""
     # Verify work order exists
-    work_order = await get_work_order_by_uuid(db, work_order_id)
+    work_order = await get_work_order_by_uuid(db, work_order_id, include_archive=True)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
-    item = await get_work_order_item_by_uuid(db, item_id)
+    item = await get_work_order_item_by_uuid(db, item_id, include_archive=True)
     if not item or item.work_order_id != work_order.id:
         raise HTTPException(status_code=404, detail="Work order item not found")
+    response.headers["ETag"] = etag(item.version)
     return item_to_response(item, work_order_id)
 
 
-@router.put("/{item_id}", response_model=WorkOrderItemResponse)
+@router.put(
+    "/{item_id}",
+    response_model=WorkOrderItemResponse,
+    responses={412: {"description": "The item changed since the If-Match version"}},
+)
 async def update_existing_work_order_item(
     work_order_id: UUID,
     item_id: UUID,
     item_in: WorkOrderItemUpdate,
+    response: Response,
+    if_match: str | None = Header(None, description="Only update while the ETag matches"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update a work order item."""
-    # Verify work order exists
-    work_order = await get_work_order_by_uuid(db, work_order_id)
-    if not work_order:
-        raise HTTPException(status_code=404, detail="Work order not found")
-
-    # Verify item belongs to this work order
-    existing_item = await get_work_order_item_by_uuid(db, item_id)
-    if not existing_item or existing_item.work_order_id != work_order.id:
-        raise HTTPException(status_code=404, detail="Work order item not found")
-
-    item = await update_work_order_item(db, item_id, item_in)
+    """Update a work order item, optionally as a compare-and-swap on its ETag."""
+    try:
+        item = await update_work_order_item(
+            db, item_id, item_in, work_order_id, parse_if_match(if_match)
+        )
+    except VersionConflict as e:
+        raise HTTPException(
+            status_code=412, detail=str(e), headers={"ETag": etag(e.current_version)}
+        )
+    if not item:
+        detail = await not_found_detail(
+            db, WorkOrder, work_order_id, "Work order", "Work order item"
+        )
+        raise HTTPException(status_code=404, detail=detail)
+    response.headers["ETag"] = etag(item.version)
     return item_to_response(item, work_order_id)
 
 
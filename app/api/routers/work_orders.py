@@ -1,24 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Literal
 
+from core.bulk import (
+    CSV_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPES,
+    TooManyRows,
+    UnsupportedMediaType,
+    iter_upload,
+    validate_rows,
+)
+from core.concurrency import VersionConflict, etag, parse_if_match
+from core.config import get_settings
+from core.counting import CountMode
 from core.database import get_db
 from core.sorting import SortOrder
+from schemas.bulk import BulkItemError, BulkRowError
 from schemas.work_order import (
     WorkOrderCreate,
     WorkOrderUpdate,
+    WorkOrderCopy,
     WorkOrderResponse,
     WorkOrderListResponse,
+    WorkOrderImportRow,
+    WorkOrderImportResponse,
+    WorkOrderStatusTransition,
+    WorkOrderStatusChange,
+    WorkOrderStatusTransitionResponse,
+    WorkOrderType,
+    WorkOrderView,
     CityBrief,
     AircraftBrief,
 )
 from crud.work_order import (
+    StatusTransitionError,
     get_work_orders,
     get_work_order_by_uuid,
     create_work_order,
     update_work_order,
     delete_work_order,
+    clone_work_order,
+    convert_quote_to_work_order,
+    import_work_orders,
+    transition_work_order_status,
 )
 
 router = APIRouter(prefix="/work-orders", tags=["work-orders"])
@@ -58,7 +83,9 @@ def work_order_to_response(wo) -> WorkOrderResponse:
         updated_by=wo.updated_by,
         created_at=wo.created_at,
         updated_at=wo.updated_at,
-        item_count=len(wo.items) if wo.items else 0,
+        version=wo.version,
+        # Lists and updates return the count with the row instead of loading the items
+        item_count=wo.item_count if hasattr(wo, "item_count") else len(wo.items or []),
     )
 
 
@@ -68,27 +95,41 @@ async def list_work_orders(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: str | None = None,
-    status: str | None = None,
+    status: list[str] | None = Query(None, description="Statuses to include; repeatable"),
+    view: WorkOrderView | None = Query(None, description="Saved list view to apply"),
+    open_only: bool = Query(False, description="Only work orders that are not closed"),
+    lead_technician: str | None = Query(None, description="Only this technician's work orders"),
+    work_order_type: WorkOrderType | None = None,
     sort_by: Literal[
         "work_order_number", "customer_name", "status", "priority", "created_at"
     ] | None = Query(None, description="Column to sort by"),
     sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    count: CountMode = Query(CountMode.EXACT, description="How to total large lists"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List work orders for a city."""
-    work_orders, total = await get_work_orders(
-        db,
-        city_uuid=city_id,
-        page=page,
-        page_size=page_size,
-        search=search,
-        status=status,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    """List work orders for a city, optionally through a saved view."""
+    try:
+        work_orders, total = await get_work_orders(
+            db,
+            city_uuid=city_id,
+            page=page,
+            page_size=page_size,
+            search=search,
+            statuses=status,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            view=view,
+            open_only=open_only,
+            lead_technician=lead_technician,
+            work_order_type=work_order_type,
+            count_mode=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return WorkOrderListResponse(
         items=[work_order_to_response(wo) for wo in work_orders],
-        total=total,
+        total=total.value,
+        total_kind=total.kind,
         page=page,
         page_size=page_size,
     )
@@ -107,28 +148,137 @@ async def create_new_work_order(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/import",
+    response_model=WorkOrderImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in NDJSON_MEDIA_TYPES + CSV_MEDIA_TYPES
+            },
+        }
+    },
+)
+async def import_work_orders_upload(
+    request: Request,
+    created_by: str = Query(..., description="User importing the work orders"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bulk import work orders from NDJSON or CSV.
+
+    Each row names its city by `city_code` and aircraft by
+    `aircraft_registration`. Rows that fail are reported by line number and
+    skipped; the remaining rows are imported.
+    """
+    settings = get_settings()
+    errors: list[tuple[int, str]] = []
+    try:
+        parsed = iter_upload(request.stream(), request.headers.get("content-type"))
+        rows = [
+            row
+            async for row in validate_rows(
+                parsed, WorkOrderImportRow, errors, settings.bulk_import_max_rows
+            )
+        ]
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except TooManyRows as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    imported, import_errors = await import_work_orders(
+        db, rows, created_by, chunk_size=settings.bulk_chunk_size
+    )
+    errors = sorted(errors + import_errors)
+    return WorkOrderImportResponse(
+        received=imported + len(errors),
+        imported=imported,
+        failed=len(errors),
+        errors=[BulkRowError(line=line, error=error) for line, error in errors],
+    )
+
+
+@router.post(":transition", response_model=WorkOrderStatusTransitionResponse)
+async def transition_work_orders(
+    transition: WorkOrderStatusTransition,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Move many work orders to one status.
+
+    Open work orders may move to any other status; completed and void ones
+    may be reopened but not moved to the other closed status. Work orders that
+    cannot move are reported and left unchanged.
+    """
+    updated, rejected = await transition_work_order_status(db, transition)
+    return WorkOrderStatusTransitionResponse(
+        updated=[
+            WorkOrderStatusChange(
+                id=row.uuid,
+                work_order_number=row.work_order_number,
+                status=row.status,
+                completed_date=row.completed_date,
+            )
+            for row in updated
+        ],
+        rejected=[BulkItemError(id=wo_uuid, error=error) for wo_uuid, error in rejected],
+    )
+
+
 @router.get("/{work_order_id}", response_model=WorkOrderResponse)
 async def get_work_order(
     work_order_id: UUID,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a work order by ID."""
-    work_order = await get_work_order_by_uuid(db, work_order_id)
+    """Get a work order by ID, including archived work orders."""
+    work_order = await get_work_order_by_uuid(db, work_order_id, include_archive=True)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
+    response.headers["ETag"] = etag(work_order.version)
     return work_order_to_response(work_order)
 
 
-@router.put("/{work_order_id}", response_model=WorkOrderResponse)
+@router.put(
+    "/{work_order_id}",
+    response_model=WorkOrderResponse,
+    responses={
+        409: {"description": "The work order is already closed with another status"},
+        412: {"description": "The work order changed since the If-Match version"},
+    },
+)
 async def update_existing_work_order(
     work_order_id: UUID,
     work_order_in: WorkOrderUpdate,
+    response: Response,
+    if_match: str | None = Header(None, description="Only update while the ETag matches"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update a work order."""
-    work_order = await update_work_order(db, work_order_id, work_order_in)
+    """Update a work order, optionally as a compare-and-swap on its ETag.
+
+    Status changes follow the bulk transition rules: a closed work order may
+    be reopened, but a completed one cannot be voided or a void one completed
+    (409). Reopening clears `completed_date`; closing sets it unless sent.
+    """
+    try:
+        work_order = await update_work_order(
+            db, work_order_id, work_order_in, parse_if_match(if_match)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StatusTransitionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except VersionConflict as e:
+        raise HTTPException(
+            status_code=412, detail=str(e), headers={"ETag": etag(e.current_version)}
+        )
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
+    response.headers["ETag"] = etag(work_order.version)
     return work_order_to_response(work_order)
 
 
@@ -141,3 +291,32 @@ async def delete_existing_work_order(
     deleted = await delete_work_order(db, work_order_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Work order not found")
+
+
+@router.post("/{work_order_id}:clone", response_model=WorkOrderResponse, status_code=201)
+async def clone_existing_work_order(
+    work_order_id: UUID,
+    copy_in: WorkOrderCopy,
+    db: AsyncSession = Depends(get_db),
+):
+    """Copy a work order and all of its items under a fresh number."""
+    work_order = await clone_work_order(db, work_order_id, copy_in)
+    if not work_order:
+        raise HTTPException(status_code=404, detail="Work order not found")
+    return work_order_to_response(work_order)
+
+
+@router.post("/{work_order_id}:convert", response_model=WorkOrderResponse, status_code=201)
+async def convert_quote(
+    work_order_id: UUID,
+    copy_in: WorkOrderCopy,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create a work order from a quote and all of its items."""
+    try:
+        work_order = await convert_quote_to_work_order(db, work_order_id, copy_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not work_order:
+        raise HTTPException(status_code=404, detail="Work order not found")
+    return work_order_to_response(work_order)
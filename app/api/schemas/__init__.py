@@ -4,6 +4,11 @@ from schemas.work_order import (
     WorkOrderUpdate,
     WorkOrderResponse,
     WorkOrderListResponse,
+    WorkOrderImportRow,
+    WorkOrderImportResponse,
+    WorkOrderStatusTransition,
+    WorkOrderStatusChange,
+    WorkOrderStatusTransitionResponse,
     WorkOrderStatus,
     PriorityLevel,
     WorkOrderType,
@@ -14,6 +19,9 @@ from schemas.work_order_item import (
     WorkOrderItemResponse,
     WorkOrderItemListResponse,
     WorkOrderItemStatus,
+    WorkOrderItemPatch,
+    WorkOrderItemBatch,
+    WorkOrderItemBatchResponse,
 )
 from schemas.labor_kit import (
     LaborKitCreate,
@@ -33,7 +41,17 @@ from schemas.aircraft import (
     AircraftUpdate,
     AircraftResponse,
     AircraftListResponse,
+    AircraftImportRow,
+    AircraftImportResponse,
 )
+from schemas.admin import (
+    SlowQueryEntryResponse,
+    SlowQueryListResponse,
+    ProfileSummaryResponse,
+    ProfileListResponse,
+)
+from schemas.bulk import BulkItemError, BulkRowError
+from schemas.health import HealthCheck, LivenessResponse, ReadinessResponse
 
 __all__ = [
     "CityResponse",
@@ -42,6 +60,11 @@ __all__ = [
     "WorkOrderUpdate",
     "WorkOrderResponse",
     "WorkOrderListResponse",
+    "WorkOrderImportRow",
+    "WorkOrderImportResponse",
+    "WorkOrderStatusTransition",
+    "WorkOrderStatusChange",
+    "WorkOrderStatusTransitionResponse",
     "WorkOrderStatus",
     "PriorityLevel",
     "WorkOrderType",
@@ -50,6 +73,9 @@ __all__ = [
     "WorkOrderItemResponse",
     "WorkOrderItemListResponse",
     "WorkOrderItemStatus",
+    "WorkOrderItemPatch",
+    "WorkOrderItemBatch",
+    "WorkOrderItemBatchResponse",
     "LaborKitCreate",
     "LaborKitUpdate",
     "LaborKitResponse",
@@ -63,4 +89,15 @@ __all__ = [
     "AircraftUpdate",
     "AircraftResponse",
     "AircraftListResponse",
+    "AircraftImportRow",
+    "AircraftImportResponse",
+    "SlowQueryEntryResponse",
+    "SlowQueryListResponse",
+    "ProfileSummaryResponse",
+    "ProfileListResponse",
+    "BulkItemError",
+    "BulkRowError",
+    "HealthCheck",
+    "LivenessResponse",
+    "ReadinessResponse",
 ]
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any
+
+
+class SlowQueryEntryResponse(BaseModel):
+    """Response schema for a recorded slow statement."""
+
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    plan: Any | None
+
+    class Config:
+        from_attributes = True
+
+
+class SlowQueryListResponse(BaseModel):
+    """Response schema for the slow query log."""
+
+    items: list[SlowQueryEntryResponse]
+    total: int
+    threshold_ms: float
+
+
+class ProfileSummaryResponse(BaseModel):
+    """Response schema for a captured request profile (without its content)."""
+
+    id: str
+    method: str
+    path: str
+    recorded_at: datetime
+    duration_ms: float
+    media_type: str
+
+    class Config:
+        from_attributes = True
+
+
+class ProfileListResponse(BaseModel):
+    """Response schema for a list of captured profiles."""
+
+    items: list[ProfileSummaryResponse]
+    total: int
@@ -2,6 +2,9 @@ from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
 
+from core.counting import TotalKind
+from schemas.bulk import BulkRowError
+
 
 class AircraftBase(BaseModel):
     """Base schema for aircraft fields."""
@@ -44,6 +47,15 @@ class AircraftUpdate(BaseModel):
     updated_by: str | None = None
 
 
+class AircraftImportRow(AircraftBase):
+    """One row of a bulk fleet import (NDJSON object or CSV record)."""
+
+    primary_city_code: str | None = None
+
+    # Defaults to the importing user
+    created_by: str | None = None
+
+
 class CityBrief(BaseModel):
     """Brief city info for aircraft response."""
 
@@ -82,10 +94,22 @@ class AircraftResponse(BaseModel):
         from_attributes = True
 
 
+class AircraftImportResponse(BaseModel):
+    """Response schema for a bulk fleet import."""
+
+    received: int
+    inserted: int
+    updated: int
+    rejected: int
+    errors: list[BulkRowError]
+
+
 class AircraftListResponse(BaseModel):
     """Response schema for a list of aircraft."""
 
     items: list[AircraftResponse]
     total: int
+    # exact, at_least (more than total) or estimate
+    total_kind: TotalKind = TotalKind.EXACT
     page: int
     page_size: int
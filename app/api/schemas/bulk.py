@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from uuid import UUID
+
+
+class BulkRowError(BaseModel):
+    """A row of a bulk upload that was not applied."""
+
+    line: int
+    error: str
+
+
+class BulkItemError(BaseModel):
+    """An entity of a bulk request that was not changed."""
+
+    id: UUID
+    error: str
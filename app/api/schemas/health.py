@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Literal
+
+
+class HealthCheck(BaseModel):
+    """Result of a single readiness check."""
+
+    name: str
+    status: Literal["ok", "degraded", "failed"]
+    value: float | None
+    threshold: float
+    detail: str | None = None
+
+
+class LivenessResponse(BaseModel):
+    """Response schema for the liveness probe."""
+
+    status: Literal["alive"]
+
+
+class ReadinessResponse(BaseModel):
+    """Response schema for the readiness probe."""
+
+    status: Literal["ready", "degraded", "unavailable"]
+    checks: list[HealthCheck]
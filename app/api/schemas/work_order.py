@@ -4,6 +4,9 @@ from datetime import datetime, date
 from decimal import Decimal
 from enum import Enum
 
+from core.counting import TotalKind
+from schemas.bulk import BulkItemError, BulkRowError
+
 
 class WorkOrderStatus(str, Enum):
     CREATED = "created"
@@ -29,6 +32,16 @@ class WorkOrderType(str, Enum):
     QUOTE = "quote"
 
 
+class WorkOrderView(str, Enum):
+    """Saved work order list views, each a preset of list filters."""
+
+    MY_OPEN_ITEMS = "my_open_items"
+    OPEN = "open"
+    ALL = "all"
+    OPEN_QUOTES = "open_quotes"
+    ALL_QUOTES = "all_quotes"
+
+
 class WorkOrderBase(BaseModel):
     """Base schema for work order fields."""
 
@@ -71,8 +84,9 @@ class WorkOrderUpdate(BaseModel):
     customer_name: str | None = None
     customer_po_number: str | None = None
 
-    # Dates
+    # Dates; completed_date defaults to the time the status is closed
     due_date: date | None = None
+    completed_date: datetime | None = None
 
     # Assignment
     lead_technician: str | None = None
@@ -82,6 +96,65 @@ class WorkOrderUpdate(BaseModel):
     updated_by: str | None = None
 
 
+class WorkOrderCopy(BaseModel):
+    """Schema for cloning a work order or converting a quote into one.
+
+    City, aircraft, customer, assignment, priority and every item are copied
+    from the source. The copy starts over as created, with a fresh number and
+    its own due date and PO.
+    """
+
+    created_by: str
+    due_date: date | None = None
+    customer_po_number: str | None = None
+
+
+class WorkOrderImportRow(WorkOrderBase):
+    """One row of a bulk work order import (NDJSON object or CSV record)."""
+
+    city_code: str
+    aircraft_registration: str
+
+    # Column sizes of work_order, so oversized values fail validation per row
+    status_notes: str | None = Field(None, max_length=255)
+    customer_name: str | None = Field(None, max_length=200)
+    customer_po_number: str | None = Field(None, max_length=50)
+    lead_technician: str | None = Field(None, max_length=100)
+    sales_person: str | None = Field(None, max_length=100)
+
+    # Historical dates; default to the time of the import
+    created_date: datetime | None = None
+    completed_date: datetime | None = None
+
+    # Defaults to the importing user
+    created_by: str | None = Field(None, max_length=100)
+
+
+class WorkOrderStatusTransition(BaseModel):
+    """Schema for moving many work orders to one status."""
+
+    ids: list[UUID] = Field(min_length=1, max_length=1000)
+    status: WorkOrderStatus
+    status_notes: str | None = None
+    updated_by: str
+
+
+class WorkOrderStatusChange(BaseModel):
+    """A work order whose status was changed by a bulk transition."""
+
+    id: UUID
+    work_order_number: str
+    status: WorkOrderStatus
+    completed_date: datetime | None
+
+
+class WorkOrderStatusTransitionResponse(BaseModel):
+    """Response schema for a bulk status transition."""
+
+    updated: list[WorkOrderStatusChange]
+    rejected: list[BulkItemError]
+
+
 class CityBrief(BaseModel):
     """Brief city info for work order response."""
 
@@ -138,6 +211,7 @@ class WorkOrderResponse(BaseModel):
     updated_by: str | None
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     # Item count
     item_count: int = 0
@@ -146,10 +220,21 @@ class WorkOrderResponse(BaseModel):
         from_attributes = True
 
 
+class WorkOrderImportResponse(BaseModel):
+    """Response schema for a bulk work order import."""
+
+    received: int
+    imported: int
+    failed: int
+    errors: list[BulkRowError]
+
+
 class WorkOrderListResponse(BaseModel):
     """Response schema for a list of work orders."""
 
     items: list[WorkOrderResponse]
     total: int
+    # exact, at_least (more than total) or estimate
+    total_kind: TotalKind = TotalKind.EXACT
     page: int
     page_size: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -57,6 +57,20 @@ class WorkOrderItemUpdate(BaseModel):
     updated_by: str | None = None
 
 
+class WorkOrderItemPatch(WorkOrderItemUpdate):
+    """Schema for one update in a batch, addressed by item id."""
+
+    id: UUID
+
+
+class WorkOrderItemBatch(BaseModel):
+    """Schema for creating, updating and deleting items in one transaction."""
+
+    create: list[WorkOrderItemCreate] = Field(default_factory=list, max_length=1000)
+    update: list[WorkOrderItemPatch] = Field(default_factory=list, max_length=1000)
+    delete: list[UUID] = Field(default_factory=list, max_length=1000)
+
+
 class WorkOrderItemResponse(BaseModel):
     """Response schema for a work order item."""
 
@@ -82,6 +96,7 @@ class WorkOrderItemResponse(BaseModel):
     updated_by: str | None
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     class Config:
         from_attributes = True
@@ -92,3 +107,11 @@ class WorkOrderItemListResponse(BaseModel):
 
     items: list[WorkOrderItemResponse]
     total: int
+
+
+class WorkOrderItemBatchResponse(BaseModel):
+    """Response schema for a work order item batch."""
+
+    created: list[WorkOrderItemResponse]
+    updated: list[WorkOrderItemResponse]
+    deleted: list[UUID]
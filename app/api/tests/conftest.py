@@ -2,15 +2,26 @@
 Pytest configuration and shared fixtures for all tests.
 """
 
+import re
+
 import pytest
+from contextlib import contextmanager
 from typing import AsyncGenerator
 from uuid import uuid4
 
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
-
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from core.coalescing import get_response_coalescer
+from core.counting import get_total_cache
 from core.database import Base, get_db
+from core.query_stats import track_queries
 from main import app
 from models.city import City
 from models.aircraft import Aircraft
@@ -20,37 +31,67 @@ from models.labor_kit import LaborKit
 from models.labor_kit_item import LaborKitItem
 
 
-# Use in-memory SQLite for tests
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+@pytest.fixture(scope="session")
+def test_database_url(tmp_path_factory) -> str:
+    """Create the schema once per session in a worker-private SQLite file.
 
+    tmp_path_factory gives every pytest-xdist worker its own directory, so
+    parallel workers never share a database.
+    """
+    path = tmp_path_factory.mktemp("db") / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return f"sqlite+aiosqlite:///{path}"
 
-@pytest.fixture(scope="function")
-async def test_engine():
-    """Create a test database engine."""
-    engine = create_async_engine(
-        TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+@pytest.fixture(scope="function")
+async def test_engine(test_database_url: str):
+    """Create a test database engine on the session's schema."""
+    engine = create_async_engine(test_database_url)
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enforce_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
     yield engine
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-
     await engine.dispose()
 
 
 @pytest.fixture(scope="function")
-async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
+async def test_connection(test_engine) -> AsyncGenerator[AsyncConnection, None]:
+    """Open a connection whose outer transaction is rolled back after the test."""
+    async with test_engine.connect() as connection:
+        transaction = await connection.begin()
+        yield connection
+        await transaction.rollback()
+
+
+@pytest.fixture(scope="function")
+async def test_session(test_connection) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session.
+
+    Commits and rollbacks inside the test only release or roll back a
+    SAVEPOINT, so nothing outlives the test's outer transaction.
+    """
     TestSessionLocal = async_sessionmaker(
-        test_engine,
+        bind=test_connection,
         class_=AsyncSession,
         expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
 
     async with TestSessionLocal() as session:
@@ -78,6 +119,70 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def clear_total_cache():
+    """Start each test without list totals cached by an earlier one."""
+    get_total_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_coalesced_responses(monkeypatch):
+    """Share only in-flight responses, so tests see rows written between requests."""
+    coalescer = get_response_coalescer()
+    coalescer.clear()
+    monkeypatch.setattr(coalescer, "ttl_s", 0.0)
+
+
+# Transaction control the per-test outer transaction and its SAVEPOINTs emit
+# through the cursor. Production counts these; budgets leave them out so they
+# match what an endpoint issues outside the test harness.
+TRANSACTION_CONTROL = re.compile(
+    r"^\s*(?:BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE
+)
+
+
+@contextmanager
+def _track_budgeted_queries():
+    """Collect the statements a block issues, leaving out transaction control."""
+    statements: list[str] = []
+    with track_queries(keep_statements=True) as stats:
+        yield statements
+    statements.extend(s for s in stats.statements if not TRANSACTION_CONTROL.match(s))
+
+
+@pytest.fixture
+def count_queries():
+    """Collect the SQL statements a block issues, as query budgets count them.
+
+    Usage:
+        with count_queries() as statements:
+            await client.get(...)
+        assert len(statements) == 2
+    """
+    return _track_budgeted_queries
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Assert that a block issues at most `limit` SQL statements.
+
+    Usage:
+        with assert_max_queries(3):
+            await client.get(...)
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with _track_budgeted_queries() as statements:
+            yield statements
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return _assert_max_queries
+
+
 @pytest.fixture
 async def test_city(test_session: AsyncSession) -> City:
     """Create a test city."""
@@ -159,6 +264,7 @@ async def test_work_order_item(
     item = WorkOrderItem(
         uuid=uuid4(),
         work_order_id=test_work_order.id,
+        city_id=test_work_order.city_id,
         item_number=1,
         status=WorkOrderItemStatus.OPEN,
         discrepancy="Test discrepancy",
@@ -17,6 +17,7 @@ class WorkOrderItemFactory(factory.Factory):
     id = factory.Sequence(lambda n: n + 1)
     uuid = factory.LazyFunction(uuid4)
     work_order_id = 1
+    city_id = 1
     item_number = factory.Sequence(lambda n: n + 1)
     status = WorkOrderItemStatus.OPEN
 
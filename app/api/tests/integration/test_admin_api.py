@@ -0,0 +1,158 @@
+"""Integration tests for the Admin API endpoints."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from core.config import Settings, get_settings
+from core.profiling import ProfileStore, ProfilingMiddleware, get_profile_store
+from core.slow_query_log import SlowQueryLog, get_slow_query_log
+from main import app
+from models.city import City
+
+
+ADMIN_HEADERS = {"Authorization": "Bearer secret"}
+
+
+@pytest.fixture(autouse=True)
+def profiling_token():
+    """Admin endpoints answer to the token "secret"."""
+    app.dependency_overrides[get_settings] = lambda: Settings(profiling_token="secret")
+    yield
+    app.dependency_overrides.pop(get_settings, None)
+
+
+@pytest.fixture
+def slow_query_log(test_engine):
+    """Slow query log that records every statement on the test engine."""
+    log = SlowQueryLog(threshold_ms=0, explain_sample_rate=1.0)
+    log.attach(test_engine)
+    app.dependency_overrides[get_slow_query_log] = lambda: log
+    yield log
+    log.detach(test_engine)
+
+
+class TestSlowQueries:
+    """Tests for /api/v1/admin/slow-queries endpoints."""
+
+    async def test_list_slow_queries(
+        self, client: AsyncClient, test_city: City, slow_query_log: SlowQueryLog
+    ):
+        """Test that statements above the threshold are recorded."""
+        slow_query_log.clear()
+        await client.get("/api/v1/cities")
+
+        response = await client.get("/api/v1/admin/slow-queries", headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["threshold_ms"] == 0
+        assert data["total"] >= 1
+        entry = next(e for e in data["items"] if "FROM city" in e["statement"])
+        assert "\n" not in entry["statement"]
+        # Plans are only captured on PostgreSQL
+        assert entry["plan"] is None
+
+    async def test_clear_slow_queries(
+        self, client: AsyncClient, test_city: City, slow_query_log: SlowQueryLog
+    ):
+        """Test clearing the slow query log."""
+        await client.get("/api/v1/cities")
+
+        response = await client.delete("/api/v1/admin/slow-queries", headers=ADMIN_HEADERS)
+        assert response.status_code == 204
+        assert slow_query_log.entries == []
+
+
+@pytest.fixture
+def profile_store():
+    """Profile store shared by the profiled client and the admin endpoints."""
+    store = ProfileStore()
+    app.dependency_overrides[get_profile_store] = lambda: store
+    return store
+
+
+class TestProfiles:
+    """Tests for /api/v1/admin/profiles endpoints."""
+
+    async def test_profiled_request_is_stored(
+        self, client: AsyncClient, test_city: City, profile_store: ProfileStore
+    ):
+        """Test that a request with the profiling token can be retrieved."""
+        profiled_app = ProfilingMiddleware(app, token="secret", store=profile_store)
+        transport = ASGITransport(app=profiled_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as profiled:
+            response = await profiled.get("/api/v1/cities", headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        list_response = await client.get("/api/v1/admin/profiles", headers=ADMIN_HEADERS)
+        assert list_response.json()["items"][0]["id"] == profile_id
+        assert list_response.json()["items"][0]["path"] == "/api/v1/cities"
+
+        profile_response = await client.get(
+            f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN_HEADERS
+        )
+        assert profile_response.status_code == 200
+
+    async def test_admin_reads_not_profiled(
+        self, client: AsyncClient, test_city: City, profile_store: ProfileStore
+    ):
+        """Test that admin reads through the profiler do not store profiles."""
+        profiled_app = ProfilingMiddleware(app, token="secret", store=profile_store)
+        transport = ASGITransport(app=profiled_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as profiled:
+            response = await profiled.get("/api/v1/cities", headers=ADMIN_HEADERS)
+            profile_id = response.headers["x-profile-id"]
+
+            for path in (
+                "/api/v1/admin/profiles",
+                f"/api/v1/admin/profiles/{profile_id}",
+                "/api/v1/admin/slow-queries",
+            ):
+                response = await profiled.get(path, headers=ADMIN_HEADERS)
+                assert response.status_code == 200
+                assert "x-profile-id" not in response.headers
+
+            response = await profiled.get("/api/v1/admin/profiles", headers=ADMIN_HEADERS)
+        assert [item["id"] for item in response.json()["items"]] == [profile_id]
+
+    async def test_unprofiled_request_has_no_profile_id(self, client: AsyncClient):
+        """Test that requests without the token are not profiled."""
+        response = await client.get("/api/v1/cities")
+        assert "x-profile-id" not in response.headers
+
+    async def test_get_profile_not_found(
+        self, client: AsyncClient, profile_store: ProfileStore
+    ):
+        """Test getting an unknown profile."""
+        response = await client.get("/api/v1/admin/profiles/unknown", headers=ADMIN_HEADERS)
+        assert response.status_code == 404
+
+
+class TestAdminToken:
+    """Tests for the profiling token the admin endpoints require."""
+
+    @pytest.mark.parametrize(
+        "method, path",
+        [
+            ("GET", "/api/v1/admin/slow-queries"),
+            ("DELETE", "/api/v1/admin/slow-queries"),
+            ("GET", "/api/v1/admin/profiles"),
+            ("GET", "/api/v1/admin/profiles/unknown"),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "headers", [{}, {"Authorization": "Bearer wrong"}, {"X-Profile": "secret"}]
+    )
+    async def test_requests_without_token_refused(
+        self, client: AsyncClient, method: str, path: str, headers: dict
+    ):
+        """Test every admin endpoint refuses requests without the bearer token."""
+        response = await client.request(method, path, headers=headers)
+        assert response.status_code == 403
+
+    async def test_refused_without_configured_token(self, client: AsyncClient):
+        """Test admin endpoints are closed while no profiling token is set."""
+        app.dependency_overrides[get_settings] = lambda: Settings(profiling_token=None)
+        response = await client.get("/api/v1/admin/profiles", headers={"Authorization": "Bearer "})
+        assert response.status_code == 403
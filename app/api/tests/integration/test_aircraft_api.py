@@ -0,0 +1,199 @@
+"""Integration tests for the Aircraft API endpoints."""
+
+from uuid import uuid4
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.aircraft import Aircraft
+from models.city import City
+
+
+async def import_fleet(client: AsyncClient, body: str, content_type: str = "application/x-ndjson"):
+    return await client.post(
+        "/api/v1/aircraft/import?created_by=importer",
+        content=body,
+        headers={"Content-Type": content_type},
+    )
+
+
+class TestImportAircraft:
+    """Tests for POST /api/v1/aircraft/import endpoint."""
+
+    async def test_import_inserts_and_updates(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        test_city: City,
+        test_aircraft: Aircraft,
+    ):
+        """Test new registrations are inserted and existing ones updated in place."""
+        aircraft_id = test_aircraft.uuid
+        body = "\n".join(
+            [
+                '{"registration_number": "N12345", "customer_name": "New Owner", '
+                '"primary_city_code": "KTYS"}',
+                '{"registration_number": "N777SR", "make": "Cirrus", "model": "SR22", '
+                '"primary_city_code": "KTYS"}',
+            ]
+        )
+        response = await import_fleet(client, body)
+        assert response.status_code == 200
+        assert response.json() == {
+            "received": 2,
+            "inserted": 1,
+            "updated": 1,
+            "rejected": 0,
+            "errors": [],
+        }
+
+        # The upsert bypasses the identity map the test shares with the API
+        test_session.expire_all()
+        updated = (await client.get(f"/api/v1/aircraft/{aircraft_id}")).json()
+        assert updated["customer_name"] == "New Owner"
+        assert updated["primary_city"]["code"] == "KTYS"
+        assert updated["updated_by"] == "importer"
+        # Blank fields keep their existing values
+        assert (updated["make"], updated["serial_number"]) == ("Cessna", "SN12345")
+        assert updated["created_by"] == "test_user"
+
+        listed = await client.get("/api/v1/aircraft?search=N777SR")
+        created = listed.json()["items"][0]
+        assert (created["make"], created["model"], created["created_by"]) == (
+            "Cirrus",
+            "SR22",
+            "importer",
+        )
+
+    async def test_import_keeps_is_active_unless_given(
+        self, client: AsyncClient, test_session: AsyncSession, test_aircraft: Aircraft
+    ):
+        """Test an import only changes is_active on rows that carry it."""
+        retired = Aircraft(
+            registration_number="N500RT", is_active=False, created_by="test_user"
+        )
+        test_session.add(retired)
+        test_aircraft.is_active = False
+        await test_session.commit()
+        uuids = (test_aircraft.uuid, retired.uuid)
+        body = "\n".join(
+            [
+                '{"registration_number": "N12345", "customer_name": "New Owner"}',
+                '{"registration_number": "N500RT", "is_active": true}',
+            ]
+        )
+        response = await import_fleet(client, body)
+        assert response.json()["updated"] == 2
+
+        test_session.expire_all()
+        active = {
+            a["registration_number"]: a["is_active"]
+            for a in [
+                (await client.get(f"/api/v1/aircraft/{uuid}")).json()
+                for uuid in uuids
+            ]
+        }
+        assert active == {"N12345": False, "N500RT": True}
+
+    async def test_import_csv(self, client: AsyncClient, test_city: City):
+        """Test a CSV fleet list is imported."""
+        body = (
+            "registration_number,make,model,year_built,primary_city_code\n"
+            "N100SR,Cirrus,SR20,2019,KTYS\n"
+            "N200SR,Cirrus,SR22T,,\n"
+        )
+        response = await import_fleet(client, body, "text/csv")
+        assert response.json()["inserted"] == 2
+
+        listed = await client.get("/api/v1/aircraft?search=SR&sort_by=registration_number")
+        years = {a["registration_number"]: a["year_built"] for a in listed.json()["items"]}
+        assert years == {"N100SR": 2019, "N200SR": None}
+
+    async def test_import_rejects_bad_rows(self, client: AsyncClient, test_city: City):
+        """Test unknown cities, repeated registrations and invalid rows are rejected."""
+        body = "\n".join(
+            [
+                '{"registration_number": "N1SR", "primary_city_code": "KTYS"}',
+                '{"registration_number": "N2SR", "primary_city_code": "KXXX"}',
+                '{"registration_number": "N1SR", "make": "Cirrus"}',
+                '{"make": "Cirrus"}',
+                '{"registration_number": "N3SR", "year_built": "new"}',
+            ]
+        )
+        response = await import_fleet(client, body)
+        data = response.json()
+        assert (data["received"], data["inserted"], data["updated"], data["rejected"]) == (
+            5,
+            1,
+            0,
+            4,
+        )
+        errors = {e["line"]: e["error"] for e in data["errors"]}
+        assert errors[2] == "City not found: KXXX"
+        assert errors[3] == "Duplicate registration_number N1SR (first on line 1)"
+        assert errors[4].startswith("registration_number: Field required")
+        assert errors[5].startswith("year_built:")
+
+    async def test_import_batches_queries_per_chunk(
+        self, client: AsyncClient, test_city: City, assert_max_queries
+    ):
+        """Test the statement count does not grow with the number of rows."""
+        body = "\n".join(
+            f'{{"registration_number": "N{n}SR", "primary_city_code": "KTYS"}}'
+            for n in range(100)
+        )
+        # City lookup and one upsert, which reports inserts and updates itself
+        with assert_max_queries(2):
+            response = await import_fleet(client, body)
+        assert response.json()["inserted"] == 100
+
+
+class TestUpdateAircraft:
+    """Tests for PUT /api/v1/aircraft/{aircraft_id} endpoint."""
+
+    async def test_update_aircraft_returns_primary_city(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test the update response carries the primary city brief."""
+        response = await client.put(
+            f"/api/v1/aircraft/{test_aircraft.uuid}",
+            json={"primary_city_id": str(test_city.uuid), "notes": "Annual due"},
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["notes"] == "Annual due"
+        assert data["primary_city"] == {
+            "id": str(test_city.uuid),
+            "code": test_city.code,
+            "name": test_city.name,
+        }
+
+    async def test_update_aircraft_clears_primary_city(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test an explicit null primary city is written and returned as null."""
+        await client.put(
+            f"/api/v1/aircraft/{test_aircraft.uuid}",
+            json={"primary_city_id": str(test_city.uuid)},
+        )
+        response = await client.put(
+            f"/api/v1/aircraft/{test_aircraft.uuid}", json={"primary_city_id": None}
+        )
+        assert response.status_code == 200
+        assert response.json()["primary_city"] is None
+
+    async def test_update_aircraft_unknown_city(
+        self, client: AsyncClient, test_aircraft: Aircraft
+    ):
+        """Test pointing an aircraft at a non-existent city returns 400."""
+        response = await client.put(
+            f"/api/v1/aircraft/{test_aircraft.uuid}",
+            json={"primary_city_id": str(uuid4())},
+        )
+        assert response.status_code == 400
+
+    async def test_update_aircraft_not_found(self, client: AsyncClient):
+        """Test updating a non-existent aircraft returns 404."""
+        response = await client.put(f"/api/v1/aircraft/{uuid4()}", json={"notes": "x"})
+        assert response.status_code == 404
@@ -0,0 +1,49 @@
+"""Integration test running the crud microbenchmarks on SQLite."""
+
+import crud
+from perf.benchmarks import BENCHMARKS, run_benchmarks
+from perf.db import create_perf_engine, create_schema
+
+
+class TestBenchmarks:
+    """Tests for run_benchmarks."""
+
+    def test_every_crud_function_has_a_benchmark(self):
+        """Test each public crud function is benchmarked, alone or as a variant."""
+        benchmarked = {name.partition("[")[0] for name in BENCHMARKS}
+        assert set(crud.__all__) - benchmarked == set()
+
+    async def test_every_benchmark_runs_and_rolls_back(self):
+        """Test each benchmark records timings and query counts without keeping its writes."""
+        engine = create_perf_engine()
+        try:
+            await create_schema(engine)
+            report = await run_benchmarks(engine, iterations=1, warmup=0)
+            second = await run_benchmarks(engine, iterations=1, warmup=0, name_filter="delete")
+        finally:
+            await engine.dispose()
+
+        assert report["database"] == "sqlite"
+        assert set(report["benchmarks"]) == set(BENCHMARKS)
+        for result in report["benchmarks"].values():
+            assert result["iterations"] == 1
+            assert result["queries"] > 0
+            assert result["min_ms"] <= result["median_ms"] <= result["max_ms"]
+        # Seed data was rolled back, so a second run can seed it again
+        assert set(second["benchmarks"]) == {n for n in BENCHMARKS if "delete" in n}
+
+    async def test_apply_labor_kit_scales_with_kit_size(self):
+        """Test the kit size variants issue more queries as the kit grows."""
+        engine = create_perf_engine()
+        try:
+            await create_schema(engine)
+            report = await run_benchmarks(
+                engine, iterations=1, warmup=0, name_filter="apply_labor_kit"
+            )
+        finally:
+            await engine.dispose()
+
+        results = report["benchmarks"]
+        small = results["apply_labor_kit_to_work_order[10]"]["queries"]
+        large = results["apply_labor_kit_to_work_order[1000]"]["queries"]
+        assert small < large
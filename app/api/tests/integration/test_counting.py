@@ -0,0 +1,127 @@
+"""Integration tests for list totals."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.counting import CountMode, Total, TotalCache, TotalKind, count_total, get_total_cache
+from core.query_stats import track_queries
+from models.aircraft import Aircraft
+
+
+@pytest.fixture
+async def fleet(test_session: AsyncSession) -> list[Aircraft]:
+    """Five active aircraft."""
+    aircraft = [
+        Aircraft(registration_number=f"N{number}CT", created_by="test_user")
+        for number in range(1, 6)
+    ]
+    test_session.add_all(aircraft)
+    await test_session.flush()
+    return aircraft
+
+
+ACTIVE = select(Aircraft.id).where(Aircraft.is_active == True)
+
+
+class TestCountTotal:
+    """Tests for count_total."""
+
+    @pytest.mark.parametrize("mode", list(CountMode))
+    async def test_small_totals_are_exact(
+        self, test_session: AsyncSession, fleet: list[Aircraft], mode: CountMode
+    ):
+        """Test every mode counts exactly up to the threshold."""
+        assert await count_total(test_session, ACTIVE, mode, threshold=5) == Total(5)
+
+    @pytest.mark.parametrize(
+        "mode, expected",
+        [
+            (CountMode.EXACT, Total(5)),
+            (CountMode.CAPPED, Total(3, TotalKind.AT_LEAST)),
+        ],
+    )
+    async def test_large_totals(
+        self, test_session: AsyncSession, fleet: list[Aircraft], mode: CountMode, expected: Total
+    ):
+        """Test totals past the threshold follow the mode."""
+        assert await count_total(test_session, ACTIVE, mode, threshold=3) == expected
+
+    async def test_estimate_without_planner_is_capped(
+        self, test_session: AsyncSession, fleet: list[Aircraft]
+    ):
+        """Test estimate mode falls back to capped where there is no planner estimate."""
+        if test_session.get_bind().dialect.name == "postgresql":
+            pytest.skip("PostgreSQL has a planner estimate")
+        total = await count_total(test_session, ACTIVE, CountMode.ESTIMATE, threshold=3)
+        assert total == Total(3, TotalKind.AT_LEAST)
+
+    async def test_large_totals_are_cached(
+        self, test_session: AsyncSession, fleet: list[Aircraft]
+    ):
+        """Test a cached total is returned without a query until the key changes."""
+        assert await count_total(test_session, ACTIVE, threshold=3, cache_key="fleet") == Total(
+            3, TotalKind.AT_LEAST
+        )
+        fleet[0].is_active = False
+        fleet[1].is_active = False
+        await test_session.flush()
+
+        with track_queries() as stats:
+            cached = await count_total(test_session, ACTIVE, threshold=3, cache_key="fleet")
+        assert (cached.kind, stats.count) == (TotalKind.AT_LEAST, 0)
+        assert await count_total(
+            test_session, ACTIVE, CountMode.EXACT, threshold=3, cache_key="fleet"
+        ) == Total(3)
+
+    async def test_exact_totals_are_not_cached(
+        self, test_session: AsyncSession, fleet: list[Aircraft]
+    ):
+        """Test exact totals past the threshold are counted on every call."""
+        assert await count_total(
+            test_session, ACTIVE, CountMode.EXACT, threshold=3, cache_key="fleet"
+        ) == Total(5)
+        fleet[0].is_active = False
+        await test_session.flush()
+
+        assert await count_total(
+            test_session, ACTIVE, CountMode.EXACT, threshold=3, cache_key="fleet"
+        ) == Total(4)
+
+    async def test_small_totals_are_not_cached(
+        self, test_session: AsyncSession, fleet: list[Aircraft]
+    ):
+        """Test totals within the threshold are counted on every call."""
+        hits = get_total_cache().counter.hits
+        assert await count_total(test_session, ACTIVE, threshold=5, cache_key="fleet") == Total(5)
+        fleet[0].is_active = False
+        await test_session.flush()
+
+        assert await count_total(test_session, ACTIVE, threshold=5, cache_key="fleet") == Total(4)
+        assert get_total_cache().counter.hits == hits
+
+
+class TestTotalCache:
+    """Tests for TotalCache."""
+
+    def test_entries_expire(self, monkeypatch):
+        """Test an entry is a miss once its TTL has passed."""
+        clock = iter([100.0, 105.0, 111.0])
+        monkeypatch.setattr("core.counting.time.monotonic", lambda: next(clock))
+        cache = TotalCache(ttl=10)
+
+        cache.put("key", Total(1000, TotalKind.AT_LEAST))
+        assert cache.get("key") == Total(1000, TotalKind.AT_LEAST)
+        assert cache.get("key") is None
+        assert (cache.counter.hits, cache.counter.misses) == (1, 1)
+
+    def test_full_cache_drops_expired_entries(self, monkeypatch):
+        """Test a full cache makes room by dropping expired entries first."""
+        clock = iter([0.0, 5.0, 12.0, 12.0])
+        monkeypatch.setattr("core.counting.time.monotonic", lambda: next(clock))
+        cache = TotalCache(ttl=10, max_entries=2)
+
+        cache.put("old", Total(1))
+        cache.put("recent", Total(2))
+        cache.put("new", Total(3))
+        assert cache.get("recent") == Total(2)
@@ -0,0 +1,59 @@
+"""Integration tests for the bulk data generator on SQLite."""
+
+from sqlalchemy import func, select
+
+from models.work_order import WorkOrder, WorkOrderStatus
+from models.work_order_item import WorkOrderItem
+from perf.db import create_perf_engine, create_schema
+from perf.generate import DataGenerator, GeneratorConfig
+
+
+async def _generate(config: GeneratorConfig):
+    engine = create_perf_engine()
+    try:
+        await create_schema(engine)
+        async with engine.connect() as conn:
+            counts = await DataGenerator(config).run(conn)
+            numbers = (
+                await conn.execute(select(WorkOrder.work_order_number).order_by(WorkOrder.id))
+            ).scalars().all()
+            statuses = dict(
+                (await conn.execute(
+                    select(WorkOrder.status, func.count()).group_by(WorkOrder.status)
+                )).all()
+            )
+            items = (await conn.execute(select(func.count(WorkOrderItem.id)))).scalar_one()
+    finally:
+        await engine.dispose()
+    return counts, numbers, statuses, items
+
+
+class TestDataGenerator:
+    """Tests for DataGenerator."""
+
+    async def test_loads_requested_volume(self):
+        """Test the requested work orders and their items are loaded in batches."""
+        counts, numbers, statuses, items = await _generate(
+            GeneratorConfig(work_orders=2000, cities=4, batch_size=500)
+        )
+
+        assert counts["work_order"] == len(numbers) == 2000
+        assert counts["work_order_item"] == items
+        assert items >= 2000
+        assert len(set(numbers)) == len(numbers)
+
+    async def test_status_distribution_is_skewed_to_closed(self):
+        """Test most generated history is completed, with some open work."""
+        _, _, statuses, _ = await _generate(GeneratorConfig(work_orders=2000, cities=4))
+
+        assert statuses[WorkOrderStatus.COMPLETED] > 1000
+        assert sum(c for s, c in statuses.items() if s.is_open()) > 0
+
+    async def test_same_seed_is_deterministic(self):
+        """Test two runs with the same seed produce identical data."""
+        first = await _generate(GeneratorConfig(work_orders=300, cities=3, seed=7))
+        second = await _generate(GeneratorConfig(work_orders=300, cities=3, seed=7))
+        other = await _generate(GeneratorConfig(work_orders=300, cities=3, seed=8))
+
+        assert first == second
+        assert first[1] != other[1]
@@ -0,0 +1,77 @@
+"""Integration tests for the health probe endpoints."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import Settings, get_settings
+from core.database import get_engine
+from main import app
+
+
+@pytest.fixture
+def probe_engine(test_engine):
+    """Point the readiness probe at the test engine."""
+    app.dependency_overrides[get_engine] = lambda: test_engine
+    return test_engine
+
+
+class TestLiveness:
+    """Tests for GET /health and /health/live."""
+
+    async def test_legacy_health(self, client: AsyncClient):
+        """Test that the legacy health endpoint still responds."""
+        response = await client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+
+    async def test_liveness(self, client: AsyncClient):
+        """Test the liveness probe."""
+        response = await client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+
+class TestReadiness:
+    """Tests for GET /health/ready."""
+
+    async def test_ready(self, client: AsyncClient, probe_engine):
+        """Test that a healthy database reports ready."""
+        response = await client.get("/health/ready")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["status"] == "ready"
+        names = {check["name"] for check in data["checks"]}
+        assert {"event_loop_lag_ms", "pool_checkout_ms", "db_roundtrip_ms"} <= names
+
+    async def test_degraded_over_threshold(self, client: AsyncClient, probe_engine):
+        """Test that a check over its threshold sheds traffic with 503."""
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            readiness_db_latency_ms=-1
+        )
+
+        response = await client.get("/health/ready")
+        assert response.status_code == 503
+
+        data = response.json()
+        assert data["status"] == "degraded"
+        roundtrip = next(c for c in data["checks"] if c["name"] == "db_roundtrip_ms")
+        assert roundtrip["status"] == "degraded"
+
+    async def test_unavailable_when_database_down(self, client: AsyncClient):
+        """Test that a failed database roundtrip reports unavailable."""
+        broken_engine = create_async_engine(
+            "sqlite+aiosqlite:////nonexistent/directory/test.db"
+        )
+        app.dependency_overrides[get_engine] = lambda: broken_engine
+
+        response = await client.get("/health/ready")
+        assert response.status_code == 503
+
+        data = response.json()
+        assert data["status"] == "unavailable"
+        roundtrip = next(c for c in data["checks"] if c["name"] == "db_roundtrip_ms")
+        assert roundtrip["status"] == "failed"
+
+        await broken_engine.dispose()
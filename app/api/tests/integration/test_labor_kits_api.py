@@ -3,6 +3,8 @@
 import pytest
 from uuid import uuid4
 from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.labor_kit import LaborKit
 from models.labor_kit_item import LaborKitItem
@@ -223,6 +225,26 @@ class TestDeleteLaborKit:
         assert response.status_code == 404
         assert response.json()["detail"] == "Labor kit not found"
 
+    async def test_delete_labor_kit_cascades_in_one_statement(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        test_labor_kit_with_items: LaborKit,
+        assert_max_queries,
+    ):
+        """Test items are removed by the database cascade, not per-row deletes."""
+        kit_id = test_labor_kit_with_items.id
+        with assert_max_queries(1):
+            response = await client.delete(
+                f"/api/v1/labor-kits/{test_labor_kit_with_items.uuid}"
+            )
+        assert response.status_code == 204
+
+        remaining = await test_session.scalar(
+            select(func.count(LaborKitItem.id)).where(LaborKitItem.labor_kit_id == kit_id)
+        )
+        assert remaining == 0
+
 
 class TestListLaborKitItems:
     """Tests for GET /api/v1/labor-kits/{kit_id}/items endpoint."""
@@ -0,0 +1,26 @@
+"""Integration test running the load generator against the test app."""
+
+import pytest
+from httpx import AsyncClient
+
+from perf.loadtest import run_load_test
+from models.labor_kit import LaborKit
+from models.work_order import WorkOrder
+
+
+class TestLoadTest:
+    """Tests for run_load_test."""
+
+    async def test_short_run_reports_percentiles(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_labor_kit_with_items: LaborKit,
+    ):
+        """Test a short single-client run exercises every scenario without errors."""
+        report = await run_load_test(client, duration=0.5, concurrency=1)
+
+        assert report["total_requests"] > 0
+        assert report["total_errors"] == 0
+        for name, stats in report["endpoints"].items():
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
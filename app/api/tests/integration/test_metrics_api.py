@@ -0,0 +1,73 @@
+"""Integration tests for the /metrics endpoint."""
+
+import re
+
+import pytest
+from httpx import AsyncClient
+
+from core.coalescing import get_response_coalescer
+from models.work_order import WorkOrder
+
+
+async def series_value(client: AsyncClient, series: str) -> float:
+    """Read one series from /metrics, 0 when it has not been recorded."""
+    response = await client.get("/metrics")
+    match = re.search(rf"^{re.escape(series)} (\S+)$", response.text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class TestMetrics:
+    """Tests for GET /metrics endpoint."""
+
+    async def test_metrics_text_format(self, client: AsyncClient):
+        """Test that metrics are served in Prometheus text format."""
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "http_requests_in_flight" in response.text
+        assert "db_pool_size" in response.text
+
+    async def test_latency_keyed_by_route_template(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test that latency is labelled with the route template, not the raw path."""
+        await client.get(f"/api/v1/work-orders/{test_work_order.uuid}")
+
+        response = await client.get("/metrics")
+        text = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/work-orders/{work_order_id}"}'
+        ) in text
+        assert str(test_work_order.uuid) not in text
+
+    async def test_status_codes_counted(self, client: AsyncClient):
+        """Test that status codes are counted per route, including unmatched paths."""
+        await client.get("/does-not-exist")
+
+        response = await client.get("/metrics")
+        assert 'route="<unmatched>",status="404"' in response.text
+
+    async def test_coalesced_hit_keyed_by_route_template(
+        self, client: AsyncClient, test_work_order: WorkOrder, monkeypatch
+    ):
+        """Test that a request served another's response is labelled with its route."""
+        monkeypatch.setattr(get_response_coalescer(), "ttl_s", 60.0)
+        route_series = (
+            'http_requests_total{method="GET",'
+            'route="/api/v1/work-orders/{work_order_id}",status="200"}'
+        )
+        unmatched_series = 'http_requests_total{method="GET",route="<unmatched>",status="200"}'
+        hits_series = 'cache_hits_total{cache="coalescing"}'
+        routed = await series_value(client, route_series)
+        unmatched = await series_value(client, unmatched_series)
+        hits = await series_value(client, hits_series)
+
+        url = f"/api/v1/work-orders/{test_work_order.uuid}"
+        await client.get(url)
+        await client.get(url)
+
+        assert await series_value(client, hits_series) == hits + 1
+        assert await series_value(client, route_series) == routed + 2
+        assert await series_value(client, unmatched_series) == unmatched
@@ -0,0 +1,127 @@
+"""Integration tests for per-request query accounting."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.query_stats import track_queries
+
+from models.city import City
+from models.work_order import WorkOrder
+from models.work_order_item import WorkOrderItem
+
+
+class TestServerTimingHeader:
+    """Tests for the Server-Timing header added by QueryStatsMiddleware."""
+
+    async def test_header_reports_query_count(
+        self, client: AsyncClient, test_city: City
+    ):
+        """Test that DB time and statement count are reported."""
+        response = await client.get("/api/v1/cities")
+        assert response.status_code == 200
+
+        server_timing = response.headers["server-timing"]
+        assert server_timing.startswith("db;dur=")
+        assert 'desc="' in server_timing
+
+    async def test_header_without_queries(self, client: AsyncClient):
+        """Test that endpoints without DB access report zero queries."""
+        response = await client.get("/")
+        assert response.headers["server-timing"].endswith('desc="0 queries"')
+
+
+class TestTrackQueries:
+    """Tests for statement counting outside the test budgets."""
+
+    async def test_transaction_control_is_counted(
+        self, test_session: AsyncSession, test_city: City
+    ):
+        """Test that SAVEPOINT statements count towards the production total."""
+        with track_queries(keep_statements=True) as stats:
+            async with test_session.begin_nested():
+                await test_session.execute(select(City.id))
+
+        assert any(s.startswith("SAVEPOINT") for s in stats.statements)
+        assert stats.count == len(stats.statements) > 1
+
+
+class TestQueryBudgets:
+    """Upper bounds on statements issued per endpoint."""
+
+    async def test_list_work_orders(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        test_work_order_item: WorkOrderItem,
+        assert_max_queries,
+    ):
+        """Test the work order list query budget."""
+        with assert_max_queries(6):
+            response = await client.get(
+                f"/api/v1/work-orders?city_id={test_city.uuid}"
+            )
+        assert response.status_code == 200
+
+    async def test_get_work_order(
+        self, client: AsyncClient, test_work_order: WorkOrder, assert_max_queries
+    ):
+        """Test the work order detail query budget."""
+        with assert_max_queries(4):
+            response = await client.get(f"/api/v1/work-orders/{test_work_order.uuid}")
+        assert response.status_code == 200
+
+    async def test_list_work_order_items(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+        assert_max_queries,
+    ):
+        """Test the work order item list query budget."""
+        with assert_max_queries(7):
+            response = await client.get(
+                f"/api/v1/work-orders/{test_work_order.uuid}/items"
+            )
+        assert response.status_code == 200
+
+    async def test_update_work_order(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+        assert_max_queries,
+    ):
+        """Test a conditional work order update is a single UPDATE ... RETURNING."""
+        with assert_max_queries(1):
+            response = await client.put(
+                f"/api/v1/work-orders/{test_work_order.uuid}",
+                json={"priority": "high"},
+                headers={"If-Match": '"1"'},
+            )
+        assert response.status_code == 200
+        assert response.json()["item_count"] == 1
+
+    async def test_update_work_order_item(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+        assert_max_queries,
+    ):
+        """Test a work order item update is a single UPDATE ... RETURNING."""
+        with assert_max_queries(1):
+            response = await client.put(
+                f"/api/v1/work-orders/{test_work_order.uuid}/items/{test_work_order_item.uuid}",
+                json={"status": "in_progress"},
+            )
+        assert response.status_code == 200
+
+    async def test_budget_exceeded_fails(
+        self, client: AsyncClient, test_work_order: WorkOrder, assert_max_queries
+    ):
+        """Test that exceeding the budget raises an assertion error."""
+        with pytest.raises(AssertionError, match="Expected at most 0 queries"):
+            with assert_max_queries(0):
+                await client.get(f"/api/v1/work-orders/{test_work_order.uuid}")
@@ -0,0 +1,309 @@
+"""Integration tests for archiving closed work orders."""
+
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from crud.work_order import get_next_sequence_number
+from crud.work_order_archive import archive_work_orders
+from jobs.archive_work_orders import run
+from models.aircraft import Aircraft
+from models.city import City
+from models.work_order import WorkOrder, WorkOrderStatus, PriorityLevel
+from models.work_order_archive import work_order_archive, work_order_item_archive
+from models.work_order_item import WorkOrderItem, WorkOrderItemStatus
+
+YEAR = timedelta(days=365)
+
+
+async def _add_work_order(
+    db: AsyncSession,
+    city: City,
+    aircraft: Aircraft,
+    sequence: int,
+    status: WorkOrderStatus,
+    age: timedelta,
+    items: int = 0,
+) -> WorkOrder:
+    created = datetime.utcnow() - age
+    work_order = WorkOrder(
+        uuid=uuid4(),
+        work_order_number=f"{city.code}{sequence:05d}-01-2024",
+        sequence_number=sequence,
+        city_id=city.id,
+        aircraft_id=aircraft.id,
+        status=status,
+        customer_name="Archive Customer",
+        priority=PriorityLevel.NORMAL,
+        created_by="test_user",
+        completed_date=created + timedelta(days=7) if status.is_terminal() else None,
+        created_at=created,
+        updated_at=created + timedelta(days=7),
+    )
+    db.add(work_order)
+    await db.flush()
+    db.add_all(
+        WorkOrderItem(
+            uuid=uuid4(),
+            work_order_id=work_order.id,
+            city_id=city.id,
+            item_number=number,
+            status=WorkOrderItemStatus.FINISHED,
+            discrepancy=f"Discrepancy {number}",
+            created_by="test_user",
+        )
+        for number in range(1, items + 1)
+    )
+    await db.commit()
+    return work_order
+
+
+@pytest.fixture
+async def test_work_order(test_session: AsyncSession, test_work_order: WorkOrder) -> WorkOrder:
+    """The recent test work order, numbered after the history these tests add."""
+    test_work_order.sequence_number = 100
+    await test_session.commit()
+    return test_work_order
+
+
+@pytest.fixture
+async def archived_work_order(
+    test_session: AsyncSession,
+    test_city: City,
+    test_aircraft: Aircraft,
+    test_work_order: WorkOrder,
+) -> WorkOrder:
+    """A work order closed two years ago, moved to the archive with its items."""
+    work_order = await _add_work_order(
+        test_session, test_city, test_aircraft, 2, WorkOrderStatus.COMPLETED, 2 * YEAR, items=2
+    )
+    assert await archive_work_orders(test_session, YEAR) == (1, 2)
+    await test_session.commit()
+    test_session.expunge_all()
+    return work_order
+
+
+async def _count(db: AsyncSession, table) -> int:
+    return (await db.execute(select(func.count()).select_from(table))).scalar_one()
+
+
+class TestArchiveWorkOrders:
+    """Tests for archive_work_orders."""
+
+    async def test_moves_old_closed_work_orders_with_items(
+        self,
+        test_session: AsyncSession,
+        test_city: City,
+        test_aircraft: Aircraft,
+        test_work_order: WorkOrder,
+    ):
+        """Test old completed and void work orders move with their items; others stay."""
+        completed = await _add_work_order(
+            test_session, test_city, test_aircraft, 2, WorkOrderStatus.COMPLETED, 2 * YEAR, 3
+        )
+        void = await _add_work_order(
+            test_session, test_city, test_aircraft, 3, WorkOrderStatus.VOID, 2 * YEAR
+        )
+        recent = await _add_work_order(
+            test_session, test_city, test_aircraft, 4, WorkOrderStatus.COMPLETED, timedelta(30), 1
+        )
+        still_open = await _add_work_order(
+            test_session, test_city, test_aircraft, 5, WorkOrderStatus.PENDING, 2 * YEAR, 1
+        )
+
+        assert await archive_work_orders(test_session, YEAR) == (2, 3)
+
+        live = (await test_session.execute(select(WorkOrder.id))).scalars().all()
+        assert set(live) == {test_work_order.id, recent.id, still_open.id}
+        archived = (
+            await test_session.execute(select(work_order_archive.c.id))
+        ).scalars().all()
+        assert set(archived) == {completed.id, void.id}
+        assert await _count(test_session, work_order_item_archive) == 3
+        assert await _count(test_session, WorkOrderItem.__table__) == 2
+
+    async def test_archives_newest_work_order_of_city(
+        self, test_session: AsyncSession, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test a city's newest work order is archived once it is old enough."""
+        await _add_work_order(
+            test_session, test_city, test_aircraft, 1, WorkOrderStatus.COMPLETED, 3 * YEAR
+        )
+        await _add_work_order(
+            test_session, test_city, test_aircraft, 7, WorkOrderStatus.COMPLETED, 2 * YEAR
+        )
+
+        assert await archive_work_orders(test_session, YEAR) == (2, 0)
+        assert await _count(test_session, WorkOrder.__table__) == 0
+
+    async def test_sequence_numbers_continue_past_archive(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        test_city: City,
+        test_aircraft: Aircraft,
+        archived_work_order: WorkOrder,
+        test_work_order: WorkOrder,
+    ):
+        """Test numbers held by archived work orders are not reused once live ones are deleted."""
+        archived_sequence = 200
+        await test_session.execute(
+            work_order_archive.update()
+            .where(work_order_archive.c.id == archived_work_order.id)
+            .values(sequence_number=archived_sequence)
+        )
+        await test_session.commit()
+        response = await client.delete(f"/api/v1/work-orders/{test_work_order.uuid}")
+        assert response.status_code == 204
+
+        assert (
+            await get_next_sequence_number(test_session, test_city.id) == archived_sequence + 1
+        )
+        response = await client.post(
+            "/api/v1/work-orders",
+            json={
+                "city_id": str(test_city.uuid),
+                "aircraft_id": str(test_aircraft.uuid),
+                "created_by": "test_user",
+            },
+        )
+        assert response.json()["sequence_number"] == archived_sequence + 1
+
+    async def test_job_archives_in_batches(
+        self,
+        test_connection,
+        test_session: AsyncSession,
+        test_city: City,
+        test_aircraft: Aircraft,
+        test_work_order: WorkOrder,
+    ):
+        """Test the job keeps running batches until none are left."""
+        for sequence in range(2, 7):
+            await _add_work_order(
+                test_session, test_city, test_aircraft, sequence, WorkOrderStatus.VOID, 2 * YEAR
+            )
+        session_factory = async_sessionmaker(
+            bind=test_connection,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        assert await run(session_factory, YEAR, batch_size=2) == (5, 0)
+        assert await _count(test_session, work_order_archive) == 5
+
+
+class TestArchiveReads:
+    """Tests for reading archived work orders through the API."""
+
+    async def test_all_view_includes_archive(
+        self, client: AsyncClient, test_city: City, archived_work_order: WorkOrder
+    ):
+        """Test the unfiltered list shows live and archived work orders."""
+        response = await client.get(f"/api/v1/work-orders?city_id={test_city.uuid}")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total"] == 2
+        archived = next(
+            wo for wo in data["items"] if wo["id"] == str(archived_work_order.uuid)
+        )
+        assert archived["item_count"] == 2
+        assert archived["aircraft"]["registration_number"] == "N12345"
+
+    async def test_status_views(
+        self, client: AsyncClient, test_city: City, archived_work_order: WorkOrder
+    ):
+        """Test closed statuses read the archive and open ones do not."""
+        url = f"/api/v1/work-orders?city_id={test_city.uuid}"
+
+        completed = (await client.get(f"{url}&status=completed")).json()
+        assert [wo["id"] for wo in completed["items"]] == [str(archived_work_order.uuid)]
+
+        created = (await client.get(f"{url}&status=created")).json()
+        assert created["total"] == 1
+        assert created["items"][0]["status"] == "created"
+
+    async def test_search_includes_archive(
+        self, client: AsyncClient, test_city: City, archived_work_order: WorkOrder
+    ):
+        """Test searching the unfiltered list also matches archived work orders."""
+        response = await client.get(
+            f"/api/v1/work-orders?city_id={test_city.uuid}&search=Archive"
+        )
+
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["id"] == str(archived_work_order.uuid)
+
+    async def test_get_archived_work_order(
+        self, client: AsyncClient, archived_work_order: WorkOrder
+    ):
+        """Test an archived work order can still be opened, with its items."""
+        response = await client.get(f"/api/v1/work-orders/{archived_work_order.uuid}")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["work_order_number"] == archived_work_order.work_order_number
+        assert data["status"] == "completed"
+        assert data["item_count"] == 2
+
+    async def test_list_archived_items(
+        self, client: AsyncClient, archived_work_order: WorkOrder
+    ):
+        """Test the items of an archived work order are listed from the archive."""
+        response = await client.get(
+            f"/api/v1/work-orders/{archived_work_order.uuid}/items?sort_order=desc"
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total"] == 2
+        assert [item["item_number"] for item in data["items"]] == [2, 1]
+
+    async def test_get_archived_item(
+        self, client: AsyncClient, archived_work_order: WorkOrder
+    ):
+        """Test an item listed for an archived work order can be fetched by id."""
+        url = f"/api/v1/work-orders/{archived_work_order.uuid}/items"
+        listed = (await client.get(url)).json()["items"][0]
+
+        response = await client.get(f"{url}/{listed['id']}")
+        assert response.status_code == 200
+        assert response.json() == listed
+
+    async def test_clone_archived_work_order(
+        self, client: AsyncClient, archived_work_order: WorkOrder
+    ):
+        """Test an archived work order can be cloned into a live one with its items."""
+        response = await client.post(
+            f"/api/v1/work-orders/{archived_work_order.uuid}:clone",
+            json={"created_by": "planner"},
+        )
+        assert response.status_code == 201
+
+        data = response.json()
+        assert data["sequence_number"] == 101
+        assert data["status"] == "created"
+        assert data["customer_name"] == "Archive Customer"
+        assert data["aircraft"]["registration_number"] == "N12345"
+        assert data["item_count"] == 2
+
+        items = (await client.get(f"/api/v1/work-orders/{data['id']}/items")).json()["items"]
+        assert [(item["item_number"], item["status"]) for item in items] == [
+            (1, "open"),
+            (2, "open"),
+        ]
+
+    async def test_archived_work_order_is_read_only(
+        self, client: AsyncClient, archived_work_order: WorkOrder
+    ):
+        """Test updates do not reach archived work orders."""
+        response = await client.put(
+            f"/api/v1/work-orders/{archived_work_order.uuid}",
+            json={"status_notes": "Reopened"},
+        )
+        assert response.status_code == 404
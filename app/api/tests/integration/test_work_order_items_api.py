@@ -5,6 +5,8 @@ from uuid import uuid4
 from decimal import Decimal
 from httpx import AsyncClient
 
+from models.aircraft import Aircraft
+from models.city import City
 from models.work_order import WorkOrder
 from models.work_order_item import WorkOrderItem, WorkOrderItemStatus
 
@@ -288,6 +290,65 @@ class TestUpdateWorkOrderItem:
         )
         assert response.status_code == 404
 
+    async def test_update_work_order_item_other_work_order(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        test_aircraft: Aircraft,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test an item cannot be updated through a work order it does not belong to."""
+        other = await client.post(
+            "/api/v1/work-orders",
+            json={
+                "city_id": str(test_city.uuid),
+                "aircraft_id": str(test_aircraft.uuid),
+                "created_by": "test_user",
+            },
+        )
+        response = await client.put(
+            f"/api/v1/work-orders/{other.json()['id']}/items/{test_work_order_item.uuid}",
+            json={"status": "in_progress"},
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Work order item not found"
+
+
+class TestWorkOrderItemConcurrency:
+    """Tests for ETags and If-Match compare-and-swap on work order items."""
+
+    async def test_stale_etag_conflicts(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test the second of two edits from the same version returns 412."""
+        url = f"/api/v1/work-orders/{test_work_order.uuid}/items/{test_work_order_item.uuid}"
+        etag = (await client.get(url)).headers["etag"]
+
+        first = await client.put(url, json={"notes": "First"}, headers={"If-Match": etag})
+        assert first.status_code == 200
+        assert first.headers["etag"] == '"2"'
+
+        second = await client.put(url, json={"notes": "Second"}, headers={"If-Match": etag})
+        assert second.status_code == 412
+        assert (await client.get(url)).json()["notes"] == "First"
+
+    async def test_batch_update_bumps_version(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test items updated through a batch get a new version."""
+        response = await client.post(
+            f"/api/v1/work-orders/{test_work_order.uuid}/items:batch",
+            json={"update": [{"id": str(test_work_order_item.uuid), "notes": "Batched"}]},
+        )
+        assert response.status_code == 200
+        assert response.json()["updated"][0]["version"] == 2
+
 
 class TestDeleteWorkOrderItem:
     """Tests for DELETE /api/v1/work-orders/{work_order_id}/items/{item_id} endpoint."""
@@ -335,3 +396,152 @@ class TestDeleteWorkOrderItem:
             f"/api/v1/work-orders/{test_work_order.uuid}/items/{fake_item_id}"
         )
         assert response.status_code == 404
+
+
+class TestBatchWorkOrderItems:
+    """Tests for POST /api/v1/work-orders/{work_order_id}/items:batch endpoint."""
+
+    async def test_batch_create_update_delete(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test creates, updates and deletes are applied together."""
+        base = f"/api/v1/work-orders/{test_work_order.uuid}/items"
+        second = (
+            await client.post(base, json={"discrepancy": "Second", "created_by": "test_user"})
+        ).json()
+
+        response = await client.post(
+            f"{base}:batch",
+            json={
+                "create": [
+                    {"discrepancy": "Third", "created_by": "tech"},
+                    {"discrepancy": "Fourth", "hours_estimate": "1.5", "created_by": "tech"},
+                ],
+                "update": [
+                    {
+                        "id": str(test_work_order_item.uuid),
+                        "status": "finished",
+                        "updated_by": "tech",
+                    },
+                ],
+                "delete": [second["id"]],
+            },
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [(i["item_number"], i["discrepancy"]) for i in data["created"]] == [
+            (3, "Third"),
+            (4, "Fourth"),
+        ]
+        assert data["created"][1]["hours_estimate"] == "1.50"
+        assert data["updated"][0]["status"] == "finished"
+        assert data["updated"][0]["discrepancy"] == test_work_order_item.discrepancy
+        assert data["deleted"] == [second["id"]]
+
+        listed = (await client.get(base)).json()
+        assert [i["item_number"] for i in listed["items"]] == [1, 3, 4]
+
+    async def test_batch_updates_with_different_fields(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test patches only touch the fields each one sets."""
+        base = f"/api/v1/work-orders/{test_work_order.uuid}/items"
+        created = (
+            await client.post(
+                f"{base}:batch",
+                json={
+                    "create": [
+                        {"discrepancy": "A", "notes": "keep", "created_by": "tech"},
+                        {"discrepancy": "B", "notes": "keep", "created_by": "tech"},
+                    ]
+                },
+            )
+        ).json()["created"]
+
+        response = await client.post(
+            f"{base}:batch",
+            json={
+                "update": [
+                    {"id": created[0]["id"], "discrepancy": "A2"},
+                    {"id": created[1]["id"], "notes": None},
+                ]
+            },
+        )
+        updated = {i["id"]: i for i in response.json()["updated"]}
+        assert (updated[created[0]["id"]]["discrepancy"], updated[created[0]["id"]]["notes"]) == (
+            "A2",
+            "keep",
+        )
+        assert (updated[created[1]["id"]]["discrepancy"], updated[created[1]["id"]]["notes"]) == (
+            "B",
+            None,
+        )
+
+    async def test_batch_rejects_foreign_item(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test an unknown item fails the whole batch without applying anything."""
+        base = f"/api/v1/work-orders/{test_work_order.uuid}/items"
+        response = await client.post(
+            f"{base}:batch",
+            json={
+                "create": [{"discrepancy": "New", "created_by": "tech"}],
+                "delete": [str(test_work_order_item.uuid), str(uuid4())],
+            },
+        )
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"]
+
+        listed = (await client.get(base)).json()
+        assert listed["total"] == 1
+
+    async def test_batch_rejects_item_referenced_twice(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test an item cannot be both updated and deleted."""
+        item_id = str(test_work_order_item.uuid)
+        response = await client.post(
+            f"/api/v1/work-orders/{test_work_order.uuid}/items:batch",
+            json={"update": [{"id": item_id, "notes": "x"}], "delete": [item_id]},
+        )
+        assert response.status_code == 400
+        assert "more than once" in response.json()["detail"]
+
+    async def test_batch_work_order_not_found(self, client: AsyncClient):
+        """Test batch on a non-existent work order returns 404."""
+        response = await client.post(
+            f"/api/v1/work-orders/{uuid4()}/items:batch",
+            json={"create": [{"discrepancy": "New", "created_by": "tech"}]},
+        )
+        assert response.status_code == 404
+
+    async def test_batch_query_count_is_constant(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+        assert_max_queries,
+    ):
+        """Test the statement count does not grow with the batch size."""
+        # Work order, items, item numbers, delete, update, re-select, insert
+        with assert_max_queries(7):
+            response = await client.post(
+                f"/api/v1/work-orders/{test_work_order.uuid}/items:batch",
+                json={
+                    "create": [
+                        {"discrepancy": f"Task {n}", "created_by": "tech"} for n in range(50)
+                    ],
+                    "update": [{"id": str(test_work_order_item.uuid), "notes": "done"}],
+                },
+            )
+        assert len(response.json()["created"]) == 50
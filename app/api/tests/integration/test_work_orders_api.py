@@ -1,12 +1,18 @@
 """Integration tests for the Work Orders API endpoints."""
 
+import asyncio
 import pytest
 from uuid import uuid4
 from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import counting
+from core.config import Settings
 from models.city import City
 from models.aircraft import Aircraft
 from models.work_order import WorkOrder, WorkOrderStatus, PriorityLevel
+from models.work_order_item import WorkOrderItem
 
 
 class TestListWorkOrders:
@@ -98,6 +104,158 @@ class TestListWorkOrders:
         data = response.json()
         assert data["total"] == 1
 
+    async def test_list_work_orders_total_kind(
+        self, client: AsyncClient, test_city: City, test_work_order: WorkOrder
+    ):
+        """Test a small list reports an exact total."""
+        response = await client.get(f"/api/v1/work-orders?city_id={test_city.uuid}")
+
+        data = response.json()
+        assert (data["total"], data["total_kind"]) == (1, "exact")
+
+    async def test_concurrent_identical_lists_coalesced(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        test_work_order: WorkOrder,
+        count_queries,
+    ):
+        """Test identical concurrent list requests query the database once."""
+        url = f"/api/v1/work-orders?city_id={test_city.uuid}&page=1"
+        with count_queries() as single:
+            await client.get(url)
+
+        with count_queries() as concurrent:
+            responses = await asyncio.gather(*(client.get(url) for _ in range(5)))
+        assert len(concurrent) == len(single)
+        assert len({response.content for response in responses}) == 1
+        assert all("server-timing" in response.headers for response in responses)
+
+    @pytest.mark.parametrize(
+        "count, expected",
+        [("capped", (1, "at_least")), ("exact", (2, "exact")), (None, (2, "exact"))],
+    )
+    async def test_list_work_orders_large_total(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        test_aircraft: Aircraft,
+        test_work_order: WorkOrder,
+        monkeypatch,
+        count: str | None,
+        expected: tuple,
+    ):
+        """Test totals past the exact threshold follow the count mode, exact by default."""
+        monkeypatch.setattr(counting, "get_settings", lambda: Settings(count_exact_threshold=1))
+        await client.post(
+            "/api/v1/work-orders",
+            json={
+                "city_id": str(test_city.uuid),
+                "aircraft_id": str(test_aircraft.uuid),
+                "created_by": "test_user",
+            },
+        )
+
+        params = {"city_id": str(test_city.uuid), "page_size": 1}
+        if count is not None:
+            params["count"] = count
+        response = await client.get("/api/v1/work-orders", params=params)
+        data = response.json()
+        assert (data["total"], data["total_kind"]) == expected
+        assert len(data["items"]) == 1
+
+
+class TestWorkOrderViews:
+    """Tests for the saved list views and their filters."""
+
+    @pytest.fixture
+    async def view_work_orders(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ) -> dict[str, str]:
+        """Work orders and quotes, open and closed, for two technicians."""
+        numbers = {}
+        for name, work_order_type, status, technician in [
+            ("mine_open", "work_order", "in_progress", "A. Rivera"),
+            ("mine_closed", "work_order", "completed", "A. Rivera"),
+            ("other_open", "work_order", "pending", "B. Chen"),
+            ("quote_open", "quote", "created", "B. Chen"),
+            ("quote_void", "quote", "void", "A. Rivera"),
+        ]:
+            response = await client.post(
+                "/api/v1/work-orders",
+                json={
+                    "city_id": str(test_city.uuid),
+                    "aircraft_id": str(test_aircraft.uuid),
+                    "work_order_type": work_order_type,
+                    "status": status,
+                    "lead_technician": technician,
+                    "created_by": "test_user",
+                },
+            )
+            numbers[response.json()["work_order_number"]] = name
+        return numbers
+
+    async def list_names(self, client: AsyncClient, city: City, numbers: dict, query: str):
+        response = await client.get(f"/api/v1/work-orders?city_id={city.uuid}&{query}")
+        assert response.status_code == 200
+        return {numbers[wo["work_order_number"]] for wo in response.json()["items"]}
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("view=my_open_items&lead_technician=A.%20Rivera", {"mine_open"}),
+            ("view=open", {"mine_open", "other_open", "quote_open"}),
+            (
+                "view=all",
+                {"mine_open", "mine_closed", "other_open", "quote_open", "quote_void"},
+            ),
+            ("view=open_quotes", {"quote_open"}),
+            ("view=all_quotes", {"quote_open", "quote_void"}),
+        ],
+    )
+    async def test_views(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        view_work_orders: dict,
+        query: str,
+        expected: set[str],
+    ):
+        """Test each saved view lists exactly its work orders."""
+        assert await self.list_names(client, test_city, view_work_orders, query) == expected
+
+    async def test_multiple_statuses(
+        self, client: AsyncClient, test_city: City, view_work_orders: dict
+    ):
+        """Test repeating status lists work orders in any of them."""
+        names = await self.list_names(
+            client, test_city, view_work_orders, "status=completed&status=void"
+        )
+        assert names == {"mine_closed", "quote_void"}
+
+    async def test_filters_combine_with_view(
+        self, client: AsyncClient, test_city: City, view_work_orders: dict
+    ):
+        """Test explicit filters narrow a view further."""
+        names = await self.list_names(
+            client, test_city, view_work_orders, "view=open&work_order_type=work_order"
+        )
+        assert names == {"mine_open", "other_open"}
+
+    async def test_my_open_items_requires_lead_technician(
+        self, client: AsyncClient, test_city: City
+    ):
+        """Test the mine-only view is rejected without a technician."""
+        response = await client.get(
+            f"/api/v1/work-orders?city_id={test_city.uuid}&view=my_open_items"
+        )
+        assert response.status_code == 400
+
+    async def test_unknown_view(self, client: AsyncClient, test_city: City):
+        """Test an unknown view name is a validation error."""
+        response = await client.get(f"/api/v1/work-orders?city_id={test_city.uuid}&view=mine")
+        assert response.status_code == 422
+
 
 class TestCreateWorkOrder:
     """Tests for POST /api/v1/work-orders endpoint."""
@@ -320,6 +478,75 @@ class TestUpdateWorkOrder:
         )
         assert response.status_code == 404
 
+    async def test_update_closed_work_order_status_conflicts(
+        self, client: AsyncClient, test_session: AsyncSession, test_work_order: WorkOrder
+    ):
+        """Test a closed work order cannot be closed again with another status."""
+        test_work_order.status = WorkOrderStatus.COMPLETED
+        await test_session.commit()
+        # The refused update rolls back and expires the fixture
+        url = f"/api/v1/work-orders/{test_work_order.uuid}"
+        original_customer = test_work_order.customer_name
+
+        response = await client.put(url, json={"status": "void", "customer_name": "Voided"})
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Cannot move from completed to void"
+
+        response = await client.get(url)
+        assert (response.json()["status"], response.json()["customer_name"]) == (
+            "completed",
+            original_customer,
+        )
+
+    async def test_update_work_order_completion_sets_completed_date(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test completing a work order sets completed_date, and keeping the status keeps it."""
+        url = f"/api/v1/work-orders/{test_work_order.uuid}"
+
+        response = await client.put(url, json={"status": "completed"})
+        assert response.status_code == 200
+        completed_date = response.json()["completed_date"]
+        assert completed_date is not None
+
+        response = await client.put(url, json={"status": "completed", "status_notes": "Signed off"})
+        assert response.json()["completed_date"] == completed_date
+
+    async def test_update_work_order_completed_date_from_client(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test a completed date sent with the status is kept as sent."""
+        response = await client.put(
+            f"/api/v1/work-orders/{test_work_order.uuid}",
+            json={"status": "completed", "completed_date": "2026-01-15T08:30:00"},
+        )
+        assert response.json()["completed_date"] == "2026-01-15T08:30:00"
+
+    async def test_update_closed_work_order_reopen(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test a closed work order can be reopened, which clears its completed date."""
+        url = f"/api/v1/work-orders/{test_work_order.uuid}"
+        await client.put(url, json={"status": "completed"})
+
+        response = await client.put(url, json={"status": "open"})
+        assert response.status_code == 200
+        assert (response.json()["status"], response.json()["completed_date"]) == ("open", None)
+
+    async def test_update_closed_work_order_keeping_status(
+        self, client: AsyncClient, test_session: AsyncSession, test_work_order: WorkOrder
+    ):
+        """Test a closed work order can be edited while its status is unchanged."""
+        test_work_order.status = WorkOrderStatus.VOID
+        await test_session.commit()
+
+        response = await client.put(
+            f"/api/v1/work-orders/{test_work_order.uuid}",
+            json={"status": "void", "status_notes": "Customer cancelled"},
+        )
+        assert response.status_code == 200
+        assert response.json()["status_notes"] == "Customer cancelled"
+
     async def test_update_work_order_partial(
         self, client: AsyncClient, test_work_order: WorkOrder
     ):
@@ -336,6 +563,206 @@ class TestUpdateWorkOrder:
         assert data["status"] == "open"
         assert data["customer_name"] == original_customer
 
+    async def test_update_work_order_returns_briefs(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        test_aircraft: Aircraft,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test the update response carries the city, aircraft and item count."""
+        response = await client.put(
+            f"/api/v1/work-orders/{test_work_order.uuid}", json={"priority": "high"}
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["city"] == {
+            "id": str(test_city.uuid),
+            "code": test_city.code,
+            "name": test_city.name,
+        }
+        assert data["aircraft"]["id"] == str(test_aircraft.uuid)
+        assert data["aircraft"]["registration_number"] == test_aircraft.registration_number
+        assert data["item_count"] == 1
+
+    async def test_update_work_order_unknown_aircraft(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test pointing a work order at a non-existent aircraft returns 400."""
+        response = await client.put(
+            f"/api/v1/work-orders/{test_work_order.uuid}",
+            json={"aircraft_id": str(uuid4())},
+        )
+        assert response.status_code == 400
+        assert "Aircraft not found" in response.json()["detail"]
+
+
+class TestWorkOrderConcurrency:
+    """Tests for ETags and If-Match compare-and-swap on work orders."""
+
+    async def test_get_serves_version_as_etag(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test the detail response carries the row version as its ETag."""
+        response = await client.get(f"/api/v1/work-orders/{test_work_order.uuid}")
+        assert response.headers["etag"] == '"1"'
+        assert response.json()["version"] == 1
+
+    async def test_update_with_current_etag(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test a matching If-Match applies and returns the bumped ETag."""
+        response = await client.put(
+            f"/api/v1/work-orders/{test_work_order.uuid}",
+            json={"priority": "high"},
+            headers={"If-Match": '"1"'},
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"2"'
+        assert response.json()["version"] == 2
+
+    async def test_update_with_stale_etag_conflicts(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test a stale If-Match returns 412 and leaves the other edit in place."""
+        url = f"/api/v1/work-orders/{test_work_order.uuid}"
+        first = await client.put(
+            url, json={"customer_name": "First"}, headers={"If-Match": '"1"'}
+        )
+        assert first.status_code == 200
+
+        second = await client.put(
+            url, json={"customer_name": "Second"}, headers={"If-Match": '"1"'}
+        )
+        assert second.status_code == 412
+        assert second.headers["etag"] == '"2"'
+        assert (await client.get(url)).json()["customer_name"] == "First"
+
+    async def test_update_without_if_match_still_bumps_version(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test unconditional updates keep working and invalidate old ETags."""
+        url = f"/api/v1/work-orders/{test_work_order.uuid}"
+        await client.put(url, json={"priority": "high"})
+        response = await client.put(url, json={"priority": "low"}, headers={"If-Match": '"1"'})
+        assert response.status_code == 412
+
+    async def test_update_missing_work_order_with_if_match(self, client: AsyncClient):
+        """Test a conditional update of a missing work order is still a 404."""
+        response = await client.put(
+            f"/api/v1/work-orders/{uuid4()}", json={"priority": "high"}, headers={"If-Match": '"1"'}
+        )
+        assert response.status_code == 404
+
+    async def test_transition_bumps_version(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test a bulk status transition invalidates the ETag too."""
+        await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": [str(test_work_order.uuid)], "status": "open", "updated_by": "lead"},
+        )
+        response = await client.get(f"/api/v1/work-orders/{test_work_order.uuid}")
+        assert response.headers["etag"] == '"2"'
+
+
+class TestCopyWorkOrders:
+    """Tests for POST /api/v1/work-orders/{id}:clone and :convert endpoints."""
+
+    async def test_clone_copies_items_under_new_number(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test a clone gets the next sequence number and copies of every item."""
+        await client.put(
+            f"/api/v1/work-orders/{test_work_order.uuid}/items/{test_work_order_item.uuid}",
+            json={"status": "finished"},
+        )
+        response = await client.post(
+            f"/api/v1/work-orders/{test_work_order.uuid}:clone",
+            json={"created_by": "planner", "due_date": "2027-03-01"},
+        )
+        assert response.status_code == 201
+
+        data = response.json()
+        assert data["id"] != str(test_work_order.uuid)
+        assert data["sequence_number"] == 2
+        assert data["work_order_number"].startswith("KTYS00002-")
+        assert data["status"] == "created"
+        assert data["work_order_type"] == "work_order"
+        assert data["customer_name"] == "Test Customer"
+        assert data["customer_po_number"] is None
+        assert data["due_date"] == "2027-03-01"
+        assert data["created_by"] == "planner"
+        assert data["item_count"] == 1
+
+        items = (await client.get(f"/api/v1/work-orders/{data['id']}/items")).json()["items"]
+        assert len(items) == 1
+        assert items[0]["id"] != str(test_work_order_item.uuid)
+        assert items[0]["status"] == "open"
+        assert items[0]["discrepancy"] == "Test discrepancy"
+        assert items[0]["corrective_action"] == "Test corrective action"
+        assert items[0]["created_by"] == "planner"
+
+    async def test_clone_uses_three_statements(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+        assert_max_queries,
+    ):
+        """Test the copy is a source lookup plus one INSERT ... SELECT per table."""
+        with assert_max_queries(3):
+            response = await client.post(
+                f"/api/v1/work-orders/{test_work_order.uuid}:clone",
+                json={"created_by": "planner"},
+            )
+        assert response.status_code == 201
+
+    async def test_clone_not_found(self, client: AsyncClient):
+        """Test cloning a non-existent work order returns 404."""
+        response = await client.post(
+            f"/api/v1/work-orders/{uuid4()}:clone", json={"created_by": "planner"}
+        )
+        assert response.status_code == 404
+
+    async def test_convert_quote(
+        self,
+        client: AsyncClient,
+        test_work_order: WorkOrder,
+        test_work_order_item: WorkOrderItem,
+    ):
+        """Test converting a quote creates a work order and leaves the quote alone."""
+        quote_url = f"/api/v1/work-orders/{test_work_order.uuid}"
+        await client.put(quote_url, json={"work_order_type": "quote"})
+
+        response = await client.post(
+            f"{quote_url}:convert",
+            json={"created_by": "sales", "customer_po_number": "PO-APPROVED"},
+        )
+        assert response.status_code == 201
+
+        data = response.json()
+        assert data["work_order_type"] == "work_order"
+        assert data["customer_po_number"] == "PO-APPROVED"
+        assert data["item_count"] == 1
+        assert (await client.get(quote_url)).json()["work_order_type"] == "quote"
+
+    async def test_convert_requires_quote(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test converting something that is not a quote returns 400."""
+        response = await client.post(
+            f"/api/v1/work-orders/{test_work_order.uuid}:convert",
+            json={"created_by": "sales"},
+        )
+        assert response.status_code == 400
+        assert "is not a quote" in response.json()["detail"]
+
 
 class TestDeleteWorkOrder:
     """Tests for DELETE /api/v1/work-orders/{work_order_id} endpoint."""
@@ -366,3 +793,325 @@ class TestDeleteWorkOrder:
         fake_id = uuid4()
         response = await client.delete(f"/api/v1/work-orders/{fake_id}")
         assert response.status_code == 404
+
+    async def test_delete_work_order_cascades_in_one_statement(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        test_work_order: WorkOrder,
+        assert_max_queries,
+    ):
+        """Test deleting a large work order is one DELETE; the database removes its items."""
+        work_order_id = test_work_order.id
+        await client.post(
+            f"/api/v1/work-orders/{test_work_order.uuid}/items:batch",
+            json={
+                "create": [
+                    {"discrepancy": f"Task {n}", "created_by": "test_user"} for n in range(500)
+                ]
+            },
+        )
+
+        with assert_max_queries(1):
+            response = await client.delete(f"/api/v1/work-orders/{test_work_order.uuid}")
+        assert response.status_code == 204
+
+        remaining = await test_session.scalar(
+            select(func.count(WorkOrderItem.id)).where(
+                WorkOrderItem.work_order_id == work_order_id
+            )
+        )
+        assert remaining == 0
+
+
+class TestImportWorkOrders:
+    """Tests for POST /api/v1/work-orders/import endpoint."""
+
+    async def test_import_ndjson(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test importing NDJSON rows with historical dates."""
+        body = "\n".join(
+            [
+                '{"city_code": "KTYS", "aircraft_registration": "N12345", '
+                '"status": "completed", "created_date": "2024-03-05T10:00:00Z", '
+                '"completed_date": "2024-03-09T16:00:00Z"}',
+                "",
+                '{"city_code": "KTYS", "aircraft_registration": "N12345", "priority": "high"}',
+            ]
+        )
+        response = await client.post(
+            "/api/v1/work-orders/import?created_by=importer",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"received": 2, "imported": 2, "failed": 0, "errors": []}
+
+        listed = await client.get(
+            f"/api/v1/work-orders?city_id={test_city.uuid}&sort_by=work_order_number&sort_order=asc"
+        )
+        items = listed.json()["items"]
+        assert [wo["sequence_number"] for wo in items] == [1, 2]
+        assert items[0]["work_order_number"] == "KTYS00001-03-2024"
+        assert items[0]["status"] == "completed"
+        assert items[0]["created_by"] == "importer"
+        assert items[1]["priority"] == "high"
+
+    async def test_import_csv(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test importing CSV rows; empty cells fall back to defaults."""
+        body = (
+            "city_code,aircraft_registration,customer_name,priority,created_by\n"
+            "KTYS,N12345,Acme Aviation,,alice\n"
+            "KTYS,N12345,,urgent,\n"
+        )
+        response = await client.post(
+            "/api/v1/work-orders/import?created_by=importer",
+            content=body,
+            headers={"Content-Type": "text/csv; charset=utf-8"},
+        )
+        assert response.status_code == 200
+        assert response.json()["imported"] == 2
+
+        listed = await client.get(
+            f"/api/v1/work-orders?city_id={test_city.uuid}&sort_by=work_order_number&sort_order=asc"
+        )
+        items = listed.json()["items"]
+        assert (items[0]["customer_name"], items[0]["priority"], items[0]["created_by"]) == (
+            "Acme Aviation",
+            "normal",
+            "alice",
+        )
+        assert (items[1]["customer_name"], items[1]["priority"], items[1]["created_by"]) == (
+            None,
+            "urgent",
+            "importer",
+        )
+
+    async def test_import_continues_after_row_errors(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test bad rows are reported by line while the rest are imported."""
+        body = "\n".join(
+            [
+                '{"city_code": "KTYS", "aircraft_registration": "N12345"}',
+                "{not json",
+                '{"city_code": "KXXX", "aircraft_registration": "N12345"}',
+                '{"city_code": "KTYS", "aircraft_registration": "N99999"}',
+                '{"city_code": "KTYS", "aircraft_registration": "N12345", "status": "bogus"}',
+                '{"city_code": "KTYS", "aircraft_registration": "N12345"}',
+            ]
+        )
+        response = await client.post(
+            "/api/v1/work-orders/import?created_by=importer",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert (data["received"], data["imported"], data["failed"]) == (6, 2, 4)
+        errors = {e["line"]: e["error"] for e in data["errors"]}
+        assert errors[2].startswith("Invalid JSON")
+        assert errors[3] == "City not found: KXXX"
+        assert errors[4] == "Aircraft not found: N99999"
+        assert errors[5].startswith("status:")
+
+        # Numbering continues after the existing work order
+        listed = await client.get(
+            f"/api/v1/work-orders?city_id={test_work_order.city.uuid}"
+            "&sort_by=work_order_number&sort_order=asc"
+        )
+        assert [wo["sequence_number"] for wo in listed.json()["items"]] == [1, 2, 3]
+
+    async def test_import_reports_rows_rejected_by_database(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        test_work_order: WorkOrder,
+    ):
+        """Test a conflicting row is isolated so the rest of its chunk still imports."""
+        test_work_order.work_order_number = "KTYS00002-03-2024"
+        await test_session.commit()
+
+        row = (
+            '{"city_code": "KTYS", "aircraft_registration": "N12345", '
+            '"created_date": "2024-03-05"}'
+        )
+        response = await client.post(
+            "/api/v1/work-orders/import?created_by=importer",
+            content=f"{row}\n{row}",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        data = response.json()
+        assert (data["imported"], data["failed"]) == (1, 1)
+        assert data["errors"][0]["line"] == 1
+        assert data["errors"][0]["error"].startswith("Could not insert")
+
+    async def test_import_rejects_oversized_values(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test values longer than their column are rejected per row before the insert."""
+        rows = [
+            '{"city_code": "KTYS", "aircraft_registration": "N12345", '
+            f'"customer_name": "{"X" * 201}"}}',
+            '{"city_code": "KTYS", "aircraft_registration": "N12345", '
+            f'"customer_po_number": "{"9" * 51}"}}',
+            '{"city_code": "KTYS", "aircraft_registration": "N12345"}',
+        ]
+        response = await client.post(
+            "/api/v1/work-orders/import?created_by=importer",
+            content="\n".join(rows),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        data = response.json()
+        assert (data["imported"], data["failed"]) == (1, 2)
+        errors = {e["line"]: e["error"] for e in data["errors"]}
+        assert errors[1].startswith("customer_name:")
+        assert errors[2].startswith("customer_po_number:")
+
+    async def test_import_uses_batched_queries(
+        self,
+        client: AsyncClient,
+        test_city: City,
+        test_aircraft: Aircraft,
+        assert_max_queries,
+    ):
+        """Test the statement count does not grow with the number of rows."""
+        body = "\n".join(
+            '{"city_code": "KTYS", "aircraft_registration": "N12345"}' for _ in range(50)
+        )
+        # City lookup, aircraft lookup, sequence block, one INSERT
+        with assert_max_queries(4):
+            response = await client.post(
+                "/api/v1/work-orders/import?created_by=importer",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+        assert response.json()["imported"] == 50
+
+    async def test_import_unsupported_content_type(self, client: AsyncClient):
+        """Test a JSON array upload is rejected with 415."""
+        response = await client.post(
+            "/api/v1/work-orders/import?created_by=importer",
+            json=[{"city_code": "KTYS"}],
+        )
+        assert response.status_code == 415
+
+
+class TestTransitionWorkOrders:
+    """Tests for POST /api/v1/work-orders:transition endpoint."""
+
+    async def create_work_orders(self, client: AsyncClient, city: City, aircraft: Aircraft, n: int):
+        ids = []
+        for _ in range(n):
+            response = await client.post(
+                "/api/v1/work-orders",
+                json={
+                    "city_id": str(city.uuid),
+                    "aircraft_id": str(aircraft.uuid),
+                    "status": "in_review",
+                    "created_by": "test_user",
+                },
+            )
+            ids.append(response.json()["id"])
+        return ids
+
+    async def test_transition_to_completed(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft, assert_max_queries
+    ):
+        """Test work orders are completed in one statement with a completed date."""
+        ids = await self.create_work_orders(client, test_city, test_aircraft, 3)
+
+        with assert_max_queries(1):
+            response = await client.post(
+                "/api/v1/work-orders:transition",
+                json={"ids": ids, "status": "completed", "updated_by": "admin"},
+            )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["rejected"] == []
+        assert sorted(wo["id"] for wo in data["updated"]) == sorted(ids)
+        assert all(wo["status"] == "completed" for wo in data["updated"])
+        assert all(wo["completed_date"] is not None for wo in data["updated"])
+
+        detail = (await client.get(f"/api/v1/work-orders/{ids[0]}")).json()
+        assert (detail["status"], detail["updated_by"]) == ("completed", "admin")
+
+    async def test_non_terminal_transition_keeps_completed_date_empty(
+        self, client: AsyncClient, test_work_order: WorkOrder
+    ):
+        """Test moving between open statuses does not set a completed date."""
+        response = await client.post(
+            "/api/v1/work-orders:transition",
+            json={
+                "ids": [str(test_work_order.uuid)],
+                "status": "in_progress",
+                "status_notes": "Started",
+                "updated_by": "admin",
+            },
+        )
+        updated = response.json()["updated"][0]
+        assert (updated["status"], updated["completed_date"]) == ("in_progress", None)
+
+    async def test_transition_reopens_closed_work_orders(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test closed work orders can be reopened in bulk, clearing their completed date."""
+        ids = await self.create_work_orders(client, test_city, test_aircraft, 2)
+        await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": ids, "status": "completed", "updated_by": "admin"},
+        )
+
+        response = await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": ids, "status": "in_progress", "updated_by": "admin"},
+        )
+        data = response.json()
+        assert data["rejected"] == []
+        assert [(wo["status"], wo["completed_date"]) for wo in data["updated"]] == [
+            ("in_progress", None),
+            ("in_progress", None),
+        ]
+
+    async def test_transition_rejects_disallowed_moves(
+        self, client: AsyncClient, test_city: City, test_aircraft: Aircraft
+    ):
+        """Test closed, unchanged and unknown work orders are reported and left alone."""
+        ids = await self.create_work_orders(client, test_city, test_aircraft, 3)
+        await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": ids[:1], "status": "void", "updated_by": "admin"},
+        )
+        await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": ids[1:2], "status": "completed", "updated_by": "admin"},
+        )
+        missing = str(uuid4())
+
+        response = await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": ids + [missing], "status": "completed", "updated_by": "admin"},
+        )
+        data = response.json()
+        assert [wo["id"] for wo in data["updated"]] == [ids[2]]
+        assert {e["id"]: e["error"] for e in data["rejected"]} == {
+            ids[0]: "Cannot move from void to completed",
+            ids[1]: "Work order is already completed",
+            missing: "Work order not found",
+        }
+
+        voided = (await client.get(f"/api/v1/work-orders/{ids[0]}")).json()
+        assert voided["status"] == "void"
+
+    async def test_transition_requires_ids(self, client: AsyncClient):
+        """Test an empty id list is a validation error."""
+        response = await client.post(
+            "/api/v1/work-orders:transition",
+            json={"ids": [], "status": "completed", "updated_by": "admin"},
+        )
+        assert response.status_code == 422
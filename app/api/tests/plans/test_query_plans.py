@@ -0,0 +1,343 @@
+"""
+Query plan tests for the hot read paths.
+
+Each case runs a crud function against PostgreSQL, captures every statement it
+issues and runs ``EXPLAIN (FORMAT JSON)`` on it with the same parameters. Plans
+are checked for properties (no sequential scan on the large tables, expected
+index usage) and compared to reviewable snapshots in ``snapshots/``.
+
+Costs and row estimates are left out of the snapshots so they only change when
+the plan shape does. work_order and work_order_item are partitioned by city, so
+partitions and their indexes are reported under the parent's name; snapshots
+then do not depend on city ids. Regenerate them after an intentional change with:
+
+    UPDATE_PLAN_SNAPSHOTS=1 pytest tests/plans
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+from core.slow_query_log import normalize_sql
+from crud.dashboard import get_open_work_order_counts_by_city
+from crud.work_order import is_open
+from models.city import City
+from models.work_order import WorkOrder
+from models.work_order_item import WorkOrderItem
+from schemas.work_order import WorkOrderView
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL is not set"
+)
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+UPDATE_SNAPSHOTS = os.environ.get("UPDATE_PLAN_SNAPSHOTS") == "1"
+
+# Tables large enough that a sequential scan is always a regression
+LARGE_TABLES = {
+    "work_order",
+    "work_order_item",
+    "work_order_archive",
+    "work_order_item_archive",
+}
+
+
+@dataclass
+class PlanCase:
+    """A crud call whose statements are explained."""
+
+    name: str
+    call: Callable[[AsyncSession, dict], Awaitable[object]]
+    # Indexes that must appear in the plans; each entry lists acceptable name prefixes
+    expected_indexes: list[tuple[str, ...]]
+
+
+CASES = [
+    PlanCase(
+        "get_work_orders",
+        lambda db, ids: crud.get_work_orders(db, ids["city_uuid"]),
+        [("idx_work_order_city",)],
+    ),
+    PlanCase(
+        "get_work_orders_search",
+        lambda db, ids: crud.get_work_orders(db, ids["city_uuid"], search="N12"),
+        [("idx_work_order_city",)],
+    ),
+    PlanCase(
+        "get_work_orders_open",
+        lambda db, ids: crud.get_work_orders(db, ids["city_uuid"], view=WorkOrderView.OPEN),
+        [("idx_work_order_open_city_created_at",)],
+    ),
+    PlanCase(
+        "get_work_orders_my_open_items",
+        lambda db, ids: crud.get_work_orders(
+            db,
+            ids["city_uuid"],
+            view=WorkOrderView.MY_OPEN_ITEMS,
+            lead_technician=ids["lead_technician"],
+        ),
+        [("idx_work_order_open_lead_technician",)],
+    ),
+    PlanCase(
+        "get_work_orders_open_quotes",
+        lambda db, ids: crud.get_work_orders(db, ids["city_uuid"], view=WorkOrderView.OPEN_QUOTES),
+        [("idx_work_order_quote_city_created_at", "idx_work_order_open_city_created_at")],
+    ),
+    PlanCase(
+        "get_work_orders_all_quotes",
+        lambda db, ids: crud.get_work_orders(db, ids["city_uuid"], view=WorkOrderView.ALL_QUOTES),
+        [("idx_work_order_quote_city_created_at",), ("idx_work_order_archive_quote",)],
+    ),
+    PlanCase(
+        "get_aircraft_list",
+        lambda db, ids: crud.get_aircraft_list(db),
+        [],
+    ),
+    PlanCase(
+        "get_work_order_items",
+        lambda db, ids: crud.get_work_order_items(db, ids["work_order_uuid"]),
+        [
+            ("idx_work_order_uuid", "work_order_uuid_key"),
+            ("idx_work_order_item_work_order_id", "uq_work_order_item_number"),
+        ],
+    ),
+    PlanCase(
+        "dashboard_open_counts",
+        lambda db, ids: get_open_work_order_counts_by_city(db),
+        [],
+    ),
+]
+
+# Known gaps; strict so the marker has to go once the plan is fixed
+KNOWN_SEQ_SCANS: dict[str, str] = {}
+
+# Partitions this small (the quietest cities) are read faster without an index
+SMALL_PARTITION_PAGES = 64
+
+
+def walk(node: dict):
+    """Yield every node of an EXPLAIN JSON plan tree."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def scans_one_partition(plan: dict, table: str) -> bool:
+    """Whether the plan reads `table` from a single partition only."""
+    partitions = {
+        node.get("Partition Name") for node in walk(plan) if node.get("Relation Name") == table
+    }
+    return len(partitions) == 1 and None not in partitions
+
+
+def render(node: dict, depth: int = 0) -> list[str]:
+    """Render the plan shape: node types, relations and indexes, no costs."""
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    lines = ["  " * depth + label]
+    for child in node.get("Plans", []):
+        lines.extend(render(child, depth + 1))
+    return lines
+
+
+async def small_partitions(db: AsyncSession) -> set[str]:
+    """Partitions under SMALL_PARTITION_PAGES pages."""
+    result = await db.execute(
+        text("SELECT relname FROM pg_class WHERE relispartition AND relpages < :pages"),
+        {"pages": SMALL_PARTITION_PAGES},
+    )
+    return set(result.scalars())
+
+
+async def partition_parents(db: AsyncSession) -> dict[str, str]:
+    """Name of the partitioned table or index every partition belongs to."""
+    result = await db.execute(
+        text(
+            "SELECT child.relname, root.relname FROM pg_class child "
+            "JOIN pg_class root ON root.oid = pg_partition_root(child.oid) "
+            "WHERE child.relispartition"
+        )
+    )
+    return dict(result.all())
+
+
+def fold_partitions(node: dict, parents: dict[str, str]) -> None:
+    """Report partitions and partition indexes under their parent's name.
+
+    The partition a node read is kept as "Partition Name".
+    """
+    if node.get("Relation Name") in parents:
+        node["Partition Name"] = node["Relation Name"]
+    for key in ("Relation Name", "Index Name"):
+        if key in node:
+            node[key] = parents.get(node[key], node[key])
+    for child in node.get("Plans", []):
+        fold_partitions(child, parents)
+
+
+async def explain_calls(db: AsyncSession, case: PlanCase, ids: dict) -> list[tuple[str, dict]]:
+    """Run the case and return (statement, plan) for each statement it issued."""
+    captured: list[tuple[str, tuple]] = []
+    sync_engine = db.bind.sync_engine
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await case.call(db, ids)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    parents = await partition_parents(db)
+    plans = []
+    for statement, parameters in captured:
+        result = await db.connection()
+        raw = await result.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        document = raw.scalar_one()
+        if isinstance(document, str):
+            document = json.loads(document)
+        plan = document[0]["Plan"]
+        fold_partitions(plan, parents)
+        plans.append((statement, plan))
+    return plans
+
+
+def snapshot_text(plans: list[tuple[str, dict]]) -> str:
+    """Render the statements and plan shapes of a case.
+
+    SQLAlchemy runs the eager loads of sibling relationships in an order that
+    follows mapper configuration, which changes with import order, so runs of
+    consecutive ``IN (...)`` statements are sorted.
+    """
+    sections = [
+        (normalize_sql(statement), "\n".join(render(plan))) for statement, plan in plans
+    ]
+    ordered: list[tuple[str, str]] = []
+    run: list[tuple[str, str]] = []
+    for section in sections:
+        if "IN (...)" in section[0]:
+            run.append(section)
+            continue
+        ordered += sorted(run) + [section]
+        run = []
+    ordered += sorted(run)
+    return "\n\n".join(f"-- {statement}\n{plan}" for statement, plan in ordered) + "\n"
+
+
+@pytest.fixture
+async def plan_ids(plan_session: AsyncSession) -> dict:
+    """Parameters for the cases: the busiest city and its largest work order and lead technician."""
+    city_id, city_uuid = (
+        await plan_session.execute(
+            select(City.id, City.uuid)
+            .join(WorkOrder, WorkOrder.city_id == City.id)
+            .group_by(City.id, City.uuid)
+            .order_by(func.count(WorkOrder.id).desc())
+            .limit(1)
+        )
+    ).one()
+    work_order_uuid = (
+        await plan_session.execute(
+            select(WorkOrder.uuid)
+            .join(
+                WorkOrderItem,
+                (WorkOrderItem.work_order_id == WorkOrder.id)
+                & (WorkOrderItem.city_id == WorkOrder.city_id),
+            )
+            .where(WorkOrder.city_id == city_id)
+            .group_by(WorkOrder.id, WorkOrder.uuid)
+            .order_by(func.count(WorkOrderItem.id).desc(), WorkOrder.id)
+            .limit(1)
+        )
+    ).scalar_one()
+    lead_technician = (
+        await plan_session.execute(
+            select(WorkOrder.lead_technician)
+            .where(WorkOrder.city_id == city_id, is_open(WorkOrder.status))
+            .group_by(WorkOrder.lead_technician)
+            .order_by(func.count().desc(), WorkOrder.lead_technician)
+            .limit(1)
+        )
+    ).scalar_one()
+    return {
+        "city_uuid": city_uuid,
+        "work_order_uuid": work_order_uuid,
+        "lead_technician": lead_technician,
+    }
+
+
+def _seq_scan_param(case: PlanCase):
+    marks = []
+    if case.name in KNOWN_SEQ_SCANS:
+        marks.append(pytest.mark.xfail(reason=KNOWN_SEQ_SCANS[case.name], strict=True))
+    return pytest.param(case, id=case.name, marks=marks)
+
+
+class TestQueryPlans:
+    """Plan properties and snapshots for the canonical read queries."""
+
+    @pytest.mark.parametrize("case", [_seq_scan_param(c) for c in CASES])
+    async def test_no_seq_scan_on_large_tables(
+        self, plan_session: AsyncSession, plan_ids: dict, case: PlanCase
+    ):
+        """Test no statement sequentially scans work orders, items or their archives.
+
+        Scanning the one city partition a statement was pruned to is allowed:
+        it reads the same rows the city index would, without the index. So is
+        scanning a small partition.
+        """
+        plans = await explain_calls(plan_session, case, plan_ids)
+        small = await small_partitions(plan_session)
+
+        seq_scans = [
+            (normalize_sql(statement), node["Relation Name"])
+            for statement, plan in plans
+            for node in walk(plan)
+            if node["Node Type"] == "Seq Scan"
+            and node.get("Relation Name") in LARGE_TABLES
+            and node.get("Partition Name") not in small
+            and not scans_one_partition(plan, node["Relation Name"])
+        ]
+        assert not seq_scans, f"Sequential scans on large tables: {seq_scans}"
+
+    @pytest.mark.parametrize("case", [c for c in CASES if c.expected_indexes], ids=lambda c: c.name)
+    async def test_expected_indexes_are_used(
+        self, plan_session: AsyncSession, plan_ids: dict, case: PlanCase
+    ):
+        """Test the large tables are read through the expected indexes."""
+        plans = await explain_calls(plan_session, case, plan_ids)
+
+        used = {node["Index Name"] for _, plan in plans for node in walk(plan) if "Index Name" in node}
+        for prefixes in case.expected_indexes:
+            assert any(
+                index.startswith(prefixes) for index in used
+            ), f"None of {prefixes} used; used: {sorted(used)}"
+
+    @pytest.mark.parametrize("case", CASES, ids=lambda c: c.name)
+    async def test_plan_matches_snapshot(
+        self, plan_session: AsyncSession, plan_ids: dict, case: PlanCase
+    ):
+        """Test plan shapes match the committed snapshot."""
+        plans = await explain_calls(plan_session, case, plan_ids)
+        actual = snapshot_text(plans)
+        path = SNAPSHOT_DIR / f"{case.name}.txt"
+
+        if UPDATE_SNAPSHOTS or not path.exists():
+            path.write_text(actual)
+            return
+
+        assert actual == path.read_text(), (
+            f"Plan for {case.name} changed; review and rerun with UPDATE_PLAN_SNAPSHOTS=1"
+        )
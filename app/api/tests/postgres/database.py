@@ -0,0 +1,137 @@
+"""
+Template database management for the PostgreSQL test tier.
+
+The Flyway migrations are applied once into a template database; test
+databases are then cloned from it with ``CREATE DATABASE ... TEMPLATE``, which
+copies files instead of replaying SQL and takes milliseconds. The template is
+rebuilt whenever the migration files change (tracked by a checksum stored as
+the database comment).
+"""
+
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+
+import asyncpg
+from sqlalchemy.engine import URL, make_url
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[4] / "database" / "migrations"
+TEMPLATE_DATABASE = "cirrus_test_template"
+
+# Serializes template builds across pytest-xdist workers
+_TEMPLATE_LOCK_ID = 4_270_001
+
+
+def postgres_url() -> URL | None:
+    """The server to create test databases on, from TEST_POSTGRES_URL."""
+    value = os.environ.get("TEST_POSTGRES_URL")
+    return make_url(value) if value else None
+
+
+def _dsn(url: URL, database: str) -> str:
+    return url.set(drivername="postgresql", database=database).render_as_string(
+        hide_password=False
+    )
+
+
+def migration_files() -> list[Path]:
+    """Flyway versioned migrations in apply order."""
+    return sorted(MIGRATIONS_DIR.glob("V*__*.sql"), key=lambda p: int(p.name[1:].split("__")[0]))
+
+
+def migrations_checksum() -> str:
+    digest = hashlib.sha256()
+    for path in migration_files():
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+async def _database_comment(conn: asyncpg.Connection, name: str) -> str | None:
+    return await conn.fetchval(
+        "SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = $1", name
+    )
+
+
+async def _drop_database(conn: asyncpg.Connection, name: str) -> None:
+    await conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+
+
+async def _build_template(url: URL, checksum: str) -> None:
+    admin = await asyncpg.connect(_dsn(url, url.database or "postgres"))
+    try:
+        await _drop_database(admin, TEMPLATE_DATABASE)
+        await admin.execute(f'CREATE DATABASE "{TEMPLATE_DATABASE}"')
+    finally:
+        await admin.close()
+
+    conn = await asyncpg.connect(_dsn(url, TEMPLATE_DATABASE))
+    try:
+        for path in migration_files():
+            await conn.execute(path.read_text())
+        # Schema only: tests create their own rows, including cities
+        tables = await conn.fetch(
+            "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
+        )
+        if tables:
+            names = ", ".join(f'"{row["tablename"]}"' for row in tables)
+            await conn.execute(f"TRUNCATE {names} RESTART IDENTITY CASCADE")
+        await conn.execute(f"COMMENT ON DATABASE \"{TEMPLATE_DATABASE}\" IS 'migrations:{checksum}'")
+    finally:
+        await conn.close()
+
+
+async def _ensure_template(url: URL) -> None:
+    checksum = migrations_checksum()
+    admin = await asyncpg.connect(_dsn(url, url.database or "postgres"))
+    try:
+        await admin.execute("SELECT pg_advisory_lock($1)", _TEMPLATE_LOCK_ID)
+        try:
+            if await _database_comment(admin, TEMPLATE_DATABASE) != f"migrations:{checksum}":
+                await _build_template(url, checksum)
+        finally:
+            await admin.execute("SELECT pg_advisory_unlock($1)", _TEMPLATE_LOCK_ID)
+    finally:
+        await admin.close()
+
+
+async def _clone(url: URL, name: str, replace: bool) -> bool:
+    await _ensure_template(url)
+    admin = await asyncpg.connect(_dsn(url, url.database or "postgres"))
+    try:
+        checksum = await _database_comment(admin, TEMPLATE_DATABASE)
+        exists = await admin.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", name)
+        if exists and not replace and await _database_comment(admin, name) == checksum:
+            return False
+        await _drop_database(admin, name)
+        await admin.execute(f'CREATE DATABASE "{name}" TEMPLATE "{TEMPLATE_DATABASE}"')
+        await admin.execute(f"COMMENT ON DATABASE \"{name}\" IS '{checksum}'")
+        return True
+    finally:
+        await admin.close()
+
+
+def clone_database(name: str, replace: bool = True) -> tuple[str, bool]:
+    """Clone the migrated template into `name`.
+
+    With ``replace=False`` an existing clone built from the current migrations
+    is kept (for databases that are expensive to fill, like the plan tests').
+    Returns the SQLAlchemy URL of the database and whether it was (re)created.
+    """
+    url = postgres_url()
+    created = asyncio.run(_clone(url, name, replace))
+    return url.set(database=name).render_as_string(hide_password=False), created
+
+
+def drop_database(name: str) -> None:
+    url = postgres_url()
+
+    async def _drop() -> None:
+        admin = await asyncpg.connect(_dsn(url, url.database or "postgres"))
+        try:
+            await _drop_database(admin, name)
+        finally:
+            await admin.close()
+
+    asyncio.run(_drop())
@@ -0,0 +1,367 @@
+"""Tests that need the real PostgreSQL schema built by the Flyway migrations."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.counting import CountMode, TotalKind, count_total
+from core.slow_query_log import SlowQueryLog
+from crud.work_order import import_work_orders
+from crud.work_order_archive import archive_work_orders
+from models.aircraft import Aircraft
+from models.city import City
+from models.work_order import WorkOrder, WorkOrderStatus
+from models.work_order_archive import work_order_archive, work_order_item_archive
+from models.work_order_item import WorkOrderItem
+from schemas.work_order import WorkOrderImportRow
+
+
+class TestEnums:
+    """Tests for values written to PostgreSQL enum columns."""
+
+    async def test_create_work_order_stores_enum_values(
+        self, client: AsyncClient, test_session: AsyncSession, test_city: City, test_aircraft
+    ):
+        """Test the API writes enum values, not Python member names."""
+        response = await client.post(
+            "/api/v1/work-orders",
+            json={
+                "city_id": str(test_city.uuid),
+                "aircraft_id": str(test_aircraft.uuid),
+                "work_order_type": "quote",
+                "priority": "urgent",
+                "created_by": "test_user",
+            },
+        )
+        assert response.status_code == 201
+
+        row = (
+            await test_session.execute(
+                text(
+                    "SELECT work_order_type::text, status::text, priority::text "
+                    "FROM work_order WHERE uuid = :uuid"
+                ),
+                {"uuid": response.json()["id"]},
+            )
+        ).one()
+        assert tuple(row) == ("quote", "created", "urgent")
+
+    async def test_dashboard_filters_terminal_statuses(
+        self, client: AsyncClient, test_session: AsyncSession, test_work_order: WorkOrder
+    ):
+        """Test the enum NOT IN filter of the dashboard query."""
+        response = await client.get("/api/v1/dashboard/work-order-counts-by-city")
+        assert response.status_code == 200
+        assert [c["open_count"] for c in response.json()["items"]] == [1]
+
+        await test_session.execute(
+            text("UPDATE work_order SET status = 'completed' WHERE id = :id"),
+            {"id": test_work_order.id},
+        )
+        response = await client.get("/api/v1/dashboard/work-order-counts-by-city")
+        assert response.json()["items"] == []
+
+
+class TestServerDefaults:
+    """Tests for defaults and constraints defined in the migrations."""
+
+    async def test_uuid_generated_by_database(self, test_session: AsyncSession):
+        """Test gen_random_uuid() fills uuid when the application omits it."""
+        generated = (
+            await test_session.execute(
+                text("INSERT INTO city (code, name) VALUES ('KPGT', 'Postgres Test') RETURNING uuid")
+            )
+        ).scalar_one()
+        assert generated is not None
+
+    async def test_version_defaults_to_one(
+        self, test_session: AsyncSession, test_work_order: WorkOrder
+    ):
+        """Test rows written outside the ORM start at version 1."""
+        version = (
+            await test_session.execute(
+                text(
+                    "INSERT INTO work_order_item (work_order_id, city_id, item_number, created_by) "
+                    "VALUES (:work_order_id, :city_id, 99, 'sql') RETURNING version"
+                ),
+                {"work_order_id": test_work_order.id, "city_id": test_work_order.city_id},
+            )
+        ).scalar_one()
+        assert version == 1
+
+    async def test_item_number_unique_per_work_order(
+        self, test_session: AsyncSession, test_work_order_item: WorkOrderItem
+    ):
+        """Test uq_work_order_item_number rejects a duplicate item number.
+
+        Partitions attached after the migration name their copy of the
+        constraint themselves, so the violated key is matched instead.
+        """
+        test_session.add(
+            WorkOrderItem(
+                work_order_id=test_work_order_item.work_order_id,
+                city_id=test_work_order_item.city_id,
+                item_number=test_work_order_item.item_number,
+                created_by="test_user",
+            )
+        )
+        with pytest.raises(IntegrityError, match=r"\(work_order_id, item_number, city_id\)"):
+            await test_session.flush()
+
+    async def test_deleting_work_order_cascades_in_database(
+        self, test_session: AsyncSession, test_work_order_item: WorkOrderItem
+    ):
+        """Test the ON DELETE CASCADE foreign key removes items without the ORM."""
+        await test_session.execute(
+            text("DELETE FROM work_order WHERE id = :id"),
+            {"id": test_work_order_item.work_order_id},
+        )
+        remaining = (
+            await test_session.execute(text("SELECT count(*) FROM work_order_item"))
+        ).scalar_one()
+        assert remaining == 0
+
+
+class TestCityPartitions:
+    """Tests for the per-city partitions of work orders, items and their archives."""
+
+    async def test_new_city_gets_partitions(self, test_session: AsyncSession):
+        """Test inserting a city creates and attaches its live and archive partitions."""
+        city_id = (
+            await test_session.execute(
+                text("INSERT INTO city (code, name) VALUES ('KPRT', 'Partition') RETURNING id")
+            )
+        ).scalar_one()
+        tables = ["work_order", "work_order_archive", "work_order_item", "work_order_item_archive"]
+        parents = (
+            await test_session.execute(
+                text(
+                    "SELECT child.relname, parent.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = inhrelid "
+                    "JOIN pg_class parent ON parent.oid = inhparent "
+                    "WHERE child.relname = ANY(:partitions)"
+                ),
+                {"partitions": [f"{table}_city_{city_id}" for table in tables]},
+            )
+        ).all()
+        assert sorted(parents) == sorted((f"{table}_city_{city_id}", table) for table in tables)
+
+    async def test_items_stored_with_their_work_order(
+        self, test_session: AsyncSession, test_work_order_item: WorkOrderItem
+    ):
+        """Test a work order and its items land in their city's partitions."""
+        city_id = test_work_order_item.city_id
+        partitions = (
+            await test_session.execute(
+                text(
+                    "SELECT (SELECT tableoid::regclass::text FROM work_order WHERE id = :wo), "
+                    "(SELECT tableoid::regclass::text FROM work_order_item WHERE id = :item)"
+                ),
+                {"wo": test_work_order_item.work_order_id, "item": test_work_order_item.id},
+            )
+        ).one()
+        assert tuple(partitions) == (f"work_order_city_{city_id}", f"work_order_item_city_{city_id}")
+
+    async def test_item_city_must_match_work_order(
+        self, test_session: AsyncSession, test_work_order: WorkOrder
+    ):
+        """Test the composite foreign key rejects an item filed under another city."""
+        other_city = City(code="KOTH", name="Other")
+        test_session.add(other_city)
+        await test_session.flush()
+        test_session.add(
+            WorkOrderItem(
+                work_order_id=test_work_order.id,
+                city_id=other_city.id,
+                item_number=1,
+                created_by="test_user",
+            )
+        )
+        with pytest.raises(IntegrityError, match="work_order_item_work_order_id_fkey"):
+            await test_session.flush()
+
+
+class TestListTotals:
+    """Tests for totals estimated by the PostgreSQL planner."""
+
+    async def test_estimate_past_threshold(self, test_session: AsyncSession, test_city: City):
+        """Test estimate mode returns the planner's row estimate, never below the threshold."""
+        test_session.add_all(
+            Aircraft(registration_number=f"N{number}ES", created_by="test_user")
+            for number in range(1, 6)
+        )
+        await test_session.flush()
+
+        total = await count_total(
+            test_session, select(Aircraft.id), CountMode.ESTIMATE, threshold=3
+        )
+        assert total.kind == TotalKind.ESTIMATE
+        assert total.value >= 4
+
+
+class TestIsolation:
+    """Tests that each test starts from the empty template."""
+
+    @pytest.mark.parametrize("attempt", [1, 2])
+    async def test_rows_do_not_leak_between_tests(self, test_session: AsyncSession, attempt: int):
+        """Test a committed row is gone by the next test."""
+        count = (await test_session.execute(text("SELECT count(*) FROM city"))).scalar_one()
+        assert count == 0
+
+        test_session.add(City(code="KISO", name="Isolation"))
+        await test_session.commit()
+
+
+class TestBulkImport:
+    """Tests for bulk imports hitting constraints SQLite does not enforce."""
+
+    async def test_work_order_value_too_long_rejects_only_that_row(
+        self, test_session: AsyncSession, test_city: City, test_aircraft
+    ):
+        """Test a VARCHAR overflow the schema let through is reported for its row only."""
+        rows = [
+            (1, WorkOrderImportRow(city_code="KTYS", aircraft_registration="N12345")),
+            (
+                2,
+                WorkOrderImportRow.model_construct(
+                    city_code="KTYS", aircraft_registration="N12345", customer_name="X" * 201
+                ),
+            ),
+        ]
+        imported, errors = await import_work_orders(test_session, rows, created_by="importer")
+        assert imported == 1
+        assert [line for line, _ in errors] == [2]
+        assert errors[0][1].startswith("Could not insert")
+
+    async def test_value_too_long_rejects_only_that_row(
+        self, client: AsyncClient, test_city: City
+    ):
+        """Test a VARCHAR overflow falls back to per-row SAVEPOINTs."""
+        body = "\n".join(
+            [
+                '{"registration_number": "N1SR"}',
+                '{"registration_number": "N2SR", "fuel_code": "' + "X" * 30 + '"}',
+                '{"registration_number": "N3SR"}',
+            ]
+        )
+        response = await client.post(
+            "/api/v1/aircraft/import?created_by=importer",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        data = response.json()
+        assert (data["inserted"], data["rejected"]) == (2, 1)
+        assert data["errors"][0]["line"] == 2
+        assert data["errors"][0]["error"].startswith("Could not save")
+
+
+class TestSlowQueryPlans:
+    """Tests for the plans the slow query log captures."""
+
+    async def test_plan_captured(self, test_session: AsyncSession, test_city: City):
+        """Test a sampled statement's plan is read without running it again."""
+        conn = await test_session.connection()
+        plan = await conn.run_sync(
+            lambda sync_conn: SlowQueryLog()._explain(
+                sync_conn, "SELECT * FROM city WHERE id = $1", (test_city.id,), False
+            )
+        )
+        assert plan[0]["Plan"]["Relation Name"] == "city"
+
+    async def test_failed_explain_keeps_transaction_usable(
+        self, test_session: AsyncSession, test_city: City
+    ):
+        """Test a failing EXPLAIN is rolled back instead of aborting the request's transaction."""
+        conn = await test_session.connection()
+        plan = await conn.run_sync(
+            lambda sync_conn: SlowQueryLog()._explain(
+                sync_conn, "SELECT * FROM no_such_table", (), False
+            )
+        )
+        assert plan is None
+        assert (await test_session.execute(select(City.code))).scalar_one() == test_city.code
+
+
+class TestArchiveLocking:
+    """Tests for archiving while other transactions edit, on committed rows."""
+
+    async def test_item_edit_during_archive_is_kept(self, test_engine):
+        """Test an item edit that commits while its work order is archived reaches the archive."""
+        old = datetime.utcnow() - timedelta(days=800)
+        async with AsyncSession(test_engine) as setup:
+            city = City(uuid=uuid4(), code="KLCK", name="Lock Test", is_active=True)
+            aircraft = Aircraft(registration_number="N1LOCK", created_by="test_user")
+            setup.add_all([city, aircraft])
+            await setup.flush()
+            work_orders = [
+                WorkOrder(
+                    uuid=uuid4(),
+                    work_order_number=f"LOCK{sequence}",
+                    sequence_number=sequence,
+                    city_id=city.id,
+                    aircraft_id=aircraft.id,
+                    status=WorkOrderStatus.COMPLETED,
+                    created_by="test_user",
+                    completed_date=old,
+                    created_at=old,
+                    updated_at=old,
+                )
+                for sequence in (1, 2)
+            ]
+            setup.add_all(work_orders)
+            await setup.flush()
+            item = WorkOrderItem(
+                uuid=uuid4(),
+                work_order_id=work_orders[0].id,
+                city_id=city.id,
+                item_number=1,
+                discrepancy="Original",
+                created_by="test_user",
+            )
+            setup.add(item)
+            await setup.flush()
+            ids = [work_order.id for work_order in work_orders]
+            item_id, aircraft_id, city_id = item.id, aircraft.id, city.id
+            await setup.commit()
+
+        try:
+            async with AsyncSession(test_engine) as editor, AsyncSession(test_engine) as job:
+                await editor.execute(
+                    update(WorkOrderItem)
+                    .where(WorkOrderItem.id == item_id)
+                    .values(discrepancy="Edited")
+                )
+                archiving = asyncio.create_task(archive_work_orders(job, timedelta(days=365)))
+                await asyncio.sleep(0.2)
+                assert not archiving.done()
+                await editor.commit()
+                assert await archiving == (1, 1)
+                await job.commit()
+
+            async with AsyncSession(test_engine) as check:
+                archived = await check.execute(
+                    select(work_order_item_archive.c.discrepancy).where(
+                        work_order_item_archive.c.id == item_id
+                    )
+                )
+                assert archived.scalar_one() == "Edited"
+        finally:
+            async with AsyncSession(test_engine) as cleanup:
+                await cleanup.execute(
+                    delete(work_order_item_archive).where(
+                        work_order_item_archive.c.work_order_id.in_(ids)
+                    )
+                )
+                await cleanup.execute(
+                    delete(work_order_archive).where(work_order_archive.c.id.in_(ids))
+                )
+                await cleanup.execute(delete(WorkOrder).where(WorkOrder.id.in_(ids)))
+                await cleanup.execute(delete(Aircraft).where(Aircraft.id == aircraft_id))
+                await cleanup.execute(delete(City).where(City.id == city_id))
+                await cleanup.commit()
@@ -0,0 +1,152 @@
+"""Unit tests for bulk upload parsing."""
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from core.bulk import (
+    TooManyRows,
+    UnsupportedMediaType,
+    achunked,
+    chunked,
+    format_validation_error,
+    iter_upload,
+    parse_upload,
+    validate_rows,
+)
+
+
+async def stream(*chunks: bytes):
+    """An upload arriving in `chunks`, like ``Request.stream()``."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(items) -> list:
+    return [item async for item in items]
+
+
+class TestParseUpload:
+    """Tests for splitting NDJSON and CSV uploads into rows."""
+
+    async def test_ndjson_rows_keep_line_numbers(self):
+        """Test blank lines are skipped but still counted."""
+        rows = await parse_upload(b'{"a": 1}\n\n{"a": 2}\n', "application/x-ndjson")
+        assert [(r.line, r.data) for r in rows] == [(1, {"a": 1}), (3, {"a": 2})]
+
+    async def test_ndjson_bad_lines_become_row_errors(self):
+        """Test invalid JSON and non-objects are reported per line."""
+        rows = await parse_upload(b'{"a": 1}\n{oops\n[1, 2]\n', "application/x-ndjson")
+        assert rows[0].error is None
+        assert rows[1].error.startswith("Invalid JSON")
+        assert rows[2].error == "Expected a JSON object"
+
+    async def test_csv_drops_empty_cells(self):
+        """Test empty cells are omitted so schema defaults apply."""
+        rows = await parse_upload(
+            b"\xef\xbb\xbfa,b\n1, \n,\n 2 ,3\n", "text/csv; charset=utf-8"
+        )
+        assert [(r.line, r.data) for r in rows] == [(2, {"a": "1"}), (4, {"a": "2", "b": "3"})]
+
+    async def test_csv_extra_values(self):
+        """Test a record wider than the header is a row error."""
+        rows = await parse_upload(b"a,b\n1,2,3\n", "text/csv")
+        assert rows[0].error == "More values than header columns"
+
+    async def test_csv_quoted_line_breaks(self):
+        """Test a quoted value may span lines; the record ends on its last line."""
+        rows = await parse_upload(b'a,b\r\n"x\r\ny, ""z""",1\r\n2,3\r\n', "text/csv")
+        assert [(r.line, r.data) for r in rows] == [
+            (3, {"a": 'x\r\ny, "z"', "b": "1"}),
+            (4, {"a": "2", "b": "3"}),
+        ]
+
+    async def test_csv_unterminated_quote(self):
+        """Test an upload ending inside a quoted value reports its last line."""
+        rows = await parse_upload(b'a\n"open\nstill open\n', "text/csv")
+        assert [(r.line, r.error) for r in rows] == [(3, "Unterminated quoted value")]
+
+    async def test_unsupported_media_type(self):
+        """Test anything but NDJSON or CSV is rejected."""
+        with pytest.raises(UnsupportedMediaType):
+            await parse_upload(b"[]", "application/json")
+
+    async def test_invalid_encoding(self):
+        """Test non UTF-8 uploads are rejected."""
+        with pytest.raises(ValueError, match="UTF-8"):
+            await parse_upload(b"\xff\xfe", "text/csv")
+
+    async def test_rows_split_across_chunks(self):
+        """Test lines and multi-byte characters split between chunks are joined."""
+        body = 'name\nZürich\nOslo'.encode()
+        cut = body.index("ü".encode()) + 1
+        rows = await collect(iter_upload(stream(body[:cut], body[cut:]), "text/csv"))
+        assert [(r.line, r.data) for r in rows] == [(2, {"name": "Zürich"}), (3, {"name": "Oslo"})]
+
+    async def test_rows_read_as_they_arrive(self):
+        """Test a row is yielded before the rest of the upload is read."""
+        read = []
+
+        async def chunks():
+            for chunk in (b'{"a": 1}\n', b'{"a": 2}\n'):
+                read.append(chunk)
+                yield chunk
+
+        rows = iter_upload(chunks(), "application/x-ndjson")
+        assert (await anext(rows)).data == {"a": 1}
+        assert len(read) == 1
+
+
+class Row(BaseModel):
+    code: str
+    count: int = 0
+
+
+class TestValidateRows:
+    """Tests for validating parsed rows against a schema."""
+
+    async def test_invalid_rows_are_collected(self):
+        """Test valid rows are yielded and invalid ones recorded by line."""
+        errors = []
+        rows = iter_upload(
+            stream(b'{"code": "A"}\n{"count": 1}\n{bad\n'), "application/x-ndjson"
+        )
+        valid = await collect(validate_rows(rows, Row, errors, max_rows=10))
+        assert valid == [(1, Row(code="A"))]
+        assert [line for line, _ in errors] == [2, 3]
+
+    async def test_too_many_rows(self):
+        """Test the row limit is enforced while iterating."""
+        rows = iter_upload(stream(b"code\nA\nB\nC\n"), "text/csv")
+        with pytest.raises(TooManyRows):
+            await collect(validate_rows(rows, Row, [], max_rows=2))
+
+    def test_media_type_checked_before_reading(self):
+        """Test an unsupported upload fails before any row is consumed."""
+        with pytest.raises(UnsupportedMediaType):
+            iter_upload(stream(b"code\nA\n"), "application/xml")
+
+
+class TestHelpers:
+    """Tests for the bulk helper functions."""
+
+    def test_format_validation_error(self):
+        """Test each failing field is listed on one line."""
+        with pytest.raises(ValidationError) as exc_info:
+            Row.model_validate({"count": "x"})
+        message = format_validation_error(exc_info.value)
+        assert message.startswith("code: Field required; count:")
+
+    def test_chunked(self):
+        """Test items are split into lists of at most the chunk size."""
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(chunked([], 2)) == []
+
+    async def test_achunked(self):
+        """Test an async iterable is split into lists of at most the chunk size."""
+
+        async def items(n):
+            for item in range(n):
+                yield item
+
+        assert await collect(achunked(items(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert await collect(achunked(items(0), 2)) == []
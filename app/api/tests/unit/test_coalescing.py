@@ -0,0 +1,188 @@
+"""Unit tests for coalescing identical concurrent GET requests."""
+
+import asyncio
+
+import pytest
+
+from core.coalescing import CoalescingMiddleware, ResponseCoalescer, coalescing_key
+
+
+def http_scope(
+    method: str = "GET", path: str = "/api/v1/work-orders", query: bytes = b"", headers=()
+):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": list(headers),
+    }
+
+
+class CountingApp:
+    """ASGI app that answers after a pause and counts how often it ran."""
+
+    def __init__(self, status: int = 200, delay: float = 0.01, write_delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.write_delay = write_delay
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay if scope["method"] == "GET" else self.write_delay)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": f'{{"call": {call}}}'.encode()})
+
+
+async def request(middleware: CoalescingMiddleware, scope: dict) -> tuple[int, bytes]:
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, None, send)
+    return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def middleware_for(app: CountingApp, ttl_s: float = 0.0) -> CoalescingMiddleware:
+    return CoalescingMiddleware(
+        app, path_prefix="/api/v1", coalescer=ResponseCoalescer(ttl_s), profiling_token="token"
+    )
+
+
+class TestCoalescingKey:
+    """Tests for coalescing_key."""
+
+    def test_query_parameter_order_ignored(self):
+        """Test parameters in another order make the same key."""
+        assert coalescing_key(http_scope(query=b"page=1&city_id=x")) == coalescing_key(
+            http_scope(query=b"city_id=x&page=1")
+        )
+
+    def test_repeated_parameter_order_kept(self):
+        """Test the order of a repeated parameter's values is part of the key."""
+        assert coalescing_key(http_scope(query=b"status=a&status=b")) != coalescing_key(
+            http_scope(query=b"status=b&status=a")
+        )
+
+    def test_credentials_in_key(self):
+        """Test requests with different credentials never share a key."""
+        assert coalescing_key(http_scope(headers=[(b"authorization", b"Bearer a")])) != (
+            coalescing_key(http_scope(headers=[(b"authorization", b"Bearer b")]))
+        )
+
+
+class TestCoalescingMiddleware:
+    """Tests for CoalescingMiddleware."""
+
+    async def test_concurrent_requests_share_response(self):
+        """Test identical concurrent GETs run once and get the same bytes."""
+        app = CountingApp()
+        middleware = middleware_for(app)
+
+        responses = await asyncio.gather(
+            *(request(middleware, http_scope(query=b"city_id=x&page=1")) for _ in range(5))
+        )
+        assert app.calls == 1
+        assert set(responses) == {(200, b'{"call": 1}')}
+        counter = middleware.coalescer.counter
+        assert (counter.hits, counter.misses) == (4, 1)
+
+    async def test_different_requests_not_shared(self):
+        """Test GETs with different keys each run."""
+        app = CountingApp()
+        middleware = middleware_for(app)
+
+        await asyncio.gather(
+            request(middleware, http_scope(query=b"page=1")),
+            request(middleware, http_scope(query=b"page=2")),
+        )
+        assert app.calls == 2
+
+    @pytest.mark.parametrize(
+        "scope",
+        [
+            http_scope(path="/health"),
+            http_scope(headers=[(b"authorization", b"Bearer token")]),
+        ],
+    )
+    async def test_requests_outside_coalescing_run(self, scope: dict):
+        """Test requests outside the prefix and profiled requests always run."""
+        app = CountingApp()
+        middleware = middleware_for(app)
+
+        await asyncio.gather(request(middleware, scope), request(middleware, scope))
+        assert app.calls == 2
+
+    async def test_other_bearer_tokens_coalesced(self):
+        """Test requests with credentials other than the profiling token still share."""
+        app = CountingApp()
+        middleware = middleware_for(app)
+        scope = http_scope(headers=[(b"authorization", b"Bearer user")])
+
+        await asyncio.gather(request(middleware, scope), request(middleware, scope))
+        assert app.calls == 1
+
+    async def test_error_responses_not_shared(self):
+        """Test waiters run on their own when the first response is not a 200."""
+        app = CountingApp(status=404)
+        middleware = middleware_for(app)
+
+        responses = await asyncio.gather(
+            request(middleware, http_scope()), request(middleware, http_scope())
+        )
+        assert app.calls == 2
+        assert {status for status, _ in responses} == {404}
+
+    async def test_finished_response_shared_within_ttl(self):
+        """Test a finished response answers identical GETs until its TTL passes."""
+        app = CountingApp(delay=0)
+        middleware = middleware_for(app, ttl_s=0.05)
+
+        await request(middleware, http_scope())
+        assert await request(middleware, http_scope()) == (200, b'{"call": 1}')
+        await asyncio.sleep(0.06)
+        assert await request(middleware, http_scope()) == (200, b'{"call": 2}')
+
+    async def test_writes_clear_finished_responses(self):
+        """Test a write makes the next GET run instead of reusing a finished response."""
+        app = CountingApp(delay=0)
+        middleware = middleware_for(app, ttl_s=10)
+
+        await request(middleware, http_scope())
+        await request(middleware, http_scope(method="PATCH"))
+        assert await request(middleware, http_scope()) == (200, b'{"call": 3}')
+
+    async def test_get_overlapping_write_not_kept(self):
+        """Test a GET that started while a write ran is not replayed after it."""
+        app = CountingApp(delay=0.05, write_delay=0.02)
+        middleware = middleware_for(app, ttl_s=10)
+
+        write = asyncio.create_task(request(middleware, http_scope(method="POST")))
+        await asyncio.sleep(0.01)
+        slow_get = asyncio.create_task(request(middleware, http_scope()))
+        await write
+        assert await slow_get == (200, b'{"call": 2}')
+
+        assert await request(middleware, http_scope()) == (200, b'{"call": 3}')
+
+    async def test_waiters_get_own_header_list(self):
+        """Test outer middleware editing one response's headers leaves the others alone."""
+        middleware = middleware_for(CountingApp())
+        starts = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                message["headers"].append((b"server-timing", b"db;dur=1"))
+                starts.append(message)
+
+        await asyncio.gather(*(middleware(http_scope(), None, send) for _ in range(3)))
+        assert [len(start["headers"]) for start in starts] == [2, 2, 2]
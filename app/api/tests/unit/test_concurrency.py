@@ -0,0 +1,22 @@
+"""Unit tests for ETag and If-Match handling."""
+
+from core.concurrency import etag, parse_if_match
+
+
+class TestParseIfMatch:
+    """Tests for turning If-Match headers into accepted versions."""
+
+    def test_missing_or_wildcard_imposes_no_condition(self):
+        """Test no header and * accept any version."""
+        assert parse_if_match(None) is None
+        assert parse_if_match(" * ") is None
+
+    def test_round_trips_etag(self):
+        """Test a served ETag parses back to its version."""
+        assert parse_if_match(etag(7)) == [7]
+        assert parse_if_match('"3", "4"') == [3, 4]
+
+    def test_unusable_tags_match_nothing(self):
+        """Test weak and foreign validators yield no versions."""
+        assert parse_if_match('W/"3"') == []
+        assert parse_if_match('"abc", 5') == []
@@ -0,0 +1,41 @@
+"""Unit tests for load test helpers."""
+
+import pytest
+
+from perf.loadtest import parse_mix, percentile
+
+
+class TestPercentile:
+    """Tests for percentile calculation."""
+
+    def test_empty(self):
+        """Test that no samples give zero."""
+        assert percentile([], 95) == 0.0
+
+    def test_interpolates(self):
+        """Test linear interpolation between ranks."""
+        values = [10.0, 20.0, 30.0, 40.0, 50.0]
+        assert percentile(values, 50) == 30.0
+        assert percentile(values, 0) == 10.0
+        assert percentile(values, 100) == 50.0
+        assert percentile(values, 95) == pytest.approx(48.0)
+
+
+class TestParseMix:
+    """Tests for scenario mix parsing."""
+
+    def test_weights(self):
+        """Test parsing names and weights."""
+        assert parse_mix("list_work_orders=4,dashboard=1") == {
+            "list_work_orders": 4,
+            "dashboard": 1,
+        }
+
+    def test_default_weight(self):
+        """Test that a bare name gets weight 1."""
+        assert parse_mix("dashboard") == {"dashboard": 1}
+
+    def test_unknown_scenario(self):
+        """Test that unknown scenarios are rejected."""
+        with pytest.raises(ValueError, match="Unknown scenario"):
+            parse_mix("delete_everything=1")
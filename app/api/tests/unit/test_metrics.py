@@ -0,0 +1,94 @@
+"""Unit tests for the metrics registry."""
+
+import pytest
+
+from starlette.routing import Route
+
+from core.metrics import LATENCY_BUCKETS, UNMATCHED_ROUTE, Histogram, MetricsRegistry
+
+
+def endpoint(request):
+    pass
+
+
+class TestHistogram:
+    """Tests for the fixed-bucket histogram."""
+
+    def test_observe_places_value_in_bucket(self):
+        """Test that values land in the first bucket whose bound they do not exceed."""
+        histogram = Histogram()
+        histogram.observe(0.005)
+        histogram.observe(0.2)
+        histogram.observe(60.0)
+
+        assert histogram.bucket_counts[0] == 1
+        assert histogram.bucket_counts[LATENCY_BUCKETS.index(0.25)] == 1
+        assert histogram.bucket_counts[-1] == 1
+        assert histogram.count == 3
+
+    def test_cumulative_counts(self):
+        """Test that rendered bucket counts are cumulative."""
+        histogram = Histogram()
+        for value in (0.001, 0.02, 0.02, 3.0):
+            histogram.observe(value)
+
+        cumulative = histogram.cumulative_counts()
+        assert cumulative[0] == 1
+        assert cumulative[LATENCY_BUCKETS.index(0.025)] == 3
+        assert cumulative[-1] == 4
+
+
+class TestRouteMetrics:
+    """Tests for per-route series lookup."""
+
+    def test_lookup_by_template_and_method(self):
+        """Test that a copy of a registered route finds the registered series."""
+        registry = MetricsRegistry()
+        registered = Route("/work-orders/{work_order_id}", endpoint, methods=["GET"])
+        registry.register_routes([registered])
+
+        copy = Route("/work-orders/{work_order_id}", endpoint, methods=["GET"])
+        metrics = registry.route_metrics(copy, "GET", "/work-orders/abc")
+
+        assert metrics is registry.route_metrics(registered, "GET", "/work-orders/abc")
+        assert (metrics.method, metrics.path) == ("GET", "/work-orders/{work_order_id}")
+
+    def test_include_prefix_added_to_template(self):
+        """Test a route that leaves out its include prefix is labelled with the full template."""
+        registry = MetricsRegistry()
+        route = Route("/work-orders/{work_order_id}", endpoint, methods=["GET"])
+
+        metrics = registry.route_metrics(route, "GET", "/api/v1/work-orders/abc")
+
+        assert metrics.path == "/api/v1/work-orders/{work_order_id}"
+        assert metrics is registry.route_metrics(route, "GET", "/api/v1/work-orders/def")
+
+    def test_unmatched_requests(self):
+        """Test requests without a route share one series per method."""
+        registry = MetricsRegistry()
+
+        metrics = registry.route_metrics(None, "GET", "/does-not-exist")
+
+        assert (metrics.method, metrics.path) == ("GET", UNMATCHED_ROUTE)
+
+
+class TestCacheCounters:
+    """Tests for cache hit/miss counters."""
+
+    def test_register_cache_is_idempotent(self):
+        """Test that registering a cache twice returns the same counter."""
+        registry = MetricsRegistry()
+        assert registry.register_cache("totals") is registry.register_cache("totals")
+
+    def test_hit_ratio_rendered(self):
+        """Test that hit ratios are exported per cache."""
+        registry = MetricsRegistry()
+        counter = registry.register_cache("totals")
+        counter.hit()
+        counter.hit()
+        counter.hit()
+        counter.miss()
+
+        text = registry.render()
+        assert 'cache_hits_total{cache="totals"} 3' in text
+        assert 'cache_hit_ratio{cache="totals"} 0.75' in text
@@ -0,0 +1,103 @@
+"""Unit tests for the on-demand request profiler."""
+
+import pytest
+from datetime import datetime, timezone
+
+from core.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    StackSampler,
+    StoredProfile,
+)
+
+
+def _profile(profile_id: str) -> StoredProfile:
+    return StoredProfile(
+        id=profile_id,
+        method="GET",
+        path="/",
+        recorded_at=datetime.now(timezone.utc),
+        duration_ms=1.0,
+        media_type="text/plain",
+        content="",
+    )
+
+
+class TestStackSampler:
+    """Tests for the stdlib sampling profiler."""
+
+    def test_folded_output(self):
+        """Test that samples render as folded stacks."""
+        sampler = StackSampler()
+        sampler.samples[("main", "handler", "query")] = 3
+        sampler.samples[("main", "handler")] = 1
+
+        assert sampler.folded() == "main;handler;query 3\nmain;handler 1"
+
+    def test_samples_target_thread(self):
+        """Test that sampling the current thread records its stack."""
+        sampler = StackSampler(interval=0.0005)
+        sampler.start()
+        deadline = datetime.now().timestamp() + 0.05
+        while datetime.now().timestamp() < deadline:
+            pass
+        sampler.stop()
+
+        assert sampler.samples
+        assert any("test_samples_target_thread" in ";".join(s) for s in sampler.samples)
+
+
+class TestProfileStore:
+    """Tests for the profile store."""
+
+    def test_evicts_oldest(self):
+        """Test that the store keeps only the most recent profiles."""
+        store = ProfileStore(max_profiles=2)
+        for profile_id in ["a", "b", "c"]:
+            store.add(_profile(profile_id))
+
+        assert store.get("a") is None
+        assert [p.id for p in store.profiles] == ["c", "b"]
+
+
+class TestProfilingTrigger:
+    """Tests for deciding whether a request is profiled."""
+
+    def _middleware(self) -> ProfilingMiddleware:
+        return ProfilingMiddleware(app=None, token="secret", store=ProfileStore())
+
+    def test_bearer_token(self):
+        """Test that the bearer token triggers profiling."""
+        scope = {"path": "/api/v1/cities", "headers": [(b"authorization", b"Bearer secret")], "query_string": b""}
+        assert self._middleware()._requested(scope)
+
+    def test_wrong_token(self):
+        """Test that a wrong token does not trigger profiling."""
+        scope = {"path": "/api/v1/cities", "headers": [(b"authorization", b"Bearer guess")], "query_string": b""}
+        assert not self._middleware()._requested(scope)
+
+    @pytest.mark.parametrize(
+        "scope",
+        [
+            {"path": "/api/v1/cities", "headers": [(b"x-profile", b"secret")], "query_string": b""},
+            {"path": "/api/v1/cities", "headers": [(b"authorization", b"secret")], "query_string": b""},
+            {"path": "/api/v1/cities", "headers": [], "query_string": b"page=1&__profile=secret"},
+        ],
+    )
+    def test_token_outside_bearer_header(self, scope: dict):
+        """Test that the token only counts in an Authorization: Bearer header."""
+        assert not self._middleware()._requested(scope)
+
+    def test_no_flag(self):
+        """Test that ordinary requests are not profiled."""
+        scope = {"path": "/api/v1/cities", "headers": [], "query_string": b"page=1"}
+        assert not self._middleware()._requested(scope)
+
+    def test_admin_paths_not_profiled(self):
+        """Test that admin requests are not profiled, even with the token."""
+        scope = {
+            "path": "/api/v1/admin/profiles",
+            "headers": [(b"authorization", b"Bearer secret")],
+            "query_string": b"",
+        }
+        assert not self._middleware()._requested(scope)
@@ -0,0 +1,174 @@
+"""Unit tests for the benchmark regression gate."""
+
+import pytest
+
+from perf.regression import (
+    DatabaseMismatch,
+    check_database,
+    compare,
+    format_report,
+    mad,
+    merge_baseline,
+    summarize_runs,
+)
+
+
+def _summary(database: str = "sqlite", **benchmarks) -> dict:
+    return {
+        "database": database,
+        "benchmarks": {
+            name: {"median_ms": median, "mad_ms": spread, "queries": queries}
+            for name, (median, spread, queries) in benchmarks.items()
+        }
+    }
+
+
+class TestMad:
+    """Tests for mad."""
+
+    def test_ignores_outliers(self):
+        """Test a single outlier barely moves the MAD."""
+        assert mad([10.0, 10.0, 10.0, 10.0]) == 0
+        assert mad([10.0, 10.1, 9.9, 10.0, 500.0]) == pytest.approx(0.14826)
+
+
+class TestSummarizeRuns:
+    """Tests for summarize_runs."""
+
+    def test_pools_samples_across_runs(self):
+        """Test repeated runs are pooled into one median per benchmark."""
+        reports = [
+            {"database": "sqlite", "benchmarks": {"a": {"samples_ms": [1.0, 2.0], "queries": 3}}},
+            {"database": "sqlite", "benchmarks": {"a": {"samples_ms": [3.0], "queries": 3}}},
+        ]
+
+        summary = summarize_runs(reports)
+
+        assert summary["runs"] == 2
+        assert summary["benchmarks"]["a"] == {
+            "median_ms": 2.0,
+            "mad_ms": pytest.approx(1.4826),
+            "samples": 3,
+            "queries": 3,
+        }
+
+
+class TestCompare:
+    """Tests for compare."""
+
+    def test_slowdown_within_noise_is_ok(self):
+        """Test a large relative slowdown inside the noise band passes."""
+        baseline = _summary(a=(1.0, 0.5, 2))
+        current = _summary(a=(2.0, 0.5, 2))
+
+        [result] = compare(baseline, current, tolerance=0.25, mad_factor=3.0)
+
+        assert result.verdict == "ok"
+
+    def test_slowdown_within_tolerance_is_ok(self):
+        """Test a slowdown beyond the noise band but under the tolerance passes."""
+        baseline = _summary(a=(10.0, 0.01, 2))
+        current = _summary(a=(11.0, 0.01, 2))
+
+        [result] = compare(baseline, current, tolerance=0.25)
+
+        assert result.verdict == "ok"
+
+    def test_slowdown_beyond_noise_and_tolerance_fails(self):
+        """Test a clear slowdown is reported as a regression."""
+        baseline = _summary(a=(10.0, 0.1, 2))
+        current = _summary(a=(15.0, 0.1, 2))
+
+        [result] = compare(baseline, current)
+
+        assert result.verdict == "slower"
+        assert result.regressed
+        assert result.change == pytest.approx(0.5)
+
+    def test_extra_query_fails_regardless_of_time(self):
+        """Test any increase in query count is a regression."""
+        baseline = _summary(a=(10.0, 0.1, 2))
+        current = _summary(a=(5.0, 0.1, 3))
+
+        [result] = compare(baseline, current)
+
+        assert result.verdict == "more-queries"
+        assert result.regressed
+
+    def test_speedup_passes(self):
+        """Test a faster benchmark is reported without failing."""
+        [result] = compare(_summary(a=(10.0, 0.1, 2)), _summary(a=(5.0, 0.1, 1)))
+
+        assert result.verdict == "faster"
+        assert not result.regressed
+
+    def test_new_benchmark_fails(self):
+        """Test a benchmark missing from the baseline fails until it is recorded."""
+        [result] = compare(_summary(), _summary(b=(1.0, 0.1, 1)))
+
+        assert result.verdict == "new"
+        assert result.regressed
+
+    def test_missing_benchmark_fails(self):
+        """Test a benchmark dropped from the suite is a regression."""
+        [result] = compare(_summary(a=(10.0, 0.1, 2)), _summary())
+
+        assert result.verdict == "missing"
+        assert result.regressed
+
+
+class TestCheckDatabase:
+    """Tests for check_database."""
+
+    def test_same_backend_passes(self):
+        """Test runs on the baseline's backend can be compared."""
+        check_database(_summary(a=(1.0, 0.1, 1)), _summary(a=(1.0, 0.1, 1)))
+
+    def test_other_backend_refused(self):
+        """Test a SQLite run is not gated against a PostgreSQL baseline."""
+        with pytest.raises(DatabaseMismatch, match="postgresql"):
+            check_database(_summary("postgresql"), _summary("sqlite"))
+
+
+class TestMergeBaseline:
+    """Tests for merge_baseline."""
+
+    def test_keeps_benchmarks_outside_filter(self):
+        """Test a filtered update only replaces the matching benchmarks."""
+        baseline = _summary(get_a=(1.0, 0.1, 1), list_b=(2.0, 0.1, 2), get_c=(3.0, 0.1, 3))
+        current = _summary(get_a=(1.5, 0.1, 1), get_c=(2.5, 0.1, 3))
+
+        merged = merge_baseline(baseline, current, "get_")
+
+        assert list(merged["benchmarks"]) == ["get_a", "list_b", "get_c"]
+        assert merged["benchmarks"]["get_a"]["median_ms"] == 1.5
+        assert merged["benchmarks"]["list_b"]["median_ms"] == 2.0
+
+    def test_adds_new_and_drops_removed_matches(self):
+        """Test matching benchmarks follow the suite: new ones added, removed ones dropped."""
+        baseline = _summary(get_a=(1.0, 0.1, 1), get_old=(1.0, 0.1, 1), list_b=(2.0, 0.1, 2))
+        current = _summary(get_a=(1.0, 0.1, 1), get_new=(1.0, 0.1, 1))
+
+        merged = merge_baseline(baseline, current, "get_")
+
+        assert list(merged["benchmarks"]) == ["get_a", "list_b", "get_new"]
+
+    def test_other_backend_refused(self):
+        """Test a run on another backend is not merged into the baseline."""
+        with pytest.raises(DatabaseMismatch):
+            merge_baseline(_summary("postgresql", a=(1.0, 0.1, 1)), _summary(a=(1.0, 0.1, 1)), "a")
+
+
+class TestFormatReport:
+    """Tests for format_report."""
+
+    def test_lists_every_benchmark_and_regression_count(self):
+        """Test the report has one row per benchmark and a summary line."""
+        baseline = _summary(a=(10.0, 0.1, 2), b=(1.0, 0.1, 1))
+        current = _summary(a=(20.0, 0.1, 2), b=(1.0, 0.1, 1))
+
+        report = format_report(compare(baseline, current))
+
+        assert "SLOWER" in report
+        assert "+100.0%" in report
+        assert report.endswith("1 regression(s) in 2 benchmark(s)")
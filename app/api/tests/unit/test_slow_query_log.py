@@ -0,0 +1,79 @@
+"""Unit tests for slow query normalization and redaction."""
+
+import pytest
+from datetime import datetime, timezone
+
+from core.slow_query_log import (
+    SlowQueryEntry,
+    SlowQueryLog,
+    normalize_sql,
+    redact_parameters,
+)
+
+
+class TestNormalizeSql:
+    """Tests for SQL normalization."""
+
+    def test_collapses_whitespace(self):
+        """Test that newlines and repeated spaces are collapsed."""
+        sql = "SELECT id\n  FROM   work_order\n WHERE city_id = $1"
+        assert normalize_sql(sql) == "SELECT id FROM work_order WHERE city_id = $1"
+
+    def test_replaces_literals(self):
+        """Test that string and numeric literals are replaced."""
+        sql = "SELECT * FROM city WHERE code = 'KTYS' LIMIT 20"
+        assert normalize_sql(sql) == "SELECT * FROM city WHERE code = ? LIMIT ?"
+
+    def test_collapses_in_lists(self):
+        """Test that IN lists of any length normalize to the same text."""
+        short = normalize_sql("SELECT * FROM city WHERE id IN ($1, $2)")
+        long = normalize_sql("SELECT * FROM city WHERE id IN ($1, $2, $3, $4)")
+        assert short == long == "SELECT * FROM city WHERE id IN (...)"
+
+    def test_collapses_in_lists_with_casts(self):
+        """Test that asyncpg-style typed placeholders in IN lists collapse too."""
+        sql = "SELECT * FROM city WHERE id IN ($1::INTEGER, $2::INTEGER)"
+        assert normalize_sql(sql) == "SELECT * FROM city WHERE id IN (...)"
+
+
+class TestRedactParameters:
+    """Tests for parameter redaction."""
+
+    def test_positional(self):
+        """Test that positional values are replaced by type names."""
+        assert redact_parameters(("N12345", 3)) == ["<str>", "<int>"]
+
+    def test_named(self):
+        """Test that named values are replaced by type names."""
+        assert redact_parameters({"name": "secret"}) == {"name": "<str>"}
+
+    def test_executemany(self):
+        """Test that executemany parameters only report the batch size."""
+        assert redact_parameters([(1,), (2,)], executemany=True) == "<2 parameter sets>"
+
+
+class TestSlowQueryLogBuffer:
+    """Tests for the slow query ring buffer."""
+
+    def _entry(self, statement: str) -> SlowQueryEntry:
+        return SlowQueryEntry(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=500.0,
+            statement=statement,
+            parameters=[],
+        )
+
+    def test_buffer_is_bounded(self):
+        """Test that the oldest entries are evicted first."""
+        log = SlowQueryLog(buffer_size=2)
+        for statement in ["a", "b", "c"]:
+            log.record(self._entry(statement))
+
+        assert [e.statement for e in log.entries] == ["c", "b"]
+
+    def test_clear(self):
+        """Test that clear empties the buffer."""
+        log = SlowQueryLog()
+        log.record(self._entry("a"))
+        log.clear()
+        assert log.entries == []
@@ -0,0 +1,33 @@
+"""Unit tests for work order status transition rules."""
+
+from models.work_order import WorkOrderStatus
+
+
+class TestWorkOrderStatusTransitions:
+    """Tests for the work order status transition rules."""
+
+    def test_open_status_can_move_anywhere_else(self):
+        """Test an open status may move to any other status."""
+        assert WorkOrderStatus.IN_REVIEW.can_transition_to(WorkOrderStatus.COMPLETED)
+        assert WorkOrderStatus.CREATED.can_transition_to(WorkOrderStatus.VOID)
+        assert not WorkOrderStatus.OPEN.can_transition_to(WorkOrderStatus.OPEN)
+
+    def test_terminal_statuses_can_only_reopen(self):
+        """Test completed and void work orders may reopen but not swap terminal status."""
+        assert WorkOrderStatus.COMPLETED.can_transition_to(WorkOrderStatus.OPEN)
+        assert WorkOrderStatus.VOID.can_transition_to(WorkOrderStatus.IN_PROGRESS)
+        assert not WorkOrderStatus.VOID.can_transition_to(WorkOrderStatus.COMPLETED)
+        assert not WorkOrderStatus.COMPLETED.can_transition_to(WorkOrderStatus.VOID)
+
+    def test_transition_sources(self):
+        """Test the sources of a target exclude it and the terminal statuses."""
+        sources = WorkOrderStatus.transition_sources(WorkOrderStatus.COMPLETED)
+        assert WorkOrderStatus.IN_REVIEW in sources
+        assert WorkOrderStatus.COMPLETED not in sources
+        assert WorkOrderStatus.VOID not in sources
+
+    def test_open_target_sources_include_terminal(self):
+        """Test a closed work order is a source for reopening."""
+        sources = WorkOrderStatus.transition_sources(WorkOrderStatus.OPEN)
+        assert WorkOrderStatus.COMPLETED in sources
+        assert WorkOrderStatus.OPEN not in sources
@@ -0,0 +1,7 @@
+-- V008: Row versions for optimistic concurrency
+-- Every write bumps version; a PUT carrying If-Match only applies when the
+-- version it read is still current. The version is also served as the ETag.
+
+ALTER TABLE work_order ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+
+ALTER TABLE work_order_item ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
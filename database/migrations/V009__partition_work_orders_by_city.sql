@@ -0,0 +1,115 @@
+-- V009: List-partition work orders and their items by city
+-- City is the tenant scope: every work order list filters on city_id, and
+-- stations grow at very different rates. One partition per city keeps scans,
+-- vacuums and index sizes per station. work_order_item carries city_id too, so
+-- a work order and its items always live in the same city's partitions.
+--
+-- Unique constraints on a partitioned table must include the partition key:
+--   * the primary keys become (id, city_id); id leads so lookups by id alone
+--     still probe one index per partition
+--   * uuid is no longer declared unique; it is generated, and stays indexed
+--   * work order numbers embed the city code, so (work_order_number, city_id)
+--     is as strict as the old constraint
+--   * items reference their work order by (work_order_id, city_id)
+
+-- Step 1: Keep the id sequences when the old tables are dropped
+ALTER SEQUENCE work_order_id_seq OWNED BY NONE;
+ALTER SEQUENCE work_order_item_id_seq OWNED BY NONE;
+
+ALTER TABLE work_order_item RENAME TO work_order_item_unpartitioned;
+ALTER TABLE work_order RENAME TO work_order_unpartitioned;
+
+-- Step 2: Partitioned parents with the same columns and defaults
+CREATE TABLE work_order (LIKE work_order_unpartitioned INCLUDING DEFAULTS)
+    PARTITION BY LIST (city_id);
+
+CREATE TABLE work_order_item (
+    LIKE work_order_item_unpartitioned INCLUDING DEFAULTS,
+    city_id INTEGER NOT NULL
+) PARTITION BY LIST (city_id);
+
+-- Step 3: Partitions are created and attached online, one pair per city
+-- The table is created standalone and then attached, which only takes a SHARE
+-- UPDATE EXCLUSIVE lock on the parent, so reads and writes to other cities
+-- carry on.
+CREATE FUNCTION create_city_partitions(p_city_id INTEGER) RETURNS void AS $$
+BEGIN
+    IF to_regclass(format('work_order_city_%s', p_city_id)) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE work_order_city_%s (LIKE work_order INCLUDING DEFAULTS)', p_city_id
+        );
+        EXECUTE format(
+            'ALTER TABLE work_order ATTACH PARTITION work_order_city_%1$s FOR VALUES IN (%1$s)',
+            p_city_id
+        );
+    END IF;
+    IF to_regclass(format('work_order_item_city_%s', p_city_id)) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE work_order_item_city_%s (LIKE work_order_item INCLUDING DEFAULTS)',
+            p_city_id
+        );
+        EXECUTE format(
+            'ALTER TABLE work_order_item ATTACH PARTITION work_order_item_city_%1$s '
+            'FOR VALUES IN (%1$s)',
+            p_city_id
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A new city gets its partitions in the same transaction that creates it
+CREATE FUNCTION city_create_partitions() RETURNS trigger AS $$
+BEGIN
+    PERFORM create_city_partitions(NEW.id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_city_create_partitions
+    AFTER INSERT ON city
+    FOR EACH ROW EXECUTE FUNCTION city_create_partitions();
+
+SELECT create_city_partitions(id) FROM city;
+
+-- Step 4: Move the rows; items take the city of their work order
+INSERT INTO work_order SELECT * FROM work_order_unpartitioned;
+
+INSERT INTO work_order_item
+SELECT woi.*, wo.city_id
+FROM work_order_item_unpartitioned woi
+JOIN work_order_unpartitioned wo ON wo.id = woi.work_order_id;
+
+DROP TABLE work_order_item_unpartitioned;
+DROP TABLE work_order_unpartitioned;
+
+-- Step 5: Hand the sequences to the new id columns
+ALTER SEQUENCE work_order_id_seq OWNED BY work_order.id;
+ALTER SEQUENCE work_order_item_id_seq OWNED BY work_order_item.id;
+
+-- Step 6: Keys and indexes, named as before; the old tables held the names until now
+ALTER TABLE work_order ADD CONSTRAINT work_order_pkey PRIMARY KEY (id, city_id);
+ALTER TABLE work_order ADD CONSTRAINT work_order_work_order_number_key
+    UNIQUE (work_order_number, city_id);
+ALTER TABLE work_order ADD CONSTRAINT work_order_city_id_fkey
+    FOREIGN KEY (city_id) REFERENCES city(id);
+ALTER TABLE work_order ADD CONSTRAINT fk_work_order_aircraft
+    FOREIGN KEY (aircraft_id) REFERENCES aircraft(id) ON DELETE RESTRICT;
+
+ALTER TABLE work_order_item ADD CONSTRAINT work_order_item_pkey PRIMARY KEY (id, city_id);
+ALTER TABLE work_order_item ADD CONSTRAINT uq_work_order_item_number
+    UNIQUE (work_order_id, item_number, city_id);
+ALTER TABLE work_order_item ADD CONSTRAINT work_order_item_work_order_id_fkey
+    FOREIGN KEY (work_order_id, city_id) REFERENCES work_order(id, city_id) ON DELETE CASCADE;
+
+-- Indexes are created on the parents and cascade to every partition. Within a
+-- city's partition the list order is what matters, so the city_id index grows
+-- created_at; city_id stays first in case a partition ever holds several cities.
+CREATE INDEX idx_work_order_uuid ON work_order(uuid);
+CREATE INDEX idx_work_order_city_created_at ON work_order(city_id, created_at);
+CREATE INDEX idx_work_order_status ON work_order(status);
+CREATE INDEX idx_work_order_number ON work_order(work_order_number);
+CREATE INDEX idx_work_order_aircraft_id ON work_order(aircraft_id);
+
+CREATE INDEX idx_work_order_item_uuid ON work_order_item(uuid);
+CREATE INDEX idx_work_order_item_work_order_id ON work_order_item(work_order_id);
+CREATE INDEX idx_work_order_item_status ON work_order_item(status);
@@ -0,0 +1,60 @@
+-- V010: Archive tables for closed work orders
+-- Completed and void work orders past the archive age are moved here with
+-- their items by the archive job, so the hot tables and their indexes only
+-- hold recent history. "All" list views read both.
+-- The columns mirror work_order and work_order_item; add new columns to both.
+-- Like the live tables, the archive is partitioned by city, with the same keys.
+
+CREATE TABLE work_order_archive (LIKE work_order INCLUDING DEFAULTS)
+    PARTITION BY LIST (city_id);
+
+CREATE TABLE work_order_item_archive (LIKE work_order_item INCLUDING DEFAULTS)
+    PARTITION BY LIST (city_id);
+
+-- Rows keep the ids they had in the live tables
+ALTER TABLE work_order_archive ALTER COLUMN id DROP DEFAULT;
+ALTER TABLE work_order_item_archive ALTER COLUMN id DROP DEFAULT;
+
+ALTER TABLE work_order_archive ADD CONSTRAINT work_order_archive_pkey PRIMARY KEY (id, city_id);
+ALTER TABLE work_order_archive ADD CONSTRAINT work_order_archive_work_order_number_key
+    UNIQUE (work_order_number, city_id);
+ALTER TABLE work_order_archive ADD CONSTRAINT work_order_archive_city_id_fkey
+    FOREIGN KEY (city_id) REFERENCES city(id);
+ALTER TABLE work_order_archive ADD CONSTRAINT work_order_archive_aircraft_id_fkey
+    FOREIGN KEY (aircraft_id) REFERENCES aircraft(id) ON DELETE RESTRICT;
+
+ALTER TABLE work_order_item_archive ADD CONSTRAINT work_order_item_archive_pkey
+    PRIMARY KEY (id, city_id);
+ALTER TABLE work_order_item_archive ADD CONSTRAINT work_order_item_archive_work_order_id_fkey
+    FOREIGN KEY (work_order_id, city_id) REFERENCES work_order_archive(id, city_id)
+    ON DELETE CASCADE;
+
+-- Same list order as the live table, so "All" views merge two ordered scans
+CREATE INDEX idx_work_order_archive_uuid ON work_order_archive(uuid);
+CREATE INDEX idx_work_order_archive_city_created_at ON work_order_archive(city_id, created_at);
+CREATE INDEX idx_work_order_archive_aircraft_id ON work_order_archive(aircraft_id);
+
+CREATE INDEX idx_work_order_item_archive_work_order_id ON work_order_item_archive(work_order_id);
+
+-- New cities get archive partitions alongside their live ones
+CREATE OR REPLACE FUNCTION create_city_partitions(p_city_id INTEGER) RETURNS void AS $$
+DECLARE
+    parent TEXT;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY[
+        'work_order', 'work_order_item', 'work_order_archive', 'work_order_item_archive'
+    ] LOOP
+        IF to_regclass(format('%s_city_%s', parent, p_city_id)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %1$s_city_%2$s (LIKE %1$s INCLUDING DEFAULTS)', parent, p_city_id
+            );
+            EXECUTE format(
+                'ALTER TABLE %1$s ATTACH PARTITION %1$s_city_%2$s FOR VALUES IN (%2$s)',
+                parent, p_city_id
+            );
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_city_partitions(id) FROM city;
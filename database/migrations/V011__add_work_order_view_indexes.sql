@@ -0,0 +1,21 @@
+-- V011: Partial indexes for the saved work order list views
+-- Most work orders are closed, but the default views (Open, My Open Items,
+-- Open Quotes) only list open ones. Indexing just the open rows keeps these
+-- indexes small and lets the views read the newest open work orders of a city
+-- without stepping over closed history. Queries must spell the condition as
+-- status NOT IN ('completed', 'void') with literal values for the planner to
+-- match it (see crud.work_order.is_open).
+
+-- Open: the newest open work orders of a city
+CREATE INDEX idx_work_order_open_city_created_at ON work_order(city_id, created_at)
+    WHERE status NOT IN ('completed', 'void');
+
+-- My Open Items: the newest open work orders of one lead technician
+CREATE INDEX idx_work_order_open_lead_technician ON work_order(city_id, lead_technician, created_at)
+    WHERE status NOT IN ('completed', 'void');
+
+-- Open Quotes and All Quotes; closed quotes are archived like work orders
+CREATE INDEX idx_work_order_quote_city_created_at ON work_order(city_id, created_at)
+    WHERE work_order_type = 'quote';
+CREATE INDEX idx_work_order_archive_quote_city_created_at ON work_order_archive(city_id, created_at)
+    WHERE work_order_type = 'quote';
@@ -0,0 +1,7 @@
+-- V012: Index for the highest sequence number of a city
+-- Creating and cloning a work order continue from the city's highest live
+-- sequence number, and the archive job keeps that work order live. Both read
+-- max(sequence_number) per city, which without this index steps over the
+-- city's whole partition.
+
+CREATE INDEX idx_work_order_city_sequence_number ON work_order(city_id, sequence_number);
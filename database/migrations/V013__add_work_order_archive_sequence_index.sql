@@ -0,0 +1,10 @@
+-- V013: Index for the highest archived sequence number of a city
+-- A city's next sequence number is taken past its live and archived work
+-- orders alike, so a number is never reused once the work order holding it is
+-- archived and the live ones above it are deleted. The archive job therefore
+-- no longer keeps each city's highest work order live (see V012). This index
+-- serves the archive side of max(sequence_number) per city as V012 serves the
+-- live side.
+
+CREATE INDEX idx_work_order_archive_city_sequence_number
+    ON work_order_archive(city_id, sequence_number);